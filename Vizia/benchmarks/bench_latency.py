@@ -0,0 +1,135 @@
+"""
+Girdi -> ekran (input-to-photon) gecikme benchmark'ı.
+
+Kayıtlı (veya sentetik) bir girdi izini offscreen DrawingOverlay'e zaman çizelgesiyle oynatır.
+Ekran kareleri (vsync) --hz ile simüle edilir: her karede biriken girdi çizilir (flush_input)
+ve overlay gerçekten yeniden boyanır (repaint); bu işin ölçülen süresi kareye eklenir.
+Her yapılandırma (düz, 1€ filtresi, tahmin, ikisi birden) için şunlar ölçülür:
+  - event_to_photon_ms: olayın zamanı ile içeriğinin ekrana çıktığı an arasındaki süre
+  - tip_lag_px: ekrana çıktığı anda gerçek kalem konumu ile çizginin (tahmin dahil) ucu arası mesafe
+  - input_ms_per_event / frame_ms: olay işleme ve kare (çizim + boyama) maliyeti
+
+Kullanım:
+    python benchmarks/bench_latency.py [--trace iz.json] [--hz 60] [--display-ms 8] [--out sonuc.json]
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from replay import load_trace, synthetic_trace, fit_trace, stroke_paths, position_at, make_event, dispatch, create_overlay
+
+CONFIGS = {
+    "baseline": {"stroke_smoothing": False, "low_latency_prediction": False},
+    "smoothing": {"stroke_smoothing": True, "low_latency_prediction": False},
+    "prediction": {"stroke_smoothing": False, "low_latency_prediction": True},
+    "smoothing+prediction": {"stroke_smoothing": True, "low_latency_prediction": True},
+}
+
+
+def _percentile(values, q):
+    if not values: return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _summary(values):
+    if not values: return {"mean": None, "p95": None, "max": None}
+    return {"mean": sum(values) / len(values), "p95": _percentile(values, 0.95), "max": max(values)}
+
+
+def replay(overlay, trace, hz=60, display_ms=8.0):
+    """İzi kare kare oynatır; ölçüm listelerini döndürür"""
+    period = 1000.0 / hz
+    paths = stroke_paths(trace)
+    events = trace["events"]
+    latencies, lags, input_costs, frame_costs = [], [], [], []
+    waiting = []  # henüz ekrana çıkmamış olayların zamanları
+    stroke_index, in_stroke = -1, False
+    next_frame = math.ceil(events[0][0] / period) * period if events else 0
+
+    def frame(vsync):
+        start = time.perf_counter()
+        overlay.flush_input()
+        overlay.repaint()
+        cost = (time.perf_counter() - start) * 1000
+        frame_costs.append(cost)
+        photon = vsync + cost + display_ms
+        latencies.extend(photon - t for t in waiting)
+        waiting.clear()
+        if in_stroke and 0 <= stroke_index < len(paths):
+            true_pos = position_at(paths[stroke_index], photon)
+            if true_pos is not None:
+                tip = overlay._prediction[1] if overlay._prediction is not None else overlay.last_point
+                lags.append(math.hypot(true_pos[0] - tip.x(), true_pos[1] - tip.y()))
+
+    for t, kind, x, y, pressure in events:
+        while next_frame <= t:
+            frame(next_frame)
+            next_frame += period
+        event = make_event(kind, x, y, pressure, t)
+        start = time.perf_counter()
+        dispatch(overlay, event)
+        input_costs.append((time.perf_counter() - start) * 1000)
+        if kind == "press":
+            stroke_index += 1
+            in_stroke = True
+        elif kind == "release":
+            in_stroke = False
+        waiting.append(t)
+    frame(next_frame)
+    return latencies, lags, input_costs, frame_costs
+
+
+def run(trace, hz=60, display_ms=8.0, prediction_ms=None):
+    results = {}
+    for name, config in CONFIGS.items():
+        settings = dict(config)
+        if prediction_ms is not None: settings["prediction_ms"] = prediction_ms
+        overlay = create_overlay(settings)
+        fitted = fit_trace(trace, overlay.size())
+        latencies, lags, input_costs, frame_costs = replay(overlay, fitted, hz, display_ms)
+        results[name] = {
+            "event_to_photon_ms": _summary(latencies),
+            "tip_lag_px": _summary(lags),
+            "input_ms_per_event": sum(input_costs) / max(1, len(input_costs)),
+            "frame_ms": _summary(frame_costs),
+        }
+        overlay.close()
+        overlay.deleteLater()
+    return {
+        "benchmark": "input_latency",
+        "events": len(trace["events"]),
+        "hz": hz,
+        "display_ms": display_ms,
+        "configs": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vizia girdi gecikmesi benchmark'ı")
+    parser.add_argument("--trace", help="Oynatılacak iz (yoksa sentetik 200 Hz iz üretilir)")
+    parser.add_argument("--tablet", action="store_true", help="Sentetik iz tablet (basınçlı) olsun")
+    parser.add_argument("--hz", type=float, default=60, help="Simüle edilen ekran yenileme hızı")
+    parser.add_argument("--display-ms", type=float, default=8.0, help="Tarama / panel gecikmesi (ms)")
+    parser.add_argument("--prediction-ms", type=float, help="Tahmin ufku (varsayılan: ayar dosyasındaki)")
+    parser.add_argument("--out", help="Sonucu JSON olarak bu dosyaya da yaz")
+    args = parser.parse_args(argv)
+
+    out = os.path.abspath(args.out) if args.out else None
+    trace = load_trace(args.trace) if args.trace else synthetic_trace(pressure=args.tablet)
+    result = run(trace, args.hz, args.display_ms, args.prediction_ms)
+    text = json.dumps(result, indent=4)
+    print(text)
+    if out:
+        with open(out, "w") as f: f.write(text)
+    return result
+
+
+if __name__ == "__main__":
+    main()
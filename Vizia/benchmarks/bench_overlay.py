@@ -0,0 +1,209 @@
+"""
+DrawingOverlay benchmark paketi (headless, offscreen Qt).
+
+Kayıtlı (veya sentetik) bir fare / tablet izini DrawingOverlay'e oynatır ve core/overlay'deki
+gerilemeleri takip edebilmek için şunları JSON olarak raporlar:
+  - frame_ms: canlı çizim sırasında kare başına iş (biriken girdiyi çizme + repaint)
+  - paint_event_ms: paintEvent gövdesinin (paint_surface) tam ekran maliyeti
+  - history ölçümleri (her --sizes uzunluğunda): redraw() + ilk boyama, undo + repaint ve redo + repaint
+    süreleri (sonsuz tuvalde redraw karoları bırakır, asıl iş sonraki boyamada yapılır)
+  - memory: çizgi başına Python heap, StrokeStore dizileri ve raster (karo + checkpoint) belleği
+  - is_mouse_on_ui: çağrı başına süre (toolbar açıkken)
+
+Kullanım:
+    python benchmarks/bench_overlay.py [--trace iz.json] [--sizes 25,100,400] [--whiteboard] [--out sonuc.json]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from replay import load_trace, synthetic_trace, fit_trace, make_event, dispatch, create_overlay
+
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtCore import QPoint
+
+REPEAT = 5
+
+
+def _median(values):
+    values = sorted(values)
+    return values[len(values) // 2] if values else None
+
+
+def _summary(values):
+    if not values: return {"mean": None, "p95": None, "max": None}
+    ordered = sorted(values)
+    return {"mean": sum(values) / len(values), "p95": ordered[int(0.95 * (len(ordered) - 1))], "max": ordered[-1]}
+
+
+def _timed(fn, repeat=REPEAT):
+    """fn'in repeat çalıştırmadaki medyan süresi (ms)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return _median(times)
+
+
+def split_strokes(trace):
+    """İz olaylarını çizgi çizgi gruplar (press ... release)"""
+    strokes, current = [], []
+    for event in trace["events"]:
+        current.append(event)
+        if event[1] == "release":
+            strokes.append(current)
+            current = []
+    return strokes
+
+
+def play(overlay, strokes, hz=60, frame_times=None):
+    """Çizgileri zaman çizelgesiyle oynatır; her vsync'te biriken girdi çizilip overlay boyanır"""
+    period = 1000.0 / hz
+    next_frame = None
+    for stroke in strokes:
+        for t, kind, x, y, pressure in stroke:
+            if next_frame is None: next_frame = t + period
+            while next_frame <= t:
+                start = time.perf_counter()
+                overlay.flush_input()
+                overlay.repaint()
+                if frame_times is not None: frame_times.append((time.perf_counter() - start) * 1000)
+                next_frame += period
+            dispatch(overlay, make_event(kind, x, y, pressure, t))
+    overlay.flush_input()
+    overlay.repaint()
+
+
+def paint_full(overlay, image):
+    """paintEvent'in yaptığı işi (paint_surface) ekran boyutunda bir görüntüye yapar"""
+    p = QPainter(image)
+    overlay.paint_surface(overlay, p, overlay.rect())
+    p.end()
+
+
+def history_costs(overlay):
+    layer = overlay.input_layer
+    image = QImage(overlay.size(), QImage.Format_ARGB32_Premultiplied)
+
+
+    def undo_redo(action):
+        def run():
+            action()
+            overlay.repaint()
+        return run
+
+    def undo_then_redo():
+        # Her ölçüm aynı history üzerinde yapılsın diye undo hemen redo ile geri alınır
+        undo = _timed(undo_redo(overlay.undo), 1)
+        redo = _timed(undo_redo(overlay.redo), 1)
+        return undo, redo
+
+    pairs = [undo_then_redo() for _ in range(REPEAT)]
+    return {
+        "history": len(layer.history),
+        "checkpoints": len(layer.checkpoints),
+        "redraw_ms": _timed(lambda: (layer.redraw(), paint_full(overlay, image))),
+        "undo_ms": _median([u for u, _ in pairs]),
+        "redo_ms": _median([r for _, r in pairs]),
+        "paint_event_ms": _timed(lambda: paint_full(overlay, image)),
+        "raster_mb": layer.raster_bytes() / 1048576,
+    }
+
+
+def store_bytes(store):
+    return sum(getattr(store, name).buffer_info()[1] * getattr(store, name).itemsize
+               for name in store.ARRAY_FIELDS + ('offsets',))
+
+
+def memory_per_stroke(trace, strokes=50, whiteboard=False):
+    overlay = create_overlay()
+    overlay.whiteboard_mode = whiteboard
+    recorded = split_strokes(trace)
+    sample = [recorded[i % len(recorded)] for i in range(strokes)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    play(overlay, sample)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    heap = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    layer = overlay.input_layer
+    count = max(1, len(layer.history))
+    result = {
+        "strokes": len(layer.history),
+        "python_heap_bytes_per_stroke": heap / count,
+        "stroke_store_bytes_per_stroke": store_bytes(layer.strokes) / count,
+        "raster_mb": layer.raster_bytes() / 1048576,
+    }
+    overlay.close()
+    return result
+
+
+def ui_hit_cost(samples=20000, seed=3):
+    """is_mouse_on_ui çağrı başına süre (µs); toolbar ve çekmece takip edilirken"""
+    overlay = create_overlay(toolbar=True)
+    rng = random.Random(seed)
+    w, h = overlay.width(), overlay.height()
+    points = [QPoint(rng.randrange(w), rng.randrange(h)) for _ in range(samples)]
+    hit = overlay.is_mouse_on_ui
+    start = time.perf_counter()
+    hits = sum(1 for pos in points if hit(pos))
+    elapsed = time.perf_counter() - start
+    overlay.toolbar.close()
+    overlay.close()
+    return {"calls": samples, "hits": hits, "us_per_call": elapsed * 1e6 / samples}
+
+
+def run(trace, sizes=(25, 100, 400), hz=60, whiteboard=False):
+    overlay = create_overlay()
+    overlay.whiteboard_mode = whiteboard
+    strokes = split_strokes(fit_trace(trace, overlay.size()))
+    frame_times, history, done = [], [], 0
+    for size in sorted(sizes):
+        batch = [strokes[i % len(strokes)] for i in range(done, size)]
+        play(overlay, batch, hz, frame_times)
+        done = size
+        history.append(history_costs(overlay))
+    overlay.close()
+
+    return {
+        "benchmark": "overlay",
+        "events": len(trace["events"]),
+        "whiteboard": whiteboard,
+        "frame_ms": _summary(frame_times),
+        "history": history,
+        "memory": memory_per_stroke(fit_trace(trace, overlay.size()), whiteboard=whiteboard),
+        "is_mouse_on_ui": ui_hit_cost(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vizia DrawingOverlay benchmark'ı")
+    parser.add_argument("--trace", help="Oynatılacak iz (yoksa sentetik iz üretilir)")
+    parser.add_argument("--tablet", action="store_true", help="Sentetik iz tablet (basınçlı) olsun")
+    parser.add_argument("--sizes", default="25,100,400", help="Ölçüm yapılacak history uzunlukları")
+    parser.add_argument("--hz", type=float, default=60, help="Simüle edilen ekran yenileme hızı")
+    parser.add_argument("--whiteboard", action="store_true", help="Beyaz tahta katmanında ölç")
+    parser.add_argument("--out", help="Sonucu JSON olarak bu dosyaya da yaz")
+    args = parser.parse_args(argv)
+
+    out = os.path.abspath(args.out) if args.out else None
+    trace = load_trace(args.trace) if args.trace else synthetic_trace(pressure=args.tablet)
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    result = run(trace, sizes, args.hz, args.whiteboard)
+    text = json.dumps(result, indent=4)
+    print(text)
+    if out:
+        with open(out, "w") as f: f.write(text)
+    return result
+
+
+if __name__ == "__main__":
+    main()
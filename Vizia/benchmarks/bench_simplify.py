@@ -0,0 +1,151 @@
+"""
+Çizgi sadeleştirme (RDP + curve fitting) benchmark'ı.
+
+Yüksek frekanslı fare / tablet girişine benzeyen sentetik çizgiler üretir (tam sayı
+piksellere yuvarlanmış, ~1 px aralıklı) ve her biri için şunları ölçer:
+  - saklanan path eleman sayısı (ham vs sadeleştirilmiş)
+  - sadeleştirme + path kurma süresi
+  - path'i tekrar çizme (redraw) süresi
+  - iki path arasındaki en büyük görsel sapma (piksel)
+
+Ölçülen değerler (30 çizgi, ~1430 nokta / çizgi, seed 7; fit_mask):
+    tolerans   segment azalması   en büyük sapma
+    0.75       6.5x               0.86 px
+    1.00       10.1x              1.07 px
+    1.25       11.2x              1.23 px   (varsayılan)
+    1.50       12.2x              1.43 px
+fit_mask RDP'nin noktalarından sonra uydurulan eğriyi de ham çizgiyle karşılaştırır ve sapan
+segmentlere nokta geri ekler; böylece eğrinin bombesi de toleransla sınırlanır. 0.75 ve 1.00'de
+görülen ~0.1 px aşım, ham path'in (quadTo zinciri) tam sayı piksel basamaklarından gelir.
+Sadeleştirme + path kurma ~13 ms / çizgi sürer (yalnız RDP ~3 ms); çizgi bırakılınca bir kez çalışır.
+
+Kullanım:
+    python benchmarks/bench_simplify.py [--tolerance 1.25] [--strokes 50] [--out sonuc.json]
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QImage, QPainter, QPen
+from PyQt5.QtCore import Qt
+
+from core.overlay.canvas import DEFAULT_SIMPLIFY_TOLERANCE
+from core.overlay.strokes import build_stroke_path, build_fitted_path, fit_mask
+
+_app = None
+
+
+def synthetic_stroke(rng, length=1500):
+    """El yazısına benzer, ~1 px aralıklı ve tam sayıya yuvarlanmış nokta dizisi"""
+    x, y = rng.uniform(200, 600), rng.uniform(200, 600)
+    heading = rng.uniform(0, 2 * math.pi)
+    turn_rate, points = 0.0, []
+    for _ in range(length):
+        turn_rate = max(-0.08, min(0.08, turn_rate + rng.uniform(-0.01, 0.01)))
+        heading += turn_rate
+        x += math.cos(heading)
+        y += math.sin(heading)
+        point = (float(round(x)), float(round(y)))
+        if not points or points[-1] != point: points.append(point)
+    return points
+
+
+def _samples(path, n):
+    return [(p.x(), p.y()) for p in (path.pointAtPercent(i / (n - 1)) for i in range(n))]
+
+
+def max_deviation(path_a, path_b, n=400, density=8, window=0.05):
+    """
+    path_b üzerindeki örneklerin path_a'ya en uzak mesafesi (piksel).
+    path_a sık örneklenir; iki path de yay uzunluğuyla parametrelendiği için
+    her örnek sadece yakın yüzdelik penceredeki örneklerle karşılaştırılır.
+    """
+    a, b = _samples(path_a, n * density), _samples(path_b, n)
+    span = int(len(a) * window)
+    worst = 0.0
+    for i, (bx, by) in enumerate(b):
+        center = i * density
+        candidates = a[max(0, center - span):center + span + 1]
+        nearest = min((ax - bx) ** 2 + (ay - by) ** 2 for ax, ay in candidates)
+        worst = max(worst, nearest)
+    return math.sqrt(worst)
+
+
+def render_time(path, repeat=20):
+    img = QImage(1024, 1024, QImage.Format_ARGB32_Premultiplied)
+    img.fill(Qt.transparent)
+    p = QPainter(img)
+    p.setRenderHint(QPainter.Antialiasing)
+    p.setPen(QPen(Qt.red, 4, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+    start = time.perf_counter()
+    for _ in range(repeat): p.drawPath(path)
+    elapsed = (time.perf_counter() - start) / repeat
+    p.end()
+    return elapsed
+
+
+def run(tolerance=DEFAULT_SIMPLIFY_TOLERANCE, strokes=50, seed=7):
+    rng = random.Random(seed)
+    totals = {"raw_points": 0, "kept_points": 0, "raw_elements": 0, "fitted_elements": 0,
+              "simplify_ms": 0.0, "raw_render_ms": 0.0, "fitted_render_ms": 0.0}
+    worst_deviation = 0.0
+
+    for _ in range(strokes):
+        raw = synthetic_stroke(rng)
+        raw_path = build_stroke_path(raw)
+
+        start = time.perf_counter()
+        kept = [p for p, k in zip(raw, fit_mask(raw, tolerance)) if k]
+        fitted_path = build_fitted_path(kept)
+        totals["simplify_ms"] += (time.perf_counter() - start) * 1000
+
+        totals["raw_points"] += len(raw)
+        totals["kept_points"] += len(kept)
+        totals["raw_elements"] += raw_path.elementCount()
+        totals["fitted_elements"] += fitted_path.elementCount()
+        totals["raw_render_ms"] += render_time(raw_path) * 1000
+        totals["fitted_render_ms"] += render_time(fitted_path) * 1000
+        worst_deviation = max(worst_deviation, max_deviation(raw_path, fitted_path))
+
+    return {
+        "benchmark": "stroke_simplify",
+        "tolerance": tolerance,
+        "strokes": strokes,
+        "raw_points_per_stroke": totals["raw_points"] / strokes,
+        "kept_points_per_stroke": totals["kept_points"] / strokes,
+        "segment_reduction": totals["raw_elements"] / max(1, totals["fitted_elements"]),
+        "simplify_ms_per_stroke": totals["simplify_ms"] / strokes,
+        "raw_render_ms_per_stroke": totals["raw_render_ms"] / strokes,
+        "fitted_render_ms_per_stroke": totals["fitted_render_ms"] / strokes,
+        "max_deviation_px": worst_deviation,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vizia çizgi sadeleştirme benchmark'ı")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_SIMPLIFY_TOLERANCE)
+    parser.add_argument("--strokes", type=int, default=50)
+    parser.add_argument("--out", help="Sonucu JSON olarak bu dosyaya da yaz")
+    args = parser.parse_args(argv)
+
+    global _app
+    _app = QApplication.instance() or QApplication(sys.argv[:1])
+    result = run(args.tolerance, args.strokes)
+    text = json.dumps(result, indent=4)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f: f.write(text)
+    return result
+
+
+if __name__ == "__main__":
+    main()
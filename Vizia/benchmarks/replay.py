@@ -0,0 +1,221 @@
+"""
+Girdi izleri (trace): okuma / yazma, sentetik üretim, kayıt ve DrawingOverlay'e tekrar oynatma.
+
+İz dosyası (JSON):
+    {"version": 1, "screen": [w, h], "events": [[t_ms, tür, x, y, basınç], ...]}
+    tür: "press" / "move" / "release"; basınç fare olaylarında null, tablette 0-1
+
+Gerçek bir iz kaydetmek için (uygulama normal açılır, kapanınca iz yazılır):
+    python benchmarks/replay.py --record iz.json
+"""
+
+import os
+import sys
+import json
+import math
+import random
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QMouseEvent, QTabletEvent
+from PyQt5.QtCore import Qt, QEvent, QObject, QPointF
+
+TRACE_VERSION = 1
+_app = None  # create_overlay'ın kurduğu QApplication; fonksiyon dönünce silinmesin
+
+_MOUSE_TYPES = {"press": QEvent.MouseButtonPress, "move": QEvent.MouseMove, "release": QEvent.MouseButtonRelease}
+_TABLET_TYPES = {"press": QEvent.TabletPress, "move": QEvent.TabletMove, "release": QEvent.TabletRelease}
+_KINDS = {t: k for k, t in list(_MOUSE_TYPES.items()) + list(_TABLET_TYPES.items())}
+
+
+def load_trace(path):
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version", 0) > TRACE_VERSION: raise ValueError("Daha yeni bir iz sürümü")
+    return data
+
+
+def save_trace(path, events, screen):
+    with open(path, "w") as f:
+        json.dump({"version": TRACE_VERSION, "screen": list(screen), "events": events}, f)
+
+
+def synthetic_trace(seed=7, strokes=20, rate_hz=200, points=120, pressure=False, screen=(800, 600)):
+    """
+    El yazısına benzer çizgiler: sabit örnekleme hızı, yavaşlayıp hızlanan ve dönen bir kalem.
+    Çizgiler arasında kısa duraklar vardır; pressure=True ise tablet izi üretilir.
+    """
+    rng = random.Random(seed)
+    w, h = screen
+    dt = 1000.0 / rate_hz
+    events, t = [], 0.0
+    for _ in range(strokes):
+        x, y = rng.uniform(w * 0.2, w * 0.8), rng.uniform(h * 0.2, h * 0.8)
+        heading = rng.uniform(0, 2 * math.pi)
+        turn = 0.0
+        for i in range(points):
+            phase = i / max(1, points - 1)
+            speed = 0.4 + 1.6 * math.sin(math.pi * phase)  # px / ms
+            turn = max(-0.06, min(0.06, turn + rng.uniform(-0.015, 0.015)))
+            heading += turn
+            if i: x, y = x + math.cos(heading) * speed * dt, y + math.sin(heading) * speed * dt
+            x, y = max(0.0, min(w - 1.0, x)), max(0.0, min(h - 1.0, y))
+            kind = "press" if i == 0 else "release" if i == points - 1 else "move"
+            p = round(0.2 + 0.7 * math.sin(math.pi * phase), 3) if pressure else None
+            events.append([round(t, 3), kind, round(x, 2), round(y, 2), p])
+            t += dt
+        t += rng.uniform(150, 400)
+    return {"version": TRACE_VERSION, "screen": list(screen), "events": events}
+
+
+def fit_trace(trace, size):
+    """İz başka boyutta bir ekranda kaydedildiyse koordinatları overlay'e sığacak şekilde ölçekler"""
+    tw, th = trace["screen"]
+    scale = min(size.width() / tw, size.height() / th, 1.0)
+    if scale == 1.0: return trace
+    events = [[t, kind, x * scale, y * scale, p] for t, kind, x, y, p in trace["events"]]
+    return dict(trace, screen=[size.width(), size.height()], events=events)
+
+
+def stroke_paths(trace):
+    """İzdeki her çizginin (t, x, y) örnekleri; gerçek kalem konumunu zamana göre bulmak için"""
+    paths, current = [], None
+    for t, kind, x, y, _ in trace["events"]:
+        if kind == "press": current = [(t, x, y)]
+        elif current is not None:
+            current.append((t, x, y))
+            if kind == "release":
+                paths.append(current)
+                current = None
+    return paths
+
+
+def position_at(path, t):
+    """Çizgi üzerinde t anındaki (doğrusal aradeğerli) konum; çizgi dışında None"""
+    if not path or t < path[0][0] or t > path[-1][0]: return None
+    lo, hi = 0, len(path) - 1
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if path[mid][0] <= t: lo = mid
+        else: hi = mid
+    (t0, x0, y0), (t1, x1, y1) = path[lo], path[hi]
+    k = (t - t0) / (t1 - t0) if t1 > t0 else 0.0
+    return x0 + (x1 - x0) * k, y0 + (y1 - y0) * k
+
+
+def make_event(kind, x, y, pressure, t):
+    pos = QPointF(x, y)
+    if pressure is None:
+        button = Qt.LeftButton
+        buttons = Qt.NoButton if kind == "release" else Qt.LeftButton
+        event = QMouseEvent(_MOUSE_TYPES[kind], pos, button, buttons, Qt.NoModifier)
+    else:
+        buttons = Qt.NoButton if kind == "release" else Qt.LeftButton
+        event = QTabletEvent(_TABLET_TYPES[kind], pos, pos, QTabletEvent.Stylus, QTabletEvent.Pen, pressure,
+                             0, 0, 0, 0, 0, Qt.NoModifier, 1, Qt.LeftButton, buttons)
+    event.setTimestamp(int(t))
+    return event
+
+
+def dispatch(overlay, event):
+    """Olayı overlay'in girdi işleyicisine doğrudan verir (olay döngüsü ve pencere sistemi olmadan)"""
+    kind = event.type()
+    if kind in (QEvent.TabletPress, QEvent.TabletMove, QEvent.TabletRelease): overlay.tabletEvent(event)
+    elif kind == QEvent.MouseButtonPress: overlay.mousePressEvent(event)
+    elif kind == QEvent.MouseMove: overlay.mouseMoveEvent(event)
+    elif kind == QEvent.MouseButtonRelease: overlay.mouseReleaseEvent(event)
+
+
+# Ölçülen girdi hattı varsayılan olarak kapalı; benchmark'larda açılır
+BENCH_SETTINGS = {"pen_pressure": True, "input_coalescing": True}
+
+
+def create_overlay(settings=None, toolbar=False):
+    """
+    Offscreen bir DrawingOverlay kurar. Ayar dosyası geçici bir klasörde oluşur (repo'daki
+    vizia_settings.json değişmez); settings verilen anahtarları sadece bellekte ezer
+    (BENCH_SETTINGS'in üstüne).
+    """
+    global _app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = _app = QApplication.instance() or QApplication(sys.argv[:1])
+    os.chdir(tempfile.mkdtemp(prefix="vizia_bench_"))
+    from core.overlay.window import DrawingOverlay
+    overlay = DrawingOverlay()
+    overlay.settings.settings.update(dict(BENCH_SETTINGS, **(settings or {})))
+    if toolbar:
+        from core.toolbar import ModernToolbar
+        overlay.toolbar = ModernToolbar(overlay)
+        overlay.toolbar.show()
+    app.processEvents()
+    return overlay
+
+
+class TraceRecorder(QObject):
+    """Uygulama genelindeki fare / tablet olaylarını (çizim yüzeylerine gidenleri) ize yazar"""
+    def __init__(self, overlay):
+        super().__init__(overlay)
+        self.overlay = overlay
+        self.events = []
+        self._tablet_down = False
+
+    def _is_surface(self, obj):
+        return obj is self.overlay or any(obj is s for s in self.overlay.surfaces)
+
+    def eventFilter(self, obj, event):
+        kind = _KINDS.get(event.type())
+        if kind and self._is_surface(obj):
+            is_tablet = isinstance(event, QTabletEvent)
+            if is_tablet: self._tablet_down = kind != "release"
+            # Tablet kullanılırken Qt'nin ürettiği fare kopyaları kaydedilmez
+            if is_tablet or not self._tablet_down:
+                pos = obj.mapToGlobal(event.pos()) - self.overlay.mapToGlobal(self.overlay.rect().topLeft())
+                if kind != "move" or event.buttons() or is_tablet and event.pressure() > 0:
+                    self.events.append([event.timestamp(), kind, pos.x(), pos.y(),
+                                        round(event.pressure(), 3) if is_tablet else None])
+        return False
+
+
+def record(path):
+    """Uygulamayı açar, çizim girdilerini kaydeder ve çıkışta izi path'e yazar"""
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    from core.overlay.window import DrawingOverlay
+    from core.toolbar import ModernToolbar
+    overlay = DrawingOverlay()
+    overlay.toolbar = ModernToolbar(overlay)
+    overlay.toolbar.show()
+    recorder = TraceRecorder(overlay)
+    app.installEventFilter(recorder)
+    screen = overlay.size()
+
+    def save():
+        save_trace(path, recorder.events, (screen.width(), screen.height()))
+        print(f"{len(recorder.events)} olay kaydedildi: {path}")
+
+    app.aboutToQuit.connect(save)
+    return app.exec_()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vizia girdi izi kaydı / üretimi")
+    parser.add_argument("--record", metavar="IZ", help="Uygulamayı açıp gerçek girdiyi bu dosyaya kaydet")
+    parser.add_argument("--synthetic", metavar="IZ", help="Sentetik bir iz üretip bu dosyaya yaz")
+    parser.add_argument("--tablet", action="store_true", help="Sentetik izde basınç (tablet) olsun")
+    parser.add_argument("--rate", type=int, default=200, help="Sentetik iz örnekleme hızı (Hz)")
+    args = parser.parse_args(argv)
+
+    if args.record: return record(args.record)
+    if args.synthetic:
+        trace = synthetic_trace(rate_hz=args.rate, pressure=args.tablet)
+        save_trace(args.synthetic, trace["events"], trace["screen"])
+        print(f"{len(trace['events'])} olay yazıldı: {args.synthetic}")
+        return 0
+    parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,339 @@ try:
 except ImportError:
     import PyQt5.sip as sip
 
-from PyQt5.QtGui import QPainter, QPixmap, QPen, QColor, QPainterPath
-from PyQt5.QtCore import Qt, QRect
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from array import array
+from collections import OrderedDict
+
+from PyQt5.QtGui import QPainter, QPixmap, QPen, QColor
+from PyQt5.QtCore import Qt, QRect, QRectF, QSize, QPoint, QPointF
+
+from core.spatial import SpatialGrid
+from .history import StrokeCommand, ShapeCommand, StampCommand, WidgetCommand, EraseCommand
+from .strokes import erase_from_stroke, simplify_mask, fit_mask, build_stroke_path, build_fitted_path, build_polyline_path
+
+# Karo (tile) kenar uzunluğu; 256x256 ARGB bir karo ~256 KB tutar
+TILE_SIZE = 256
+
+# Varsayılan checkpoint ayarları (vizia_settings.json ile ezilebilir)
+DEFAULT_CHECKPOINT_INTERVAL = 25
+DEFAULT_CHECKPOINT_MEMORY_MB = 64
+# Çizgi bırakılınca uygulanan sadeleştirme toleransı (piksel); 0 kapatır. Uydurulan eğri de bu
+# sınırda kalır (fit_mask); 1.25'te segmentler ~11 kat azalır (bkz. benchmarks/bench_simplify.py)
+DEFAULT_SIMPLIFY_TOLERANCE = 1.25
+# Ulaşılamayan (silinmiş / redo'dan düşmüş) çizgiler bu sayının üzerinde sıkıştırılır
+STROKE_COMPACT_MIN = 1024
+# Az sayıda ama çok karmaşık çizgi varsa da checkpoint alınır (toplam path eleman sayısı)
+CHECKPOINT_COMPLEXITY = 20000
+# Basınçlı çizgide sadeleştirme, kalınlık çarpanı bu kadar değişen noktaları da korur
+PRESSURE_KEEP_DELTA = 0.08
+
+# Sonsuz tuval: zoom = ZOOM_STEP ** seviye; her seviyenin karoları ayrı önbellekte tutulur
+ZOOM_STEP = 1.25
+MIN_ZOOM_LEVEL, MAX_ZOOM_LEVEL = -10, 10
+ZOOM_LEVEL_CACHE = 3
+# Uzaklaşınca ekranda bu boyuttan (piksel) küçük kalan öğeler çizilmez (level of detail)
+LOD_MIN_PIXELS = 0.75
+# Görünüm dışındaki karolar, görünümdeki karo sayısının bu katını aşınca bırakılır
+TILE_CACHE_FACTOR = 4
+
+
+def _span(p1, p2, margin=0):
+    """İki noktayı (QPoint / QPointF) kapsayan, margin kadar genişletilmiş QRect"""
+    return QRectF(QPointF(p1), QPointF(p2)).normalized().toAlignedRect().adjusted(-margin, -margin, margin, margin)
+
+
+def _scaled(rect, zoom):
+    if zoom == 1: return rect
+    return QRectF(rect.x() * zoom, rect.y() * zoom, rect.width() * zoom, rect.height() * zoom).toAlignedRect()
+
+
+class TileStore:
+    """
+    Katmanın raster verisini TILE_SIZE boyutunda karolar halinde tutar.
+    Karolar sadece mürekkep olan bölgelerde (lazy) oluşturulur, boş alan bellek harcamaz.
+    empty: boş olduğu bilinen karolar; ne tiles ne empty içinde olan karo henüz çizilmemiştir.
+    size None ise (sonsuz tuval) anahtarlar kırpılmaz.
+    Karolar mantıksal koordinatta çizilir; dpr (ekranın devicePixelRatio'su) kadar fiziksel piksel tutar.
+    """
+    def __init__(self, size, tile_size=TILE_SIZE, dpr=1.0):
+        self.size = QSize(size) if size is not None else None
+        self.tile_size = tile_size
+        self.dpr = dpr
+        self.tiles = {}
+        self.dirty = set()
+        self.empty = set()
+
+    def tile_rect(self, key):
+        ts = self.tile_size
+        return QRect(key[0] * ts, key[1] * ts, ts, ts)
+
+    def keys_for_rect(self, rect):
+        """Verilen dikdörtgenin kestiği karo anahtarlarını döndürür (katman sınırına kırpılmış)"""
+        if self.size is not None: rect = rect.intersected(QRect(0, 0, self.size.width(), self.size.height()))
+        if rect.isEmpty(): return []
+        ts = self.tile_size
+        return [(tx, ty)
+                for ty in range(rect.top() // ts, rect.bottom() // ts + 1)
+                for tx in range(rect.left() // ts, rect.right() // ts + 1)]
+
+    def tile(self, key):
+        """Karoyu döndürür, yoksa şeffaf olarak oluşturur"""
+        pix = self.tiles.get(key)
+        if pix is None:
+            side = round(self.tile_size * self.dpr)
+            pix = QPixmap(side, side)
+            pix.setDevicePixelRatio(self.dpr)
+            pix.fill(Qt.transparent)
+            self.tiles[key] = pix
+            self.empty.discard(key)
+        return pix
+
+    def mark_dirty(self, rect):
+        keys = self.keys_for_rect(rect)
+        self.dirty.update(keys)
+        self.empty.difference_update(keys)
+        return keys
+
+    def mark_all_dirty(self):
+        self.dirty.update(self.tiles.keys())
+
+    def needs_render(self, key):
+        return key in self.dirty or (key not in self.tiles and key not in self.empty)
+
+    def drop(self, key):
+        self.tiles.pop(key, None)
+        self.empty.add(key)
+
+    def evict(self, keep, limit):
+        """keep dışındaki (temiz) karoları limit'e inene kadar bırakır; gerekince tekrar çizilirler"""
+        if len(self.tiles) <= limit: return
+        for key in [k for k in self.tiles if k not in keep and k not in self.dirty]:
+            del self.tiles[key]
+            if len(self.tiles) <= limit: break
+
+    def clear(self):
+        self.tiles.clear()
+        self.dirty.clear()
+        self.empty.clear()
+
+    def bytes_used(self):
+        side = round(self.tile_size * self.dpr)
+        return len(self.tiles) * side * side * 4
+
+
+class StrokeStore:
+    """
+    Tüm çizgilerin noktalarını tek bir array('f') tamponunda (x0, y0, x1, y1, ...) tutar.
+    Her çizgi (sid) için başlangıç/uzunluk, renk, kalınlık, mod ve bayraklar paralel dizilerdedir;
+    QPainterPath sadece çizim gerektiğinde üretilir ve küçük bir LRU önbellekte tutulur.
+    Diziler doğrudan diske yazılabilir ve NumPy varsa kopyasız olarak vektörel işlenebilir.
+    Tablet çizgilerinde her noktanın kalınlık çarpanı (basınç, 0-255) pressures dizisindedir.
+    """
+    PATH_CACHE_SIZE = 512
+    MODES = ('pen', 'eraser')
+    FLAG_FITTED = 1
+    FLAG_PRESSURE = 2
+    # Kayıt / yükleme sırasında olduğu gibi yazılan diziler (offsets, counts'tan yeniden hesaplanır)
+    # pressures en sonda; eski oturumlarda yoksa tam basınçla doldurulur
+    ARRAY_FIELDS = ('counts', 'colors', 'widths', 'modes', 'flags', 'bounds', 'coords', 'pressures')
+
+    def __init__(self):
+        self._paths = OrderedDict()
+        self.clear()
+
+    def clear(self):
+        self.coords = array('f')   # x, y çiftleri
+        self.offsets = array('I')  # çizginin ilk noktasının indeksi
+        self.counts = array('I')   # çizgideki nokta sayısı
+        self.colors = array('I')   # ARGB
+        self.widths = array('f')
+        self.modes = array('B')
+        self.flags = array('B')
+        self.bounds = array('f')   # çizgi başına left, top, right, bottom (path kontrol dikdörtgeni)
+        self.pressures = array('B')  # nokta başına kalınlık çarpanı * 255 (coords ile aynı indeks)
+        self._paths.clear()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def add(self, points, color, width, mode, fitted=False, pressures=None):
+        """pressures: nokta başına 0-1 kalınlık çarpanı (tablet); None ise sabit kalınlık"""
+        sid = len(self.offsets)
+        self.offsets.append(len(self.coords) // 2)
+        self.counts.append(len(points))
+        for x, y in points:
+            self.coords.append(x)
+            self.coords.append(y)
+        if pressures is None: self.pressures.extend(b'\xff' * len(points))
+        else: self.pressures.extend(max(1, min(255, round(f * 255))) for f in pressures)
+        self.colors.append(QColor(color).rgba())
+        self.widths.append(width)
+        self.modes.append(self.MODES.index(mode) if mode in self.MODES else 0)
+        self.flags.append((self.FLAG_FITTED if fitted else 0) | (self.FLAG_PRESSURE if pressures is not None else 0))
+        r = self.path(sid).controlPointRect()
+        self.bounds.extend((r.left(), r.top(), r.right(), r.bottom()))
+        return sid
+
+    def points(self, sid):
+        start = self.offsets[sid] * 2
+        flat = self.coords[start:start + self.counts[sid] * 2]
+        return list(zip(flat[0::2], flat[1::2]))
+
+    def color(self, sid):
+        return QColor.fromRgba(self.colors[sid])
+
+    def width(self, sid):
+        return self.widths[sid]
+
+    def mode(self, sid):
+        return self.MODES[self.modes[sid]]
+
+    def fitted(self, sid):
+        return bool(self.flags[sid] & self.FLAG_FITTED)
+
+    def has_pressure(self, sid):
+        return bool(self.flags[sid] & self.FLAG_PRESSURE)
+
+    def pressure_factors(self, sid):
+        start = self.offsets[sid]
+        return [v / 255 for v in self.pressures[start:start + self.counts[sid]]]
+
+    def rect(self, sid, margin=0):
+        l, t, r, b = self.bounds[sid * 4:sid * 4 + 4]
+        return QRect(int(l) - margin, int(t) - margin, int(r) - int(l) + 1 + 2 * margin, int(b) - int(t) + 1 + 2 * margin)
+
+    def path(self, sid):
+        """Çizginin QPainterPath'ini (gerekirse üretip) önbellekten döndürür"""
+        path = self._paths.get(sid)
+        if path is not None:
+            self._paths.move_to_end(sid)
+            return path
+        points = self.points(sid)
+        if self.has_pressure(sid): path = build_polyline_path(points)
+        else: path = build_fitted_path(points) if self.fitted(sid) else build_stroke_path(points)
+        self._paths[sid] = path
+        if len(self._paths) > self.PATH_CACHE_SIZE: self._paths.popitem(last=False)
+        return path
+
+    def numpy_view(self):
+        """(N x 2 nokta dizisi, offsets, counts) - NumPy yoksa None. Kopyasızdır, salt okunur kullanın."""
+        if np is None or not self.coords: return None
+        return (np.frombuffer(self.coords, dtype=np.float32).reshape(-1, 2),
+                np.frombuffer(self.offsets, dtype=np.uint32),
+                np.frombuffer(self.counts, dtype=np.uint32))
+
+    def translate(self, sids, dx, dy):
+        """Verilen çizgileri toplu olarak kaydırır (NumPy varsa vektörel)"""
+        view = np.frombuffer(self.coords, dtype=np.float32).reshape(-1, 2) if np is not None and self.coords else None
+        for sid in sids:
+            start, count = self.offsets[sid], self.counts[sid]
+            if view is not None:
+                view[start:start + count] += (dx, dy)
+            else:
+                for i in range(start * 2, (start + count) * 2, 2):
+                    self.coords[i] += dx
+                    self.coords[i + 1] += dy
+            b = sid * 4
+            self.bounds[b] += dx; self.bounds[b + 1] += dy; self.bounds[b + 2] += dx; self.bounds[b + 3] += dy
+            self._paths.pop(sid, None)
+
+    def export(self, sids):
+        """sids çizgilerini (bu sırayla) bağımsız dizilere kopyalar; oturum kaydı için"""
+        sids = list(sids)
+        if sids == list(range(len(self))):
+            return {name: array(getattr(self, name).typecode, getattr(self, name)) for name in self.ARRAY_FIELDS}
+        out = {name: array(getattr(self, name).typecode) for name in self.ARRAY_FIELDS}
+        for sid in sids:
+            start, count = self.offsets[sid], self.counts[sid]
+            out['counts'].append(count)
+            out['colors'].append(self.colors[sid]); out['widths'].append(self.widths[sid])
+            out['modes'].append(self.modes[sid]); out['flags'].append(self.flags[sid])
+            out['bounds'].extend(self.bounds[sid * 4:sid * 4 + 4])
+            out['coords'].extend(self.coords[start * 2:(start + count) * 2])
+            out['pressures'].extend(self.pressures[start:start + count])
+        return out
+
+    def extend(self, arrays):
+        """export() çıktısını toplu ekler (path üretmeden); yeni sid'lerin range'ini döndürür"""
+        counts = arrays['counts']
+        n, total = len(counts), sum(counts)
+        if 'pressures' not in arrays: arrays = dict(arrays, pressures=array('B', b'\xff' * total))
+        if len(arrays['coords']) != total * 2 or len(arrays['bounds']) != n * 4 or len(arrays['pressures']) != total or \
+           any(len(arrays[name]) != n for name in ('colors', 'widths', 'modes', 'flags')):
+            raise ValueError("Çizgi dizileri tutarsız")
+        first, base = len(self.offsets), len(self.coords) // 2
+        for count in counts:
+            self.offsets.append(base)
+            base += count
+        for name in self.ARRAY_FIELDS:
+            getattr(self, name).extend(arrays[name])
+        return range(first, first + n)
+
+    def compact(self, commands):
+        """Sadece verilen (hala ulaşılabilir) çizgi komutlarını tutar, sid'lerini yeniden numaralar"""
+        old = (self.coords, self.offsets, self.counts, self.colors, self.widths, self.modes, self.flags, self.bounds, self.pressures)
+        old_paths = dict(self._paths)
+        self.clear()
+        coords, offsets, counts, colors, widths, modes, flags, bounds, pressures = old
+        for cmd in commands:
+            sid = cmd.sid
+            start, count = offsets[sid], counts[sid]
+            new_sid = len(self.offsets)
+            self.offsets.append(len(self.coords) // 2)
+            self.counts.append(count)
+            self.coords.extend(coords[start * 2:(start + count) * 2])
+            self.pressures.extend(pressures[start:start + count])
+            self.colors.append(colors[sid]); self.widths.append(widths[sid])
+            self.modes.append(modes[sid]); self.flags.append(flags[sid])
+            self.bounds.extend(bounds[sid * 4:sid * 4 + 4])
+            if sid in old_paths: self._paths[new_sid] = old_paths[sid]
+            cmd.sid = new_sid
+
 
 class CanvasLayer:
     """
     Her bir katmanın (Masaüstü veya Beyaz Tahta) çizim verilerini tutar.
+    Raster veri tek bir tam ekran pixmap yerine karolarda (TileStore) saklanır;
+    undo/clear sadece etkilenen karoları yeniden çizer.
+    Her N çizimde bir karoların anlık görüntüsü (checkpoint) alınır, böylece
+    undo tüm history'i değil sadece en yakın checkpoint'ten sonrasını tekrar çizer.
+    history ve redo_stack HistoryCommand nesnelerinden oluşur; history'deki raster
+    komutlar ayrıca bir SpatialGrid'de (index) tutulur.
+
+    infinite=True (sonsuz tuval): komutlar dünya koordinatındadır, ekran = dünya * zoom - pan.
+    Karolar zoom'lanmış uzayda tutulur ve sadece görünüme girince çizilir; son kullanılan
+    birkaç zoom seviyesinin karoları ayrı ayrı önbellekte kalır.
     """
-    def __init__(self, size):
-        self.pixmap = QPixmap(size)
-        self.pixmap.fill(Qt.transparent)
-        self.history = [] 
-        self.widgets = [] 
+    def __init__(self, size, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL, checkpoint_memory_mb=DEFAULT_CHECKPOINT_MEMORY_MB,
+                 simplify_tolerance=DEFAULT_SIMPLIFY_TOLERANCE, infinite=False, dpr=1.0):
+        self.size = QSize(size)
+        self.infinite = bool(infinite)
+        self.dpr = float(dpr or 1.0)
+        self.tiles = TileStore(None if self.infinite else size, dpr=self.dpr)
+        self.zoom_level = 0
+        self.zoom = 1.0
+        self.pan = QPoint(0, 0)
+        self._levels = OrderedDict()  # zoom seviyesi -> TileStore (aktif olmayan seviyeler)
+        self.index = SpatialGrid(TILE_SIZE)
+        self.strokes = StrokeStore()
+        self._next_compact = STROKE_COMPACT_MIN
+        self.history = []
+        self.redo_stack = []
+        self.widgets = []
+        self._seq = 0
+        self._erase_gesture = None
+        self.simplify_tolerance = float(simplify_tolerance if simplify_tolerance is not None else DEFAULT_SIMPLIFY_TOLERANCE)
+
+        self.checkpoint_interval = max(1, int(checkpoint_interval or DEFAULT_CHECKPOINT_INTERVAL))
+        self.checkpoint_budget = max(0, int(checkpoint_memory_mb if checkpoint_memory_mb is not None else DEFAULT_CHECKPOINT_MEMORY_MB)) * 1024 * 1024
+        self.checkpoints = []
+        self._since_checkpoint = 0
+        self._complexity_since_checkpoint = 0
 
     def cleanup_dead_widgets(self):
         """[YENİ] C++ tarafında silinmiş (zombi) objeleri listelerden temizler"""
@@ -25,133 +346,458 @@ class CanvasLayer:
                     alive_widgets.append(w)
             except: pass
         self.widgets = alive_widgets
-        
-        alive_history = []
-        for item in self.history:
-            if item.get('obj'):
-                try:
-                    if not sip.isdeleted(item['obj']):
-                        alive_history.append(item)
-                except: pass
-            else:
-                alive_history.append(item)
-        self.history = alive_history
+        self.history = [cmd for cmd in self.history if cmd.is_alive()]
+        self.redo_stack = [cmd for cmd in self.redo_stack if cmd.is_alive()]
 
     def clear(self):
-        self.pixmap.fill(Qt.transparent)
         self.cleanup_dead_widgets() # Temizlemeden önce zombileri at
-        
-        # Widgetları kapat ve bellekten sil
-        for item in self.history:
-            if item.get('obj'):
-                try: 
-                    item['obj'].close()
-                    item['obj'].deleteLater()
-                except: pass
+
+        # Widgetları kapat ve bellekten sil (bekletilen redo widgetları dahil)
+        for cmd in self.history + self.redo_stack:
+            cmd.discard()
         self.history.clear()
+        self.redo_stack.clear()
         self.widgets.clear()
-        self.redraw()
+        self.index.clear()
+        self.strokes.clear()
+        self._next_compact = STROKE_COMPACT_MIN
+        # Karoları tamamen bırak: boş katman hiç raster bellek tutmaz
+        self.tiles.clear()
+        self._levels.clear()
+        self.checkpoints.clear()
+        self._since_checkpoint = 0
+        self._complexity_since_checkpoint = 0
+
+    def push(self, cmd):
+        """Yeni bir işlemi history'e ekler; yeni işlem yapılınca redo yığını geçersizleşir"""
+        for old in self.redo_stack:
+            old.discard()
+        self.redo_stack.clear()
+        self._seq += 1
+        cmd.seq = self._seq
+        self.history.append(cmd)
+        if cmd.is_raster:
+            self.index.insert(cmd, cmd.rect)
+            self._on_raster_added(cmd.complexity)
+        if len(self.strokes) >= self._next_compact:
+            self._compact_strokes()
+
+    def restore(self, commands):
+        """
+        Hazır komutları (oturum yükleme) history'e ekler. Hiçbir şey çizilmez;
+        karolar kirli işaretlenir ve ekrana ilk geldiklerinde render() içinde üretilir.
+        """
+        for cmd in commands:
+            self._seq += 1
+            cmd.seq = self._seq
+            self.history.append(cmd)
+            if cmd.is_raster:
+                self.index.insert(cmd, cmd.rect)
+                self._mark_dirty(cmd.rect)
+            elif cmd.obj is not None and cmd.obj not in self.widgets:
+                self.widgets.append(cmd.obj)
+
+    def _compact_strokes(self):
+        """Silgiyle çıkarılıp geri alınamaz hale gelen çizgileri StrokeStore'dan atar"""
+        live = {}
+        for cmd in self.history + self.redo_stack:
+            for c in [cmd] + getattr(cmd, 'removed', []) + getattr(cmd, 'added', []):
+                if c.type == 'path': live[id(c)] = c
+        if len(live) * 2 < len(self.strokes):
+            self.strokes.compact(sorted(live.values(), key=lambda c: c.sid))
+        self._next_compact = max(STROKE_COMPACT_MIN, len(self.strokes) * 2)
 
     def undo(self):
+        """Son işlemi geri alır; yeniden çizilen alanı (varsa) döndürür"""
         self.cleanup_dead_widgets() # İşlem öncesi zombi kontrolü
-        if not self.history: return
-        last_item = self.history.pop()
-        
-        # Geri alırken widget (şekil) ise yok et
-        if last_item.get('type') in ['text', 'image', 'shape', 'geometry_shape']:
-            if last_item.get('obj'): 
-                try: 
-                    last_item['obj'].close()
-                    last_item['obj'].deleteLater() # Bellekten de sil
-                except: pass
-            if last_item.get('obj') in self.widgets: 
-                self.widgets.remove(last_item['obj'])
-                
-        self.redraw()
+        if not self.history: return None
+        cmd = self.history.pop()
+        self.redo_stack.append(cmd)
+        if not cmd.is_raster: return cmd.undo(self)
 
-    def draw_segment(self, p1, p2, color, width, mode, is_whiteboard):
-        """Fare hareket ederken pixmap üzerine anlık çizim yapar"""
-        painter = QPainter(self.pixmap)
+        self.index.remove(cmd)
+        self._since_checkpoint = max(0, self._since_checkpoint - 1)
+        # Geri alınan öğeden sonra alınmış checkpoint artık geçersiz
+        self._drop_checkpoints_from(cmd.seq)
+
+        # Sadece geri alınan öğenin kapladığı karolar yeniden çizilir
+        self.invalidate(cmd.rect)
+        return cmd.rect
+
+    def redo(self):
+        """Geri alınan son işlemi yeniden uygular; yeniden çizilen alanı (varsa) döndürür"""
+        self.cleanup_dead_widgets()
+        if not self.redo_stack: return None
+        cmd = self.redo_stack.pop()
+        self.history.append(cmd)
+        if not cmd.is_raster: return cmd.redo(self)
+
+        # Komut en üstte olduğundan sadece onun karolarına üstten çizmek yeterli
+        # (index'e sonra eklenir; henüz çizilmemiş bir karo üretilirken komut iki kez çizilmesin)
+        self._paint_on_tiles(cmd.rect, cmd.draw)
+        self.index.insert(cmd, cmd.rect)
+        self._on_raster_added(cmd.complexity)
+        return cmd.rect
+
+    # --- NESNE / VEKTÖR SİLGİSİ ---
+    def begin_erase(self):
+        self._erase_gesture = {'removed': [], 'added': []}
+
+    def _record_erase(self, removed, added):
+        """Silinen/eklenen komutları hareket boyunca biriktirir (tek geri alınabilir adım)"""
+        if self._erase_gesture is None: self.begin_erase()
+        gesture = self._erase_gesture
+        for cmd in removed:
+            # Bu hareket içinde oluşmuş bir parça tekrar silinirse sadece 'added'dan düşer
+            if cmd in gesture['added']: gesture['added'].remove(cmd)
+            else: gesture['removed'].append(cmd)
+        gesture['added'].extend(added)
+
+    def erase_at(self, rect):
+        """Nesne silgisi: rect'e değen çizgileri bütün olarak history'den çıkarır"""
+        hits = [cmd for cmd in self.index.query_rect(rect)
+                if getattr(cmd, 'mode', None) != 'eraser' and cmd.hit_test(rect)]
+        if not hits: return None
+        self._record_erase(hits, [])
+        return self._splice(hits, [])
+
+    def erase_segment(self, p1, p2, radius):
+        """
+        Vektör silgi: p1-p2 silgi segmentinin değdiği çizgileri noktalarından keser.
+        Çizgi ya tamamen silinir ya da kalan parçalarına bölünür; history büyümez, küçülür.
+        """
+        a, b = (p1.x(), p1.y()), (p2.x(), p2.y())
+        area = _span(p1, p2, int(radius) + 1)
+        removed, added = [], []
+        for cmd in self.index.query_rect(area):
+            if cmd.type != 'path' or cmd.mode == 'eraser': continue
+            runs = erase_from_stroke(cmd.points, a, b, radius + cmd.width / 2)
+            if runs is None: continue
+            removed.append(cmd)
+            added.extend(cmd.with_points(run) for run in runs)
+        if not removed: return None
+        self._record_erase(removed, added)
+        return self._splice(removed, added)
+
+    def end_erase(self):
+        gesture, self._erase_gesture = self._erase_gesture, None
+        if gesture and (gesture['removed'] or gesture['added']):
+            self.push(EraseCommand(gesture['removed'], gesture['added']))
+
+    def _splice(self, removed, added):
+        """
+        removed komutlarını history/index'ten çıkarır, added komutlarını seq sırasına göre yerleştirir.
+        Sadece etkilenen karolar yeniden çizilir; değişen alanı döndürür.
+        """
+        if not removed and not added: return None
+        dirty = QRect()
+        for cmd in removed:
+            if cmd in self.history: self.history.remove(cmd)
+            self.index.remove(cmd)
+            dirty = dirty.united(cmd.rect)
+        for cmd in sorted(added, key=lambda c: c.seq):
+            pos = len(self.history)
+            while pos > 0 and self.history[pos - 1].seq > cmd.seq: pos -= 1
+            self.history.insert(pos, cmd)
+            self.index.insert(cmd, cmd.rect)
+            dirty = dirty.united(cmd.rect)
+        self._drop_checkpoints_from(min(cmd.seq for cmd in list(removed) + list(added)))
+        self.invalidate(dirty)
+        return dirty
+
+    def _tile_painter(self, key):
+        """Karoyu (gerekirse önce üretip) dünya koordinatında çizim yapan bir painter ile açar"""
+        if self.tiles.needs_render(key):
+            self.tiles.dirty.discard(key)
+            self._render_tile(key)
+        tile_rect = self.tiles.tile_rect(key)
+        painter = QPainter(self.tiles.tile(key))
         painter.setRenderHint(QPainter.Antialiasing)
+        painter.translate(-tile_rect.x(), -tile_rect.y())
+        if self.zoom != 1: painter.scale(self.zoom, self.zoom)
+        return painter
+
+    def _paint_on_tiles(self, rect, draw):
+        """rect'in (dünya) kestiği her karoda, karo koordinatına çevrilmiş bir painter ile draw(painter) çağırır"""
+        self._mark_other_levels(rect)
+        for key in self.tiles.keys_for_rect(_scaled(rect, self.zoom)):
+            painter = self._tile_painter(key)
+            draw(painter)
+            painter.end()
 
+    def draw_segment(self, p1, p2, color, width, mode, is_whiteboard):
+        """Fare hareket ederken sadece segmentin kestiği karolara anlık çizim yapar"""
+        return self.draw_segments([(p1, p2, width)], color, mode, is_whiteboard)
+
+    def draw_segments(self, segments, color, mode, is_whiteboard):
+        """
+        Bir karede (frame) biriken (p1, p2, kalınlık) segmentlerini çizer. Segmentler karolara
+        dağıtılır ve her karo için tek bir painter açılır. Kapsanan alanı (dünya) döndürür.
+        """
         if mode == "eraser":
+            scale = 3
             if is_whiteboard:
-                painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
-                pen = QPen(Qt.white, width * 3, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+                composition, pen_color = QPainter.CompositionMode_SourceOver, QColor(Qt.white)
             else:
-                painter.setCompositionMode(QPainter.CompositionMode_Clear)
-                pen = QPen(Qt.transparent, width * 3, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+                composition, pen_color = QPainter.CompositionMode_Clear, QColor(Qt.transparent)
         else:
-            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
-            pen = QPen(color, width, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+            scale, composition, pen_color = 1, QPainter.CompositionMode_SourceOver, color
+        pen = QPen(pen_color, 1, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+
+        by_tile, dirty = {}, QRect()
+        for p1, p2, width in segments:
+            width *= scale
+            rect = _span(p1, p2, int(width / 2) + 2)
+            dirty = dirty.united(rect)
+            for key in self.tiles.keys_for_rect(_scaled(rect, self.zoom)):
+                by_tile.setdefault(key, []).append((p1, p2, width))
+        if dirty.isNull(): return dirty
 
-        painter.setPen(pen)
-        painter.drawLine(p1, p2)
-        painter.end()
+        self._mark_other_levels(dirty)
+        for key, items in by_tile.items():
+            painter = self._tile_painter(key)
+            painter.setCompositionMode(composition)
+            for p1, p2, width in items:
+                pen.setWidthF(width)
+                painter.setPen(pen)
+                painter.drawLine(p1, p2)
+            painter.end()
+        return dirty
 
-    def add_stroke_to_history(self, path, color, width, mode, is_whiteboard):
+    def add_stroke_to_history(self, points, color, width, mode, is_whiteboard, pressures=None):
+        """
+        points: çizgi boyunca alınan (x, y) noktaları; pressures (tablet) her noktanın kalınlık çarpanı.
+        Kaydetmeden önce RDP ile sadeleştirilir ve eğri uydurulur; tekrar çizim maliyeti düşer.
+        Basınçlı çizgiler canlı çizimdeki gibi değişken kalınlıklı segmentler olarak saklanır (eğri uydurulmaz).
+        """
+        if not points: return
         saved_color = color
         if mode == "eraser":
             saved_color = Qt.white if is_whiteboard else Qt.transparent
-            
-        self.history.append({
-            'type': 'path', 
-            'path': QPainterPath(path), 
-            'color': saved_color, 
-            'width': width * (3 if mode == 'eraser' else 1), 
-            'mode': mode
-        })
+            pressures = None
+        simplify = self.simplify_tolerance > 0 and len(points) > 2
+        if simplify:
+            # Basınçsız çizgiye eğri uydurulur; eğrinin sapması da tolerans içinde tutulur
+            keep = (fit_mask if pressures is None else simplify_mask)(points, self.simplify_tolerance)
+            if pressures is not None:
+                # Kalınlığın belirgin değiştiği noktalar da kalır
+                last = pressures[0]
+                for i, f in enumerate(pressures):
+                    if keep[i] or abs(f - last) > PRESSURE_KEEP_DELTA:
+                        keep[i] = True
+                        last = f
+                pressures = [f for f, k in zip(pressures, keep) if k]
+            points = [p for p, k in zip(points, keep) if k]
+        fitted = simplify and pressures is None
+        sid = self.strokes.add(points, saved_color, width * (3 if mode == 'eraser' else 1), mode, fitted, pressures)
+        self.push(StrokeCommand(self.strokes, sid))
 
     def add_shape(self, shape_type, start, end, color, width):
         # Bu metod eski çizim şekilleri için (line, rect, ellipse - vektörel olmayan)
-        self.history.append({
-            'type': 'legacy_shape', 
-            'shape': shape_type, 
-            'start': start, 
-            'end': end, 
-            'color': color, 
-            'width': width
-        })
-        self.redraw()
+        cmd = ShapeCommand(shape_type, start, end, color, width)
+        self._paint_on_tiles(cmd.rect, cmd.draw)
+        self.push(cmd)
+
+    def add_stamp(self, pos, pixmap):
+        """Sabitlenen (damgalanan) görseli history'e ekler ki karolar yeniden çizilince kaybolmasın"""
+        cmd = StampCommand(pos, pixmap)
+        self._paint_on_tiles(cmd.rect, cmd.draw)
+        self.push(cmd)
 
     def add_widget_item(self, widget, widget_type):
         self.widgets.append(widget)
-        self.history.append({'type': widget_type, 'obj': widget})
+        self.push(WidgetCommand(widget, widget_type))
 
     def remove_widget_item(self, widget):
+        """Kullanıcı widget'ı kendisi sildiğinde (X / Sil) ilgili komutu her iki yığından da çıkarır"""
         self.cleanup_dead_widgets()
         if widget in self.widgets: self.widgets.remove(widget)
-        for i in range(len(self.history) - 1, -1, -1):
-            if self.history[i].get('obj') == widget:
-                self.history.pop(i)
-                break
+        for stack in (self.history, self.redo_stack):
+            for i in range(len(stack) - 1, -1, -1):
+                if stack[i].obj == widget:
+                    stack.pop(i)
+                    return
+
+    # --- CHECKPOINT ---
+    def _on_raster_added(self, complexity):
+        self._since_checkpoint += 1
+        self._complexity_since_checkpoint += complexity
+        if self._since_checkpoint >= self.checkpoint_interval or self._complexity_since_checkpoint >= CHECKPOINT_COMPLEXITY:
+            self._take_checkpoint()
+
+    def _take_checkpoint(self):
+        """Karoların anlık görüntüsünü alır (QPixmap kopyaları implicit-shared, ucuzdur)"""
+        self._since_checkpoint = 0
+        self._complexity_since_checkpoint = 0
+        if self.checkpoint_budget <= 0: return
+        # Canlı çizilen segmentler path'in birebir aynısı değil; anlık görüntü tekrar çizimle tutarlı olsun
+        previous = self.checkpoints[-1]['seq'] if self.checkpoints else 0
+        for cmd in reversed(self.history):
+            if cmd.seq <= previous: break
+            if cmd.is_raster: self.tiles.mark_dirty(_scaled(cmd.rect, self.zoom))
+        self.flush()
+        self.checkpoints.append({
+            'seq': self.history[-1].seq if self.history else 0,
+            'tiles': {key: QPixmap(pix) for key, pix in self.tiles.tiles.items() if key not in self.tiles.dirty},
+            # Bu anda içeriği bilinen karolar; diğerleri checkpoint'ten değil baştan çizilir
+            'known': (set(self.tiles.tiles) | self.tiles.empty) - self.tiles.dirty,
+            'bytes': self.tiles.bytes_used()
+        })
+        # Bellek bütçesi aşılırsa en eski checkpoint'ler atılır (en yenisi her zaman kalır)
+        while len(self.checkpoints) > 1 and self.checkpoint_bytes() > self.checkpoint_budget:
+            self.checkpoints.pop(0)
+
+    def _drop_checkpoints_from(self, seq):
+        """seq'li komutu içeren (ondan sonra alınmış) checkpoint'leri atar"""
+        while self.checkpoints and self.checkpoints[-1]['seq'] >= seq:
+            self.checkpoints.pop()
+
+    def release_raster(self):
+        """
+        Karoları ve checkpoint'leri bırakır, history ve çizgi verisi kalır (aktif olmayan sayfalar).
+        Karolar kirli işaretlenir; katman tekrar çizildiğinde render() içinde yeniden üretilir.
+        """
+        if not self.tiles.tiles and not self.checkpoints and not self._levels: return
+        self.tiles.clear()
+        self._levels.clear()
+        self.checkpoints.clear()
+        self._since_checkpoint = 0
+        self._complexity_since_checkpoint = 0
+
+    def raster_bytes(self):
+        return self.tiles.bytes_used() + self.checkpoint_bytes()
+
+    def checkpoint_bytes(self):
+        return sum(cp['bytes'] for cp in self.checkpoints)
+
+    def invalidate(self, rect):
+        """rect'in (dünya) kestiği karoları kirli işaretler ve aktif zoom seviyesinde hemen yeniden çizer"""
+        self._mark_dirty(rect)
+        self.flush()
+
+    def _mark_dirty(self, rect):
+        self.tiles.mark_dirty(_scaled(rect, self.zoom))
+        self._mark_other_levels(rect)
+
+    def _mark_other_levels(self, rect):
+        """Önbellekteki diğer zoom seviyeleri eskimesin; o seviyeye dönülünce bu karolar tekrar çizilir"""
+        for level, store in self._levels.items():
+            store.mark_dirty(_scaled(rect, ZOOM_STEP ** level))
+
+    def flush(self):
+        """Kirli karoları history'den yeniden çizer; içinde hiçbir şey kalmayan karoyu bırakır"""
+        if not self.tiles.dirty: return
+        dirty = self.tiles.dirty
+        if self.infinite:
+            # Sonsuz tuvalde görünüm dışındaki kirli karolar görünüme girince çizilir
+            dirty = dirty.intersection(self.tiles.keys_for_rect(self.viewport()))
+            self.tiles.dirty = self.tiles.dirty - dirty
+        else:
+            self.tiles.dirty = set()
+        for key in dirty:
+            self._render_tile(key)
+
+    def _render_tile(self, key):
+        tile_rect = self.tiles.tile_rect(key)
+        zoom = self.zoom
+        # En yakın checkpoint'ten başla, sadece ondan sonraki ve bu karoya değen komutları (index) tekrar çiz
+        checkpoint = self.checkpoints[-1] if self.checkpoints and key in self.checkpoints[-1]['known'] else None
+        base = checkpoint['tiles'].get(key) if checkpoint else None
+        base_seq = checkpoint['seq'] if checkpoint else 0
+        items = [cmd for cmd in self.index.query_rect(_scaled(tile_rect, 1 / zoom) if zoom != 1 else tile_rect) if cmd.seq > base_seq]
+        if zoom < 1:
+            # Uzaktan bakınca ekranda piksel altı kalan öğeler atlanır (LOD)
+            min_size = LOD_MIN_PIXELS / zoom
+            items = [cmd for cmd in items if max(cmd.rect.width(), cmd.rect.height()) >= min_size]
+        items.sort(key=lambda c: c.seq)
+        if not items and base is None:
+            self.tiles.drop(key)
+            return
+
+        # Checkpoint karosu bozulmasın diye yeni bir (copy-on-write) kopya üzerine çizilir
+        pix = QPixmap(base) if base is not None else self.tiles.tile(key)
+        if base is None: pix.fill(Qt.transparent)
+        self.tiles.tiles[key] = pix
+        p = QPainter(pix)
+        p.setRenderHint(QPainter.Antialiasing)
+        p.translate(-tile_rect.x(), -tile_rect.y())
+        if zoom != 1: p.scale(zoom, zoom)
+        for cmd in items:
+            cmd.draw(p)
+        p.end()
 
     def redraw(self):
-        """History'den her şeyi baştan çizer"""
+        """History'den her şeyi baştan çizer (mevcut tüm karolar + öğelerin kapladığı karolar)"""
         self.cleanup_dead_widgets() # Render öncesi güvenlik
-        self.pixmap.fill(Qt.transparent)
-        p = QPainter(self.pixmap)
-        p.setRenderHint(QPainter.Antialiasing)
-        
-        for item in self.history:
-            if item.get('obj'):
-                continue
-
-            if item.get('type') == 'path':
-                mode = item.get('mode')
-                if mode == 'eraser' and item['color'] == Qt.transparent:
-                     p.setCompositionMode(QPainter.CompositionMode_Clear)
-                else:
-                     p.setCompositionMode(QPainter.CompositionMode_SourceOver)
-                     
-                p.setPen(QPen(item['color'], item['width'], Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
-                p.drawPath(item['path'])
-                
-            elif item.get('type') == 'legacy_shape' or (item.get('type') == 'shape' and 'color' in item):
-                p.setCompositionMode(QPainter.CompositionMode_SourceOver)
-                p.setPen(QPen(item['color'], item['width']))
-                rect = QRect(item['start'], item['end']).normalized()
-                if item['shape'] == 'line': p.drawLine(item['start'], item['end'])
-                elif item['shape'] == 'rect': p.drawRect(rect)
-                elif item['shape'] == 'ellipse': p.drawEllipse(rect)
-        p.end()
\ No newline at end of file
+        if self.infinite:
+            # Sonsuz tuvalde her şeyi çizmek yerine karolar bırakılır; görünüme girenler tekrar üretilir
+            self.release_raster()
+            return
+        self.tiles.mark_all_dirty()
+        for cmd in self.history:
+            if cmd.is_raster:
+                self.tiles.mark_dirty(cmd.rect)
+        self.flush()
+
+    def render(self, painter, rect):
+        """Sadece rect'i (ekran) kesen karoları painter'a çizer; kirli / henüz çizilmemiş karolar önce üretilir"""
+        for key in self.tiles.keys_for_rect(rect.translated(self.pan)):
+            if self.tiles.needs_render(key):
+                self.tiles.dirty.discard(key)
+                self._render_tile(key)
+            pix = self.tiles.tiles.get(key)
+            if pix is not None:
+                painter.drawPixmap(self.tiles.tile_rect(key).topLeft() - self.pan, pix)
+        if self.infinite:
+            viewport = self.tiles.keys_for_rect(self.viewport())
+            self.tiles.evict(set(viewport), len(viewport) * TILE_CACHE_FACTOR)
+
+    def prerender(self):
+        """Görünümdeki karoları şimdiden üretir (ör. komşu sayfalar boştayken)"""
+        for key in self.tiles.keys_for_rect(self.viewport()):
+            if self.tiles.needs_render(key):
+                self.tiles.dirty.discard(key)
+                self._render_tile(key)
+
+    # --- GÖRÜNÜM (SONSUZ TUVAL) ---
+    def viewport(self):
+        """Ekranın zoom'lanmış uzaydaki karşılığı (karo anahtarları bu uzaydadır)"""
+        return QRect(self.pan, self.size)
+
+    def set_view(self, pan, zoom_level=None):
+        """Kaydırma (pan, zoom'lanmış uzayda) ve zoom seviyesini ayarlar; sonlu katmanlarda etkisizdir"""
+        if not self.infinite: return
+        zoom_level = self.zoom_level if zoom_level is None else max(MIN_ZOOM_LEVEL, min(MAX_ZOOM_LEVEL, int(zoom_level)))
+        if zoom_level != self.zoom_level:
+            self._levels[self.zoom_level] = self.tiles
+            self.tiles = self._levels.pop(zoom_level, None) or TileStore(None, dpr=self.dpr)
+            while len(self._levels) > ZOOM_LEVEL_CACHE: self._levels.popitem(last=False)
+            # Checkpoint karoları bir zoom seviyesine aittir
+            self.checkpoints.clear()
+            self._since_checkpoint = 0
+            self._complexity_since_checkpoint = 0
+            self.zoom_level = zoom_level
+            self.zoom = ZOOM_STEP ** zoom_level
+        self.pan = QPoint(pan)
+
+    def pan_for_zoom(self, anchor, zoom_level):
+        """anchor (ekran) noktasının altındaki dünya noktası sabit kalacak şekilde yeni pan değeri"""
+        world = self.to_world(anchor)
+        zoom = ZOOM_STEP ** max(MIN_ZOOM_LEVEL, min(MAX_ZOOM_LEVEL, int(zoom_level)))
+        return QPoint(round(world.x() * zoom - anchor.x()), round(world.y() * zoom - anchor.y()))
+
+    def is_identity_view(self):
+        return self.zoom == 1 and self.pan.isNull()
+
+    def to_world(self, pos):
+        """Ekran noktası -> katman (dünya) noktası; varsayılan görünümde aynen döner"""
+        if self.is_identity_view(): return pos
+        return QPointF((pos.x() + self.pan.x()) / self.zoom, (pos.y() + self.pan.y()) / self.zoom)
+
+    def to_screen(self, pos):
+        if self.is_identity_view(): return pos
+        return QPointF(pos.x() * self.zoom - self.pan.x(), pos.y() * self.zoom - self.pan.y())
+
+    def to_screen_rect(self, rect):
+        if self.is_identity_view(): return rect
+        return _scaled(rect, self.zoom).translated(-self.pan)
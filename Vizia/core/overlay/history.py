@@ -0,0 +1,223 @@
+try:
+    import sip
+except ImportError:
+    import PyQt5.sip as sip
+
+from PyQt5.QtGui import QPainter, QPen, QPainterPathStroker
+from PyQt5.QtCore import Qt, QRect, QRectF, QPoint, QPointF
+
+
+WIDGET_TYPES = ('text', 'image', 'shape', 'geometry_shape')
+
+
+class HistoryCommand:
+    """
+    Katman history'sindeki geri alınabilir / yinelenebilir tek bir işlem.
+    Raster komutları karolara çizilir (draw), widget komutları ekrandaki bir objeyi yönetir.
+    seq, katmana eklenme sırasıdır; karolar tekrar çizilirken raster komutlar bu sırayla çizilir.
+    Komutlar çok sayıda tutulduğu için hepsi __slots__ kullanır (örnek başına __dict__ yok).
+    """
+    __slots__ = ()
+    type = None
+    is_raster = False
+    rect = None
+    obj = None
+    complexity = 1
+    seq = 0
+
+    def draw(self, painter):
+        pass
+
+    def hit_test(self, rect):
+        """Nesne silgisi için: komut rect (QRect) alanına değiyor mu?"""
+        return self.rect is not None and self.rect.intersects(rect)
+
+    def undo(self, layer):
+        """Raster olmayan komutlar için geri alma; yeniden çizilen alanı (varsa) döndürür"""
+        return None
+
+    def redo(self, layer):
+        return None
+
+    def discard(self):
+        """Komut redo yığınından kalıcı olarak düşürülürken (veya clear'da) çağrılır"""
+        pass
+
+    def is_alive(self):
+        return True
+
+
+class StrokeCommand(HistoryCommand):
+    """
+    Kalem / silgi çizgisi. Veriler katmanın StrokeStore'unda durur; komut sadece (store, sid) tutar.
+    """
+    __slots__ = ('store', 'sid', 'seq', 'rect', '_outline')
+    type = 'path'
+    is_raster = True
+
+    def __init__(self, store, sid):
+        self.store = store
+        self.sid = sid
+        self.seq = 0
+        self._outline = None
+        self.rect = store.rect(sid, int(store.width(sid) / 2) + 2)
+
+    @property
+    def points(self): return self.store.points(self.sid)
+    @property
+    def path(self): return self.store.path(self.sid)
+    @property
+    def color(self): return self.store.color(self.sid)
+    @property
+    def width(self): return self.store.width(self.sid)
+    @property
+    def mode(self): return self.store.mode(self.sid)
+    @property
+    def fitted(self): return self.store.fitted(self.sid)
+    @property
+    def complexity(self): return self.store.counts[self.sid]
+
+    def with_points(self, points):
+        """Aynı stilde, başka noktalardan oluşan (bölünmüş) bir parça üretir; sırası (seq) korunur"""
+        pressures = None
+        if self.store.has_pressure(self.sid):
+            # Silginin eklediği ara noktalar bir önceki noktanın basıncını alır
+            known = dict(zip(self.points, self.store.pressure_factors(self.sid)))
+            pressures, last = [], 1.0
+            for point in points:
+                last = known.get(point, last)
+                pressures.append(last)
+        piece = StrokeCommand(self.store, self.store.add(points, self.color, self.width, self.mode, self.fitted, pressures))
+        piece.seq = self.seq
+        return piece
+
+    def hit_test(self, rect):
+        if not self.rect.intersects(rect): return False
+        if self._outline is None:
+            stroker = QPainterPathStroker()
+            stroker.setWidth(max(1, self.width))
+            stroker.setCapStyle(Qt.RoundCap)
+            stroker.setJoinStyle(Qt.RoundJoin)
+            self._outline = stroker.createStroke(self.path)
+        return self._outline.intersects(QRectF(rect))
+
+    def draw(self, p):
+        color = self.color
+        if self.mode == 'eraser' and color.alpha() == 0:
+             p.setCompositionMode(QPainter.CompositionMode_Clear)
+        else:
+             p.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        pen = QPen(color, self.width, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+        if self.store.has_pressure(self.sid):
+            # Her segment, bitiş noktasının basıncıyla (canlı çizimdeki gibi) çizilir
+            points, factors = self.points, self.store.pressure_factors(self.sid)
+            for i in range(1, len(points)):
+                pen.setWidthF(self.width * factors[i])
+                p.setPen(pen)
+                p.drawLine(QPointF(*points[i - 1]), QPointF(*points[i]))
+            return
+        p.setPen(pen)
+        p.drawPath(self.path)
+
+
+class ShapeCommand(HistoryCommand):
+    """Eski çizim şekilleri (line, rect, ellipse - vektörel olmayan)"""
+    __slots__ = ('shape', 'start', 'end', 'color', 'width', 'rect', 'seq')
+    type = 'legacy_shape'
+    is_raster = True
+
+    def __init__(self, shape, start, end, color, width):
+        self.seq = 0
+        self.shape = shape
+        self.start = QPoint(int(start.x()), int(start.y()))
+        self.end = QPoint(int(end.x()), int(end.y()))
+        self.color = color
+        self.width = width
+        margin = int(width / 2) + 2
+        self.rect = QRect(self.start, self.end).normalized().adjusted(-margin, -margin, margin, margin)
+
+    def draw(self, p):
+        p.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        p.setPen(QPen(self.color, self.width))
+        rect = QRect(self.start, self.end).normalized()
+        if self.shape == 'line': p.drawLine(self.start, self.end)
+        elif self.shape == 'rect': p.drawRect(rect)
+        elif self.shape == 'ellipse': p.drawEllipse(rect)
+
+
+class StampCommand(HistoryCommand):
+    """Katmana sabitlenmiş (damgalanmış) görsel"""
+    __slots__ = ('pos', 'pixmap', 'rect', 'encoded', 'seq')
+    type = 'stamp'
+    is_raster = True
+
+    def __init__(self, pos, pixmap):
+        self.seq = 0
+        self.encoded = None  # Oturum kaydında bir kez kodlanan PNG baytları (görsel değişmez)
+        self.pos = QPoint(pos)
+        self.pixmap = pixmap
+        self.rect = QRect(self.pos, pixmap.size())
+
+    def draw(self, p):
+        p.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        p.drawPixmap(self.pos, self.pixmap)
+
+
+class WidgetCommand(HistoryCommand):
+    """
+    Metin, görsel ve geometri şekli gibi widget öğeleri.
+    Geri alınınca yok edilmez; gizlenip bekletilir, böylece redo anında (yeniden yükleme olmadan) geri gelir.
+    """
+    __slots__ = ('obj', 'type', 'seq')
+
+    def __init__(self, widget, widget_type):
+        self.seq = 0
+        self.obj = widget
+        self.type = widget_type
+
+    def is_alive(self):
+        try:
+            return not sip.isdeleted(self.obj)
+        except: return False
+
+    def undo(self, layer):
+        if self.obj in layer.widgets: layer.widgets.remove(self.obj)
+        try:
+            toolbar = getattr(self.obj, 'format_toolbar', None)
+            if toolbar is not None: toolbar.hide()
+            self.obj.hide()
+        except RuntimeError: pass
+
+    def redo(self, layer):
+        if self.obj not in layer.widgets: layer.widgets.append(self.obj)
+        try:
+            self.obj.show()
+            self.obj.raise_()
+        except RuntimeError: pass
+
+    def discard(self):
+        try:
+            self.obj.close()
+            self.obj.deleteLater() # Bellekten de sil
+        except: pass
+
+
+class EraseCommand(HistoryCommand):
+    """
+    Nesne / vektör silgisinin tek hareketi. removed komutları history'den gerçekten çıkarılır,
+    added ise vektör silginin böldüğü çizgilerden kalan parçalardır.
+    Geri alınınca her şey eski sırasına (seq) göre yerine konur.
+    """
+    __slots__ = ('removed', 'added', 'seq')
+    type = 'erase'
+
+    def __init__(self, removed, added=()):
+        self.seq = 0
+        self.removed = list(removed)
+        self.added = list(added)
+
+    def undo(self, layer):
+        return layer._splice(self.added, self.removed)
+
+    def redo(self, layer):
+        return layer._splice(self.removed, self.added)
@@ -0,0 +1,70 @@
+"""
+Kısayol tablosu
+Ayarlardaki kısayollar bir kez (key, modifiers) -> eylem sözlüğüne çevrilir; her tuş olayı
+tek bir sözlük aramasıdır. Ayarlar değişince tablo yeniden kurulur. Eklentiler register ile
+kendi kısayollarını ekler; aynı tuşa bağlı eylemler kayıt sırasıyla denenir.
+"""
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QKeySequence
+
+# Numpad tuşlarındaki KeypadModifier kısayol eşleşmesini bozmasın
+_MODIFIER_MASK = int(Qt.ShiftModifier | Qt.ControlModifier | Qt.AltModifier | Qt.MetaModifier)
+
+
+def split_key(code):
+    """QKeySequence elemanını (key, modifiers) çiftine ayırır"""
+    return code & ~int(Qt.KeyboardModifierMask), code & _MODIFIER_MASK
+
+
+class Hotkey:
+    __slots__ = ('action', 'callback', 'default', 'enabled', 'owner')
+
+    def __init__(self, action, callback, default=None, enabled=None, owner=None):
+        self.action = action
+        self.callback = callback
+        self.default = default    # ayarlarda bu eylem yoksa kullanılan tuş
+        self.enabled = enabled    # isteğe bağlı koşul (örn. sadece beyaz tahtada)
+        self.owner = owner        # eklenti kısayollarını topluca kaldırmak için
+
+
+class HotkeyTable:
+    def __init__(self, settings):
+        self.settings = settings
+        self.hotkeys = []
+        self.table = {}
+        settings.changed.connect(self._on_setting_changed)
+
+    def _on_setting_changed(self, key, value):
+        if key == "hotkeys": self.rebuild()
+
+    def register(self, action, callback, default=None, enabled=None, owner=None):
+        """
+        action ayarlardaki "hotkeys" içinde varsa oradaki tuş, yoksa default kullanılır.
+        callback argümansız çağrılır; enabled verilirse sadece True döndürdüğünde tetiklenir.
+        """
+        self.hotkeys.append(Hotkey(action, callback, default, enabled, owner))
+        self.rebuild()
+
+    def unregister(self, action=None, owner=None):
+        self.hotkeys = [h for h in self.hotkeys if not ((action is None or h.action == action) and (owner is None or h.owner is owner))]
+        self.rebuild()
+
+    def key_for(self, hotkey):
+        if hotkey.action in self.settings.get("hotkeys"): return self.settings.key_sequence(hotkey.action)
+        return QKeySequence(hotkey.default) if hotkey.default else None
+
+    def rebuild(self):
+        table = {}
+        for hotkey in self.hotkeys:
+            seq = self.key_for(hotkey)
+            # Çok adımlı diziler (Ctrl+K, Ctrl+S) desteklenmez; tek tuş kombinasyonu gerekir
+            if seq is None or seq.count() != 1: continue
+            table.setdefault(split_key(seq[0]), []).append(hotkey)
+        self.table = table
+
+    def match(self, key, modifiers):
+        """Tuşa bağlı ve şu an etkin olan ilk kısayol (yoksa None)"""
+        for hotkey in self.table.get((key, int(modifiers) & _MODIFIER_MASK), ()):
+            if hotkey.enabled is None or hotkey.enabled(): return hotkey
+        return None
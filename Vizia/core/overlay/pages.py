@@ -0,0 +1,211 @@
+"""
+Beyaz tahta sayfaları
+Sadece aktif sayfa (ve isteğe bağlı komşuları) karolarını (pixmap) tutar. Diğer sayfalar
+bellekte sadece vektör olarak (history + StrokeStore) durur; bellekteki sayfa sayısı sınırı
+aşılınca en uzun süredir kullanılmayanlar oturum biçiminde diske alınır.
+Böylece sayfa sayısı ne olursa olsun raster bellek sabit kalır.
+Diğer monitörlerin tahta katmanları da sayfaya aittir (BoardPage.screens); sayfayla birlikte
+değişir, bırakılır ve diske alınır.
+"""
+
+import os
+import shutil
+import tempfile
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QApplication
+
+from .canvas import CanvasLayer
+from .session import SessionWriter, read_session
+
+DEFAULT_KEEP_NEIGHBORS = 1
+DEFAULT_PAGES_IN_MEMORY = 8
+
+
+class BoardPage:
+    """Tek sayfa: bellekte (layer) ya da diske alınmış (spill_path)"""
+    __slots__ = ('layer', 'screens', 'spill_path', 'writer', 'last_used')
+
+    def __init__(self, layer, screens=None):
+        self.layer = layer
+        # Ekran adı -> CanvasLayer ya da henüz yüklenmemiş katman verisi (read_session çıktısı)
+        self.screens = screens or {}
+        self.spill_path = None
+        self.writer = None
+        self.last_used = 0
+
+
+class BoardPages(QObject):
+    page_changed = pyqtSignal(int, int)  # (aktif sayfa, sayfa sayısı)
+
+    def __init__(self, overlay, first_layer, keep_neighbors=DEFAULT_KEEP_NEIGHBORS, pages_in_memory=DEFAULT_PAGES_IN_MEMORY):
+        super().__init__(overlay)
+        self.overlay = overlay
+        self.keep_neighbors = max(0, int(keep_neighbors if keep_neighbors is not None else DEFAULT_KEEP_NEIGHBORS))
+        self.pages_in_memory = max(1, int(pages_in_memory or DEFAULT_PAGES_IN_MEMORY))
+        self.pages = [BoardPage(first_layer)]
+        self.index = 0
+        self._clock = 0
+        self._spill_dir = None
+        QApplication.instance().aboutToQuit.connect(self._remove_spill_dir)
+
+    def count(self):
+        return len(self.pages)
+
+    @property
+    def current(self):
+        return self.pages[self.index]
+
+    def loaded_layers(self):
+        layers = []
+        for page in self.pages:
+            if page.layer is None: continue
+            layers.append(page.layer)
+            layers.extend(layer for layer in page.screens.values() if isinstance(layer, CanvasLayer))
+        return layers
+
+    def new_layer(self, screen=None):
+        size = screen.size() if screen is not None else self.overlay.desktop_layer.size
+        return CanvasLayer(size, **self.overlay.board_layer_options(screen))
+
+    def screen_layer(self, key, screen, create=True):
+        """Aktif sayfanın verilen ekrandaki katmanı; kayıtlı veri varsa ilk istendiğinde yüklenir"""
+        screens = self.current.screens
+        layer = screens.get(key)
+        if isinstance(layer, dict):
+            data, layer = layer, self.new_layer(screen)
+            self.overlay.session.load_layer(layer, data)
+            screens[key] = layer
+        elif layer is None and create:
+            layer = screens[key] = self.new_layer(screen)
+        return layer
+
+    # --- GEZİNME ---
+    def add_page(self):
+        """Aktif sayfanın arkasına boş bir sayfa ekler ve ona geçer"""
+        self.pages.insert(self.index + 1, BoardPage(self.new_layer()))
+        self.go_to(self.index + 1)
+
+    def next_page(self):
+        """Sonraki sayfaya geçer; son sayfadaysa yeni sayfa açar"""
+        if self.index + 1 < len(self.pages): self.go_to(self.index + 1)
+        else: self.add_page()
+
+    def prev_page(self):
+        if self.index > 0: self.go_to(self.index - 1)
+
+    def go_to(self, index):
+        index = max(0, min(index, len(self.pages) - 1))
+        old = self.pages[self.index].layer if self.index < len(self.pages) else None
+        self.index = index
+        layer = self._materialize(self.current)
+        if old is not None and old is not layer: self._set_widgets_visible(old, False)
+
+        self.overlay.board_layer = layer
+        if self.overlay.whiteboard_mode:
+            self.overlay.active_layer = layer
+            self._set_widgets_visible(layer, True)
+        self._rebalance()
+        self.overlay.update()
+        self.overlay.surfaces.update_all()
+        self.page_changed.emit(self.index, len(self.pages))
+
+    def reset(self, count, loader, active=0, screens=None):
+        """
+        Tüm sayfaları atıp count yeni sayfa kurar; loader(i, layer) her birini doldurur (oturum yükleme).
+        screens: sayfa -> {ekran adı: katman verisi}; diğer ekranların katmanları ilk gösterildiğinde yüklenir.
+        """
+        for page in self.pages: self._drop(page)
+        self.pages = []
+        screens = screens or {}
+        for i in range(max(1, count)):
+            layer = self.new_layer()
+            if i < count: loader(i, layer)
+            layer.release_raster()
+            self.pages.append(BoardPage(layer, dict(screens.get(i, {}))))
+        self.index = len(self.pages)  # go_to eski sayfa aramasın
+        self.go_to(active)
+
+    # --- BELLEK YÖNETİMİ ---
+    def _rebalance(self):
+        """Komşu olmayan sayfaların karolarını bırakır, bellek sınırını aşan sayfaları diske alır"""
+        self._clock += 1
+        self.current.last_used = self._clock
+        for i, page in enumerate(self.pages):
+            if page.layer is None or i == self.index: continue
+            if abs(i - self.index) <= self.keep_neighbors:
+                # Komşu sayfa boşta önceden çizilir; ona geçiş anında olur
+                QTimer.singleShot(0, lambda p=page: self._warm(p))
+            else:
+                for layer in [page.layer] + list(page.screens.values()):
+                    if isinstance(layer, CanvasLayer): layer.release_raster()
+
+        loaded = [page for page in self.pages if page.layer is not None and page is not self.current]
+        loaded.sort(key=lambda page: page.last_used)
+        while len(loaded) + 1 > self.pages_in_memory:
+            self._spill(loaded.pop(0))
+
+    def _warm(self, page):
+        if page.layer is None or page not in self.pages: return
+        if abs(self.pages.index(page) - self.index) <= self.keep_neighbors:
+            for layer in [page.layer] + list(page.screens.values()):
+                if isinstance(layer, CanvasLayer): layer.prerender()
+
+    def _spill(self, page):
+        """Sayfayı oturum biçiminde diske yazar (arka planda) ve bellekten atar"""
+        layer, session = page.layer, self.overlay.session
+        if self._spill_dir is None: self._spill_dir = tempfile.mkdtemp(prefix="vizia_pages_")
+        page.spill_path = os.path.join(self._spill_dir, f"page_{id(page)}.vizia")
+        data = [session.snapshot_layer(layer, 'board')] + session.snapshot_screens(page.screens, 'screen_board')
+        session.forget_pending(layer)
+        page.writer = SessionWriter(page.spill_path, data, layer.strokes.ARRAY_FIELDS)
+        page.writer.start()
+        page.layer = None
+        layer.clear()
+        for screen_layer in page.screens.values():
+            if isinstance(screen_layer, CanvasLayer): screen_layer.clear()
+        page.screens = {}
+
+    def read_spilled(self, page):
+        """Diske alınmış sayfanın katmanları: ilk eleman birincil ekranın, kalanlar diğer ekranların"""
+        if page.writer is not None:
+            page.writer.wait()
+            page.writer = None
+        return read_session(page.spill_path, self.overlay.desktop_layer.strokes.ARRAY_FIELDS)
+
+    def _materialize(self, page):
+        if page.layer is None:
+            data = self.read_spilled(page)
+            layer = self.new_layer()
+            self.overlay.session.load_layer(layer, data[0])
+            page.layer = layer
+            page.screens = {d['header']['screen']: d for d in data[1:]}
+            try: os.remove(page.spill_path)
+            except OSError: pass
+            page.spill_path = None
+        return page.layer
+
+    def _drop(self, page):
+        if page.layer is not None:
+            self.overlay.session.forget_pending(page.layer)
+            page.layer.clear()
+            for layer in page.screens.values():
+                if isinstance(layer, CanvasLayer): layer.clear()
+        elif page.spill_path:
+            if page.writer is not None: page.writer.wait()
+            try: os.remove(page.spill_path)
+            except OSError: pass
+
+    def _set_widgets_visible(self, layer, visible):
+        layer.cleanup_dead_widgets()
+        for w in layer.widgets:
+            try:
+                w.setVisible(visible)
+                toolbar = getattr(w, 'format_toolbar', None)
+                if toolbar is not None and not visible: toolbar.hide()
+            except RuntimeError: pass
+
+    def _remove_spill_dir(self):
+        for page in self.pages:
+            if page.writer is not None: page.writer.wait()
+        if self._spill_dir: shutil.rmtree(self._spill_dir, ignore_errors=True)
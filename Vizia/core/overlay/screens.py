@@ -0,0 +1,145 @@
+"""
+Çoklu monitör
+Birincil ekranı DrawingOverlay kaplar; diğer her ekran için bir ScreenSurface açılır.
+Yüzeyler kendi katmanlarını o ekranın devicePixelRatio'sunda tutar, fare olaylarını ise
+overlay'e iletir (çizim mantığı tek yerde kalır). Katmanlar ekranda ilk çizim yapılınca
+oluşturulur; hiç çizilmeyen ekran raster bellek harcamaz.
+Masaüstü katmanı yüzeye, tahta katmanları ise aktif tahta sayfasına aittir (BoardPages.screen_layer);
+oturumda ekran adıyla saklanır. Ekran çıkarılınca masaüstü çizimi kaybolmaz, ekran geri gelince yüklenir.
+"""
+
+from PyQt5.QtWidgets import QWidget, QApplication
+from PyQt5.QtCore import Qt, QObject
+from PyQt5.QtGui import QPainter
+
+from .canvas import CanvasLayer
+
+
+class ScreenSurface(QWidget):
+    """Birincil olmayan tek bir ekranı kaplayan şeffaf çizim yüzeyi"""
+    def __init__(self, overlay, screen):
+        super().__init__(None)
+        self.overlay = overlay
+        self.target_screen = screen
+        self.key = screen.name()
+        self._desktop = None  # ilk çizimde (ya da kayıtlı çizim varsa ilk gösterimde) oluşur
+
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.create()
+        self.windowHandle().setScreen(screen)
+        self.fit_screen()
+
+    def fit_screen(self):
+        self.setGeometry(self.target_screen.geometry())
+        self.showFullScreen()
+
+    def layer(self, board, create=True):
+        if board: return self.overlay.pages.screen_layer(self.key, self.target_screen, create)
+        if self._desktop is None:
+            data = self.overlay.surfaces.saved.pop(self.key, None)
+            if data is not None or create:
+                self._desktop = CanvasLayer(self.target_screen.size(), **self.overlay.layer_options(self.target_screen))
+                if data is not None: self.overlay.session.load_layer(self._desktop, data)
+        return self._desktop
+
+    @property
+    def active_layer(self):
+        return self.layer(self.overlay.whiteboard_mode)
+
+    def layers(self):
+        """Bu ekranda oluşturulmuş katmanlar (masaüstü ve aktif sayfanınki)"""
+        return [layer for layer in (self._desktop, self.layer(True, create=False)) if layer is not None]
+
+    def is_mouse_on_ui(self, pos):
+        return self.overlay.is_global_on_ui(self.mapToGlobal(pos))
+
+    def mousePressEvent(self, event): self.overlay.surface_press(self, event)
+    def mouseMoveEvent(self, event): self.overlay.surface_move(self, event)
+    def mouseReleaseEvent(self, event): self.overlay.surface_release(self, event)
+    def tabletEvent(self, event): self.overlay.surface_tablet(self, event)
+
+    def wheelEvent(self, event):
+        if not self.overlay.surface_wheel(self, event): super().wheelEvent(event)
+
+    def paintEvent(self, event):
+        p = QPainter(self)
+        self.overlay.paint_surface(self, p, event.rect())
+
+    def take_desktop(self):
+        """Masaüstü katmanını oturum verisi olarak çıkarır (tahta katmanları sayfalarda kalır)"""
+        layer, self._desktop = self._desktop, None
+        if layer is None: return None
+        data = self.overlay.session.snapshot_layer(layer, 'screen_desktop')
+        layer.clear()
+        return data if data['header']['commands'] else None
+
+    def discard_desktop(self):
+        if self._desktop is not None: self._desktop.clear()
+        self._desktop = None
+
+    def discard(self):
+        self.discard_desktop()
+        self.close()
+        self.deleteLater()
+
+
+class ScreenSurfaces(QObject):
+    """Ekran eklenip çıkarıldıkça yüzeyleri açıp kapatır"""
+    def __init__(self, overlay, enabled=True):
+        super().__init__(overlay)
+        self.overlay = overlay
+        self.surfaces = {}  # QScreen -> ScreenSurface
+        self.saved = {}     # ekran adı -> henüz gösterilmemiş / bağlı olmayan ekranın masaüstü katman verisi
+        if not enabled: return
+        app = QApplication.instance()
+        for screen in app.screens(): self._add(screen)
+        app.screenAdded.connect(self._add)
+        app.screenRemoved.connect(self._remove)
+
+    def __iter__(self):
+        return iter(list(self.surfaces.values()))
+
+    def _add(self, screen):
+        if screen is QApplication.primaryScreen() or screen in self.surfaces: return
+        surface = ScreenSurface(self.overlay, screen)
+        screen.geometryChanged.connect(lambda _, s=surface: s.fit_screen())
+        self.surfaces[screen] = surface
+
+    def _remove(self, screen):
+        surface = self.surfaces.pop(screen, None)
+        if surface is None: return
+        # Ekran geri takılınca (ya da sonraki oturumda) çizim geri gelsin
+        data = surface.take_desktop()
+        if data is not None: self.saved[surface.key] = data
+        surface.discard()
+
+    def layers(self, board=None):
+        """Oluşturulmuş katmanlar; board verilirse sadece o moda ait olanlar"""
+        if board is None: return [layer for s in self for layer in s.layers()]
+        if not board: return [s._desktop for s in self if s._desktop is not None]
+        return [layer for layer in (s.layer(True, create=False) for s in self) if layer is not None]
+
+    def desktop_layers(self):
+        """Oturuma yazılacak masaüstü katmanları: ekran adı -> CanvasLayer ya da saklanan veri"""
+        layers = dict(self.saved)
+        for surface in self:
+            if surface._desktop is not None: layers[surface.key] = surface._desktop
+        return layers
+
+    def restore(self, layers):
+        """Oturum yüklenirken: ekran adı -> katman verisi; mevcut masaüstü çizimleri silinir"""
+        for surface in self: surface.discard_desktop()
+        self.saved = dict(layers)
+
+    def update_all(self):
+        for surface in self: surface.update()
+
+    def set_cursor(self, cursor):
+        for surface in self: surface.setCursor(cursor)
+
+    def set_transparent_for_input(self, transparent):
+        for surface in self:
+            surface.setWindowFlag(Qt.WindowTransparentForInput, transparent)
+            surface.showFullScreen()
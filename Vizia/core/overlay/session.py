@@ -0,0 +1,403 @@
+"""
+Oturum (session) kaydı
+Masaüstü ve beyaz tahta katmanlarını hızlı bir ikili dosyaya yazar ve geri yükler.
+
+Dosya: MAGIC + sürüm, ardından parçalar (chunk): 4 baytlık etiket + uzunluk (u64) + veri
+  LAYR  katman başlığı (JSON): ad, sayfa, boyut, komut sırası, şekiller ve widget durumları.
+        Diğer monitörlerin katmanları 'screen_desktop' / 'screen_board' adıyla ve ekran adıyla ('screen')
+        yazılır; bu adları tanımayan eski sürümler onları atlar.
+  STRK  StrokeStore dizileri, ham ve little-endian; tek okumada belleğe alınır
+  BLOB  gömülü görseller (damgalar, resimler), LAYR'daki indeks sırasıyla
+Arayüz sadece anlık görüntüyü (snapshot) alır; görsel kodlama ve diske yazma SessionWriter thread'indedir.
+"""
+
+import os
+import sys
+import json
+import time
+import struct
+from array import array
+
+from PyQt5.QtGui import QColor, QImage, QPixmap
+from PyQt5.QtCore import QObject, QThread, QTimer, QBuffer, QByteArray, QIODevice, QPoint, pyqtSignal
+from PyQt5.QtWidgets import QApplication
+
+from .history import StrokeCommand, ShapeCommand, StampCommand, WidgetCommand
+
+from ui.widgets.image_item import ViziaImageItem
+from ui.text_widgets import ViziaTextItem
+
+MAGIC = b'VIZIASES'
+VERSION = 1
+SESSION_FILTER = "Vizia Oturumu (*.vizia)"
+
+
+# --- DOSYA FORMATI ---
+def _chunk_header(tag, length):
+    return struct.pack('<4sQ', tag, length)
+
+
+def _write_arrays(f, arrays, fields):
+    """Dizileri tek STRK parçası olarak, kopyalamadan (tofile) yazar"""
+    f.write(_chunk_header(b'STRK', sum(10 + arrays[n].itemsize * len(arrays[n]) for n in fields)))
+    for name in fields:
+        a = arrays[name]
+        if sys.byteorder != 'little' and a.itemsize > 1:
+            a = array(a.typecode, a); a.byteswap()
+        f.write(struct.pack('<cBQ', a.typecode.encode('ascii'), a.itemsize, len(a)))
+        a.tofile(f)
+
+
+def _read_arrays(payload, fields):
+    arrays, pos = {}, 0
+    for name in fields:
+        if pos >= len(payload): break  # Eski sürümlerde olmayan (sondaki) diziler
+        typecode, itemsize, count = struct.unpack_from('<cBQ', payload, pos)
+        pos += 10
+        a = array(typecode.decode('ascii'))
+        if a.itemsize != itemsize: raise ValueError("Desteklenmeyen dizi biçimi")
+        a.frombytes(payload[pos:pos + itemsize * count])
+        pos += itemsize * count
+        if sys.byteorder != 'little' and itemsize > 1: a.byteswap()
+        arrays[name] = a
+    return arrays
+
+
+def encode_image(image, fmt="PNG"):
+    """QImage -> bayt (thread içinde de güvenle çağrılabilir)"""
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.WriteOnly)
+    image.save(buf, fmt)
+    buf.close()
+    return bytes(data)
+
+
+def read_session(path, fields):
+    """Dosyayı katman listesine çözer: [{'header': dict, 'strokes': diziler, 'blobs': [bytes]}]"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < len(MAGIC) + 4 or data[:len(MAGIC)] != MAGIC: raise ValueError("Vizia oturum dosyası değil")
+    pos = len(MAGIC)
+    version, = struct.unpack_from('<I', data, pos)
+    if version > VERSION: raise ValueError(f"Daha yeni bir oturum sürümü ({version})")
+    pos += 4
+    view, layers = memoryview(data), []
+    while pos + 12 <= len(data):
+        tag, length = struct.unpack_from('<4sQ', data, pos)
+        pos += 12
+        # Yarıda kesilmiş dosya eksik katmanla sessizce açılmasın
+        if pos + length > len(data): raise ValueError("Oturum dosyası eksik (kesilmiş)")
+        payload = view[pos:pos + length]
+        pos += length
+        if tag == b'LAYR': layers.append({'header': json.loads(bytes(payload)), 'strokes': None, 'blobs': []})
+        elif not layers: continue
+        elif tag == b'STRK': layers[-1]['strokes'] = _read_arrays(payload, fields)
+        elif tag == b'BLOB': layers[-1]['blobs'].append(bytes(payload))
+        # Bilinmeyen parçalar (yeni sürümler) atlanır
+    if pos != len(data): raise ValueError("Oturum dosyası eksik (kesilmiş)")
+    return layers
+
+
+class SessionWriter(QThread):
+    """
+    Anlık görüntüyü diske parça parça yazar. Önce geçici dosyaya yazılır ve sonra yerine taşınır;
+    yarıda kalan bir kayıt eski oturumu bozmaz.
+    """
+    saved = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, snapshot, fields):
+        super().__init__()
+        self.path = path
+        self.snapshot = snapshot
+        self.fields = fields
+
+    def run(self):
+        tmp = self.path + ".tmp"
+        try:
+            folder = os.path.dirname(self.path)
+            if folder: os.makedirs(folder, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(MAGIC + struct.pack('<I', VERSION))
+                for layer in self.snapshot:
+                    header = json.dumps(layer['header']).encode('utf-8')
+                    f.write(_chunk_header(b'LAYR', len(header)) + header)
+                    _write_arrays(f, layer['strokes'], self.fields)
+                    for blob in layer['blobs']:
+                        if isinstance(blob, tuple):
+                            # (QImage, sahibi): bir kez kodlanır, sonraki kayıtlarda sahibinden okunur
+                            image, owner = blob
+                            blob = encode_image(image)
+                            if owner is not None: owner.encoded = blob
+                        f.write(_chunk_header(b'BLOB', len(blob)))
+                        f.write(blob)
+            os.replace(tmp, self.path)
+            self.saved.emit(self.path)
+        except Exception as e:
+            try: os.remove(tmp)
+            except OSError: pass
+            self.failed.emit(str(e))
+
+
+# --- YERLEŞİK WIDGET KODLAYICILARI ---
+def _geometry(w):
+    return {"x": w.x(), "y": w.y(), "w": w.width(), "h": w.height()}
+
+
+def save_text_item(w):
+    state = _geometry(w)
+    state.update(html=w.toHtml(), font=w.current_font.toString(), color=w.text_color.name(QColor.HexArgb))
+    return state, None
+
+
+def load_text_item(overlay, layer, state, data):
+    txt = ViziaTextItem(overlay, layer is not overlay.desktop_layer, QColor(state["color"]))
+    txt.current_font.fromString(state["font"])
+    txt.setFont(txt.current_font)
+    txt.setHtml(state["html"])
+    txt.setGeometry(state["x"], state["y"], state["w"], state["h"])
+    txt.setReadOnly(True)
+    txt.update_style(editing=False)
+    overlay.connect_text_item(txt)
+    return txt
+
+
+def save_image_item(w):
+    data = w.image_data
+    if data is None and w.image_path and os.path.exists(w.image_path):
+        # Orijinal dosya baytları gömülür (JPEG tekrar kodlanmaz, dosya silinse de oturum açılır)
+        with open(w.image_path, 'rb') as f: data = f.read()
+        w.image_data = data
+    if data is None: data = (w.original_pixmap.toImage(), None)
+    state = _geometry(w)
+    state["path"] = w.image_path
+    return state, data
+
+
+def load_image_item(overlay, layer, state, data):
+    pixmap = QPixmap()
+    if data: pixmap.loadFromData(data)
+    img = ViziaImageItem(state.get("path", ""), layer is not overlay.desktop_layer, overlay, pixmap)
+    img.image_data = data
+    img.setGeometry(state["x"], state["y"], state["w"], state["h"])
+    overlay.connect_image_item(img)
+    return img
+
+
+class SessionManager(QObject):
+    """
+    Overlay'in oturum kaydı / yüklemesi ve arka plan otomatik kaydı.
+    Eklentiler kendi widget türlerini register_widget_codec ile ekler; yüklenirken kodlayıcısı
+    henüz olmayan widget'lar bekletilir, kodlayıcı kaydolunca yerine konur ve kayıtta korunur.
+    """
+    def __init__(self, overlay):
+        super().__init__(overlay)
+        self.overlay = overlay
+        self.codecs = {'text': (save_text_item, load_text_item), 'image': (save_image_item, load_image_item)}
+        self.pending = []  # (katman, widget türü, durum, blob)
+        self._writer = None
+        self._last_signature = None
+
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.timeout.connect(self.autosave)
+        self.apply_settings()
+        QApplication.instance().aboutToQuit.connect(self._save_on_quit)
+
+    @property
+    def fields(self):
+        return self.overlay.desktop_layer.strokes.ARRAY_FIELDS
+
+    def register_widget_codec(self, widget_type, save, load):
+        """save(widget) -> (durum dict, bytes|None); load(overlay, layer, durum, bytes) -> widget"""
+        self.codecs[widget_type] = (save, load)
+        waiting = [p for p in self.pending if p[1] == widget_type]
+        self.pending = [p for p in self.pending if p[1] != widget_type]
+        for layer, _, state, data in waiting:
+            self._restore_widgets(layer, [WidgetCommand(w, widget_type)
+                                          for w in [self._load_widget(layer, widget_type, state, data)] if w])
+
+    # --- AYARLAR / OTOMATİK KAYIT ---
+    def apply_settings(self):
+        settings = self.overlay.settings
+        if settings.get("session_autosave"):
+            self.autosave_timer.start(max(5, int(settings.get("session_autosave_interval"))) * 1000)
+        else:
+            self.autosave_timer.stop()
+
+    def restore_last(self):
+        """Otomatik kayıt açıksa son oturumu açılışta geri yükler"""
+        path = self.overlay.settings.get("session_path")
+        if self.overlay.settings.get("session_autosave") and path and os.path.exists(path):
+            try: self.load(path)
+            except Exception as e: print(f"Oturum yüklenemedi: {e}")
+
+    def _signature(self):
+        """Son kayıttan beri değişiklik oldu mu? (history / redo uzunlukları, son seq, widget geometrileri)"""
+        pages, surfaces = self.overlay.pages, self.overlay.surfaces
+        sig = [(pages.index, pages.count(), len(surfaces.saved))]
+        for layer in [self.overlay.desktop_layer] + surfaces.layers(board=False) + pages.loaded_layers():
+            sig.append((len(layer.history), layer.history[-1].seq if layer.history else 0, len(layer.redo_stack)))
+            for w in layer.widgets:
+                try: sig.append(w.geometry().getRect())
+                except RuntimeError: pass
+        return tuple(sig)
+
+    def autosave(self):
+        if self.is_saving() or self._signature() == self._last_signature: return
+        self.save(self.overlay.settings.get("session_path"))
+
+    def _save_on_quit(self):
+        if not self.overlay.settings.get("session_autosave"): return
+        if self._writer is not None: self._writer.wait()
+        if self._signature() == self._last_signature: return
+        SessionWriter(self.overlay.settings.get("session_path"), self.snapshot(), self.fields).run()
+
+    # --- KAYIT ---
+    def is_saving(self):
+        return self._writer is not None and self._writer.isRunning()
+
+    def snapshot(self):
+        """Katmanların yazılabilir kopyası; sadece UI thread'inde ve hızlıca alınır"""
+        self._last_signature = self._signature()
+        layers = [self.snapshot_layer(self.overlay.desktop_layer, 'desktop')]
+        layers += self.snapshot_screens(self.overlay.surfaces.desktop_layers(), 'screen_desktop')
+        pages = self.overlay.pages
+        for i, page in enumerate(pages.pages):
+            # Diske alınmış sayfalar dosyadan olduğu gibi (çözülmüş diziler + blob'lar) aktarılır
+            if page.layer is not None:
+                page_layers = [self.snapshot_layer(page.layer, 'board')] + self.snapshot_screens(page.screens, 'screen_board')
+            else:
+                page_layers = pages.read_spilled(page)
+            for data in page_layers: data['header'].update(page=i, active=(i == pages.index))
+            layers += page_layers
+        return layers
+
+    def snapshot_screens(self, screens, name):
+        """Diğer ekranların katmanları (ekran adı -> CanvasLayer ya da yüklenmemiş veri)"""
+        layers = []
+        for key, layer in screens.items():
+            data = layer if isinstance(layer, dict) else self.snapshot_layer(layer, name)
+            data['header'].update(name=name, screen=key)
+            layers.append(data)
+        return layers
+
+    def snapshot_layer(self, layer, name):
+        layer.cleanup_dead_widgets()
+        commands, blobs, sids = [], [], []
+
+        def blob(data):
+            blobs.append(data)
+            return len(blobs) - 1
+
+        for cmd in layer.history:
+            if cmd.type == 'path':
+                sids.append(cmd.sid)
+                if commands and commands[-1][0] == 'path': commands[-1][1] += 1
+                else: commands.append(['path', 1])
+            elif cmd.type == 'legacy_shape':
+                commands.append(['shape', cmd.shape, cmd.start.x(), cmd.start.y(), cmd.end.x(), cmd.end.y(),
+                                 QColor(cmd.color).rgba(), cmd.width])
+            elif cmd.type == 'stamp':
+                data = cmd.encoded if cmd.encoded is not None else (cmd.pixmap.toImage(), cmd)
+                commands.append(['stamp', cmd.pos.x(), cmd.pos.y(), blob(data)])
+            elif cmd.obj is not None and cmd.type in self.codecs:
+                try: state, data = self.codecs[cmd.type][0](cmd.obj)
+                except Exception as e:
+                    print(f"Oturum: '{cmd.type}' kaydedilemedi: {e}")
+                    continue
+                commands.append(['widget', cmd.type, state, blob(data) if data is not None else None])
+        for owner, widget_type, state, data in self.pending:
+            if owner is layer:
+                commands.append(['widget', widget_type, state, blob(data) if data is not None else None])
+
+        size = layer.size
+        header = {"name": name, "width": size.width(), "height": size.height(), "commands": commands,
+                  "view": [layer.pan.x(), layer.pan.y(), layer.zoom_level]}
+        return {'header': header, 'strokes': layer.strokes.export(sids), 'blobs': blobs}
+
+    def save(self, path, on_done=None):
+        """Arka planda kaydeder; on_done(başarılı, mesaj) UI thread'inde çağrılır"""
+        if not path: return False
+        if self._writer is not None: self._writer.wait()
+        self._writer = SessionWriter(path, self.snapshot(), self.fields)
+        if on_done:
+            self._writer.saved.connect(lambda p: on_done(True, p))
+            self._writer.failed.connect(lambda e: on_done(False, e))
+        self._writer.failed.connect(lambda e: print(f"Oturum kaydedilemedi: {e}"))
+        self._writer.start()
+        return True
+
+    # --- YÜKLEME ---
+    def load(self, path):
+        """Oturumu yükler, geçen süreyi (ms) döndürür. Mevcut katman içerikleri silinir."""
+        start = time.perf_counter()
+        layers = read_session(path, self.fields)
+        self.pending = []
+        boards, screen_desktops, screen_boards = [], {}, {}
+        for data in layers:
+            header = data['header']
+            name = header.get('name')
+            if name == 'desktop': self.load_layer(self.overlay.desktop_layer, data)
+            elif name == 'board': boards.append(data)
+            elif name == 'screen_desktop': screen_desktops[header.get('screen')] = data
+            elif name == 'screen_board': screen_boards.setdefault(header.get('page', 0), {})[header.get('screen')] = data
+        # Diğer ekranların katmanları ekran gösterildiğinde yüklenir; bağlı olmayan ekranınki saklanır
+        self.overlay.surfaces.restore(screen_desktops)
+        if boards:
+            active = next((i for i, d in enumerate(boards) if d['header'].get('active')), 0)
+            self.overlay.pages.reset(len(boards), lambda i, layer: self.load_layer(layer, boards[i]), active, screen_boards)
+        self._last_signature = self._signature()
+        self.overlay.update()
+        self.overlay.surfaces.update_all()
+        return (time.perf_counter() - start) * 1000
+
+    def load_layer(self, layer, data):
+        """Tek katman verisini (read_session çıktısı) layer'a yükler; mevcut içerik silinir"""
+        self.forget_pending(layer)
+        layer.clear()
+        blobs = data['blobs']
+        strokes = iter(layer.strokes.extend(data['strokes'])) if data['strokes'] else iter(())
+        commands = []
+        for entry in data['header'].get('commands', []):
+            kind = entry[0]
+            if kind == 'path':
+                commands.extend(StrokeCommand(layer.strokes, next(strokes)) for _ in range(entry[1]))
+            elif kind == 'shape':
+                _, shape, x1, y1, x2, y2, rgba, width = entry
+                commands.append(ShapeCommand(shape, QPoint(x1, y1), QPoint(x2, y2), QColor.fromRgba(rgba), width))
+            elif kind == 'stamp':
+                _, x, y, index = entry
+                cmd = StampCommand(QPoint(x, y), QPixmap.fromImage(QImage.fromData(blobs[index])))
+                cmd.encoded = blobs[index]
+                commands.append(cmd)
+            elif kind == 'widget':
+                _, widget_type, state, index = entry
+                widget = self._load_widget(layer, widget_type, state, blobs[index] if index is not None else None)
+                if widget is not None: commands.append(WidgetCommand(widget, widget_type))
+        self._restore_widgets(layer, commands)
+        view = data['header'].get('view')
+        if view: layer.set_view(QPoint(view[0], view[1]), view[2])
+
+    def forget_pending(self, layer):
+        """Katman diske alınırken / yeniden yüklenirken bekleyen widget'ları bırakır (dosyada kalırlar)"""
+        self.pending = [p for p in self.pending if p[0] is not layer]
+
+    def _load_widget(self, layer, widget_type, state, data):
+        codec = self.codecs.get(widget_type)
+        if codec is None:
+            self.pending.append((layer, widget_type, state, data))
+            return None
+        try:
+            return codec[1](self.overlay, layer, state, data)
+        except Exception as e:
+            print(f"Oturum: '{widget_type}' yüklenemedi: {e}")
+            return None
+
+    def _restore_widgets(self, layer, commands):
+        layer.restore(commands)
+        visible = layer is self.overlay.active_layer
+        for cmd in commands:
+            if cmd.obj is None: continue
+            try: cmd.obj.setVisible(visible)
+            except RuntimeError: pass
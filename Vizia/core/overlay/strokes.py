@@ -0,0 +1,276 @@
+"""
+Çizgi (stroke) noktaları üzerinde çalışan yardımcılar.
+Noktalar (x, y) float ikilileri olarak tutulur; QPainterPath sadece çizim için üretilir.
+"""
+
+import math
+import bisect
+
+from PyQt5.QtGui import QPainterPath
+from PyQt5.QtCore import QPointF
+
+# Tahmin, son hızla gidilecek mesafeyi ivme yüzünden en fazla bu oranda aşabilir
+PREDICTION_MAX_RATIO = 1.5
+# Kalem bu süreden (ms) uzun duraksadıysa tahmin yapılmaz
+PREDICTION_MAX_GAP = 50
+
+
+def build_stroke_path(points):
+    """Overlay'in canlı çizimde kullandığı şemayla (ara noktalara quadTo) path üretir"""
+    path = QPainterPath()
+    if not points: return path
+    last = QPointF(*points[0])
+    path.moveTo(last)
+    for x, y in points[1:]:
+        p = QPointF(x, y)
+        path.quadTo(last, (last + p) / 2)
+        last = p
+    return path
+
+
+def build_polyline_path(points):
+    """Düz segmentler; basınçlı (tablet) çizgiler canlı çizimdeki gibi segment segment çizilir"""
+    path = QPainterPath()
+    if not points: return path
+    path.moveTo(QPointF(*points[0]))
+    for x, y in points[1:]:
+        path.lineTo(x, y)
+    return path
+
+
+def build_fitted_path(points):
+    """
+    Sadeleştirilmiş noktalardan geçen yumuşak eğri (Catmull-Rom -> kübik Bezier).
+    Kontrol kolları segment uzunluğuyla ölçeklenir; seyrek noktalarda taşma / ilmek oluşmaz.
+    """
+    path = QPainterPath()
+    if not points: return path
+    path.moveTo(QPointF(*points[0]))
+    n = len(points)
+    for i in range(n - 1):
+        p0 = points[i - 1] if i > 0 else points[i]
+        p2 = points[i + 1]
+        p3 = points[i + 2] if i + 2 < n else p2
+        c1, c2 = _fitted_controls(p0, points[i], p2, p3)
+        path.cubicTo(QPointF(*c1), QPointF(*c2), QPointF(*p2))
+    return path
+
+
+def _fitted_controls(p0, p1, p2, p3):
+    """p1-p2 segmentinin kübik Bezier kontrol noktaları (build_fitted_path ile fit_mask aynı eğriyi kullanır)"""
+    d01 = ((p1[0] - p0[0]) ** 2 + (p1[1] - p0[1]) ** 2) ** 0.5
+    d12 = ((p2[0] - p1[0]) ** 2 + (p2[1] - p1[1]) ** 2) ** 0.5
+    d23 = ((p3[0] - p2[0]) ** 2 + (p3[1] - p2[1]) ** 2) ** 0.5
+    k1 = d12 / (d01 + d12) / 3 if d01 + d12 > 0 else 0
+    k2 = d12 / (d12 + d23) / 3 if d12 + d23 > 0 else 0
+    return ((p1[0] + (p2[0] - p0[0]) * k1, p1[1] + (p2[1] - p0[1]) * k1),
+            (p2[0] - (p3[0] - p1[0]) * k2, p2[1] - (p3[1] - p1[1]) * k2))
+
+
+def simplify_points(points, tolerance):
+    """
+    Ramer-Douglas-Peucker (özyinelemesiz). Orijinal çizgiden tolerance pikselden
+    fazla sapmayan en az noktayı bırakır; ilk ve son nokta her zaman korunur.
+    """
+    return [p for p, k in zip(points, simplify_mask(points, tolerance)) if k]
+
+
+def simplify_mask(points, tolerance):
+    """simplify_points ile aynı; hangi noktaların kaldığını (bool listesi) döndürür (ör. basınç değerleri için)"""
+    n = len(points)
+    if n < 3 or tolerance <= 0: return [True] * n
+    tol_sq = tolerance * tolerance
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2: continue
+        ax, ay = points[first]
+        bx, by = points[last]
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+        max_d, index = -1.0, first
+        for i in range(first + 1, last):
+            px, py = points[i]
+            if length_sq == 0:
+                d = (px - ax) ** 2 + (py - ay) ** 2
+            else:
+                # Doğruya dik uzaklığın karesi (segment içi olduğundan yeterli ve hızlı)
+                cross = dx * (py - ay) - dy * (px - ax)
+                d = cross * cross / length_sq
+            if d > max_d: max_d, index = d, i
+        if max_d > tol_sq:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return keep
+
+
+def fit_mask(points, tolerance):
+    """
+    build_fitted_path için nokta seçimi: önce RDP (simplify_mask), sonra eğrinin kendisi kontrol edilir.
+    Catmull-Rom eğrisi tutulan noktalar arasında bombe yapabildiği için, ham çizgiden tolerance'tan
+    fazla uzaklaşan her segmente en uzak yere yakın ham nokta geri eklenir; böylece eğrinin hatası da sınırlı kalır.
+    """
+    keep = simplify_mask(points, tolerance)
+    if tolerance <= 0 or len(points) < 3: return keep
+    tol_sq = tolerance * tolerance
+    kept = [i for i, k in enumerate(keep) if k]
+    pending = set(kept[:-1])  # kontrol edilecek segmentler (başlangıç indeksiyle)
+    while pending:
+        a = min(pending)
+        pending.discard(a)
+        s = bisect.bisect_left(kept, a)
+        b = kept[s + 1]
+        if b - a < 2: continue
+        p0 = points[kept[s - 1]] if s > 0 else points[a]
+        p3 = points[kept[s + 2]] if s + 2 < len(kept) else points[b]
+        index = _curve_error_index(points, a, b, _fitted_controls(p0, points[a], points[b], p3), tol_sq)
+        if index is None: continue
+        keep[index] = True
+        kept.insert(s + 1, index)
+        # Yeni nokta komşu segmentlerin teğetini de değiştirir
+        pending.update(kept[max(0, s - 1):s + 3])
+        pending.discard(kept[-1])
+    return keep
+
+
+def _curve_error_index(points, a, b, controls, tol_sq):
+    """a-b arasındaki eğri ham çizgiden tol'dan fazla uzaklaşıyorsa geri eklenecek ham noktanın indeksi, yoksa None"""
+    (ax, ay), (bx, by) = points[a], points[b]
+    (c1x, c1y), (c2x, c2y) = controls
+    segments = [(points[i][0], points[i][1], points[i + 1][0] - points[i][0], points[i + 1][1] - points[i][1])
+                for i in range(a, b)]
+    samples = max(4, b - a)
+    worst, worst_point = tol_sq, None
+    for k in range(1, samples):
+        t = k / samples
+        u = 1 - t
+        w0, w1, w2, w3 = u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t
+        x = w0 * ax + w1 * c1x + w2 * c2x + w3 * bx
+        y = w0 * ay + w1 * c1y + w2 * c2y + w3 * by
+        nearest = math.inf
+        for sx, sy, dx, dy in segments:
+            length_sq = dx * dx + dy * dy
+            f = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((x - sx) * dx + (y - sy) * dy) / length_sq))
+            ex, ey = sx + f * dx - x, sy + f * dy - y
+            d = ex * ex + ey * ey
+            if d < nearest:
+                nearest = d
+                if d <= tol_sq: break
+        if nearest > worst: worst, worst_point = nearest, (x, y)
+    if worst_point is None: return None
+    x, y = worst_point
+    return min(range(a + 1, b), key=lambda i: (points[i][0] - x) ** 2 + (points[i][1] - y) ** 2)
+
+
+def _dist_sq_to_segment(px, py, ax, ay, bx, by):
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return (px - ax) ** 2 + (py - ay) ** 2
+    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+    cx, cy = ax + t * dx, ay + t * dy
+    return (px - cx) ** 2 + (py - cy) ** 2
+
+
+def erase_from_stroke(points, a, b, radius):
+    """
+    Silgi segmenti (a-b, yarıçap radius) ile çizginin noktalarını keser.
+    Dokunmuyorsa None, dokunuyorsa geriye kalan parçaların (en az 2 noktalı) listesini döndürür.
+    Silgiye yakın uzun segmentler önce sıklaştırılır ki aradan geçen silgi de kessin.
+    """
+    ax, ay = a
+    bx, by = b
+    r_sq = radius * radius
+    step = max(1.0, radius / 2)
+    box_l, box_r = min(ax, bx) - radius, max(ax, bx) + radius
+    box_t, box_b = min(ay, by) - radius, max(ay, by) + radius
+
+    runs, current, touched = [], [], False
+
+    def visit(x, y):
+        nonlocal current, touched
+        if _dist_sq_to_segment(x, y, ax, ay, bx, by) <= r_sq:
+            touched = True
+            if len(current) >= 2: runs.append(current)
+            current = []
+        else:
+            current.append((x, y))
+
+    prev = None
+    for x, y in points:
+        if prev is not None:
+            px, py = prev
+            near = not (max(px, x) < box_l or min(px, x) > box_r or max(py, y) < box_t or min(py, y) > box_b)
+            if near:
+                length = ((x - px) ** 2 + (y - py) ** 2) ** 0.5
+                n = int(length // step)
+                for i in range(1, n):
+                    t = i / n
+                    visit(px + (x - px) * t, py + (y - py) * t)
+        visit(x, y)
+        prev = (x, y)
+
+    if not touched: return None
+    if len(current) >= 2: runs.append(current)
+    return runs
+
+
+class OneEuroFilter:
+    """
+    1€ filtresi (Casiez ve ark.): yavaş harekette titremeyi süzer, hızlandıkça kesim frekansını
+    yükselterek gecikmeyi azaltır. min_cutoff (Hz) küçüldükçe daha çok yumuşatır; beta hızın etkisidir.
+    """
+    def __init__(self, min_cutoff=1.0, beta=0.007, d_cutoff=1.0):
+        self.min_cutoff = float(min_cutoff)
+        self.beta = float(beta)
+        self.d_cutoff = float(d_cutoff)
+        self._last = None  # (t_ms, x, y, dx, dy)
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, x, y, t_ms):
+        if self._last is None:
+            self._last = (t_ms, x, y, 0.0, 0.0)
+            return x, y
+        t0, px, py, pdx, pdy = self._last
+        dt = max(0.001, (t_ms - t0) / 1000.0)  # Aynı zaman damgalı (birleştirilmiş) olaylar
+        a_d = self._alpha(self.d_cutoff, dt)
+        dx = a_d * (x - px) / dt + (1 - a_d) * pdx
+        dy = a_d * (y - py) / dt + (1 - a_d) * pdy
+        a = self._alpha(self.min_cutoff + self.beta * math.hypot(dx, dy), dt)
+        fx, fy = a * x + (1 - a) * px, a * y + (1 - a) * py
+        self._last = (t_ms, fx, fy, dx, dy)
+        return fx, fy
+
+
+def predict_point(samples, horizon):
+    """
+    samples: son (t_ms, x, y) örnekleri. Hız ve ivmeden horizon ms sonraki konumu tahmin eder;
+    ani dönüşlerde taşmasın diye mesafe sınırlanır. Tahmin edilemiyorsa None.
+    """
+    if len(samples) < 2 or horizon <= 0: return None
+    t1, x1, y1 = samples[-2]
+    t2, x2, y2 = samples[-1]
+    dt = t2 - t1
+    if dt <= 0 or dt > PREDICTION_MAX_GAP: return None
+    vx, vy = (x2 - x1) / dt, (y2 - y1) / dt
+    ax = ay = 0.0
+    if len(samples) >= 3:
+        t0, x0, y0 = samples[-3]
+        dt0 = t1 - t0
+        if 0 < dt0 <= PREDICTION_MAX_GAP:
+            span = (dt + dt0) / 2
+            ax, ay = (vx - (x1 - x0) / dt0) / span, (vy - (y1 - y0) / dt0) / span
+    h = horizon
+    dx, dy = vx * h + 0.5 * ax * h * h, vy * h + 0.5 * ay * h * h
+    limit = math.hypot(vx, vy) * h * PREDICTION_MAX_RATIO
+    dist = math.hypot(dx, dy)
+    if dist < 0.5: return None
+    if dist > limit: dx, dy = dx * limit / dist, dy * limit / dist
+    return x2 + dx, y2 + dy
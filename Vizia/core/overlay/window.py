@@ -3,24 +3,47 @@ try:
 except ImportError:
     import PyQt5.sip as sip
 
-from PyQt5.QtWidgets import QMainWindow, QApplication, QFileDialog
-from PyQt5.QtGui import QPainter, QPen, QColor, QKeySequence, QCursor, QPainterPath, QRegion
-from PyQt5.QtCore import Qt, QPoint, QTimer, QRect, QMimeData, QEvent
+import time
+
+from PyQt5.QtWidgets import QMainWindow, QApplication, QFileDialog, QWidget
+from PyQt5.QtGui import QPainter, QPen, QColor, QImage, QCursor, QPainterPath, QRegion
+from PyQt5.QtCore import Qt, QPoint, QPointF, QTimer, QRect, QRectF, QMimeData, QEvent, QLineF
 
 from core.settings import SettingsManager
-from core.screenshot import ScreenshotManager
+from core.screenshot import ScreenshotManager, CAPTURE_EXCLUSION
 from core.plugin_window_manager import PluginWindowManager
+from core.spatial import GeometryTracker
 from .canvas import CanvasLayer
+from .session import SessionManager, SESSION_FILTER
+from .pages import BoardPages
+from .screens import ScreenSurfaces
+from .hotkeys import HotkeyTable
+from .strokes import OneEuroFilter, predict_point
 
 from ui.widgets.notification import ModernNotification
 from ui.widgets.image_item import ViziaImageItem
 from ui.text_widgets import ViziaTextItem 
 
+# Sınıf adı -> metin alanı mı (kısayollar yazı yazılan alanlarda tetiklenmez)
+_TYPING_CLASSES = {}
+
+# Silgi butonuna tekrar tıklanınca bu modlar arasında geçilir
+ERASER_MODES = {"vector": "Vektör Silgi", "stroke": "Nesne Silgisi", "pixel": "Piksel Silgi"}
+
+# Overlay gizlendikten sonra ekran görüntüsü için beklenen kare sayısı (compositor gizlemeyi ekrana yansıtsın)
+HIDE_SETTLE_FRAMES = 2
+
 class DrawingOverlay(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.settings = SettingsManager()
+        self.settings = SettingsManager(self)
+        # Kısayollar (key, modifiers) -> eylem tablosunda; ayarlar değişince yeniden kurulur
+        self.hotkeys = HotkeyTable(self.settings)
+        self._register_builtin_hotkeys()
         self.plugin_windows = PluginWindowManager(self)
+        # Toolbar / çekmece geometrisi olaylarla güncellenen bir index'te tutulur (hover için)
+        self.ui_tracker = GeometryTracker(self)
+        self._toolbar = None
         
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
         self.setAttribute(Qt.WA_TranslucentBackground)
@@ -34,18 +57,41 @@ class DrawingOverlay(QMainWindow):
         QApplication.instance().installEventFilter(self)
         
         screen_size = QApplication.primaryScreen().size()
-        self.desktop_layer = CanvasLayer(screen_size)
-        self.board_layer = CanvasLayer(screen_size)
+        self.desktop_layer = CanvasLayer(screen_size, **self.layer_options())
+        self.board_layer = CanvasLayer(screen_size, **self.board_layer_options())
+        # Beyaz tahta sayfaları; board_layer her zaman aktif sayfanın katmanıdır
+        self.pages = BoardPages(self, self.board_layer, self.settings.get("board_keep_neighbors"), self.settings.get("board_pages_in_memory"))
+        self.pages.page_changed.connect(lambda i, n: self.show_toast(f"Sayfa {i + 1} / {n}"))
         
         self._whiteboard_mode = False
         self.active_layer = self.desktop_layer 
         self.drawing_mode = "pen"
         self.current_color = QColor(255, 45, 85)
         self.brush_size = 4
+        self.eraser_mode = self.settings.get("eraser_mode") if self.settings.get("eraser_mode") in ERASER_MODES else "vector"
         
         self.drawing = False
+        self.panning = False
+        self._pan_anchor = QPoint()
+        self._pan_surface = self
         self.last_point = QPoint()
         self.current_stroke_path = QPainterPath()
+        self.current_stroke_points = []
+        self.current_stroke_pressures = []
+        self._pressure = None  # Tablet kalemi temas halindeyse 0-1 basınç, farede None
+        self._stroke_pressure = False
+
+        # Yüksek frekanslı girdi (tablet / fare) biriktirilir ve her ekran karesinde bir kez çizilir
+        self._pending_segments = []
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setTimerType(Qt.PreciseTimer)
+        self.frame_timer.timeout.connect(self.flush_input)
+
+        # Düşük gecikme: isteğe bağlı 1€ filtresi ve imlecin önüne çizilen tahmini segment
+        self._smoother = None
+        self._recent = []           # son (t_ms, x, y) örnekleri (tahmin için)
+        self._prediction = None     # (son nokta, tahmini nokta), dünya koordinatı; karolara çizilmez
+        self._prediction_dirty = None
         
         self.is_selecting_region = False
         self.select_start = QPoint()
@@ -54,6 +100,45 @@ class DrawingOverlay(QMainWindow):
         self.toolbar = None 
         self.setFocusPolicy(Qt.StrongFocus)
 
+        # Diğer monitörler için yüzeyler; girdi en son hangi yüzeydeyse çizim / undo orada yapılır
+        self.input_surface = self
+        self._select_surface = self
+        self.surfaces = ScreenSurfaces(self, self.settings.get("multi_monitor"))
+
+        # Ekran görüntüleri arka planda kodlanıp yazılır
+        self.screenshots = ScreenshotManager(self)
+        self.screenshots.saved.connect(lambda path: self.show_toast("Kaydedildi!"))
+        self.screenshots.failed.connect(lambda path, error: self.show_toast("Hata!"))
+
+        # Oturum kaydı; otomatik kayıt açıksa son oturum açılışta geri gelir
+        self.session = SessionManager(self)
+        QTimer.singleShot(0, self.session.restore_last)
+
+    def layer_options(self, screen=None):
+        """vizia_settings.json'daki katman ayarları (CanvasLayer parametreleri); karolar ekranın DPR'ında tutulur"""
+        screen = screen or QApplication.primaryScreen()
+        return {
+            "checkpoint_interval": self.settings.get("checkpoint_interval"),
+            "checkpoint_memory_mb": self.settings.get("checkpoint_memory_mb"),
+            "simplify_tolerance": self.settings.get("stroke_simplify_tolerance"),
+            "dpr": screen.devicePixelRatio() if screen else 1.0,
+        }
+
+    def board_layer_options(self, screen=None):
+        """Beyaz tahta sayfaları ayrıca sonsuz tuval (pan / zoom) olabilir"""
+        return dict(self.layer_options(screen), infinite=bool(self.settings.get("board_infinite_canvas")))
+
+    @property
+    def toolbar(self):
+        return self._toolbar
+
+    @toolbar.setter
+    def toolbar(self, toolbar):
+        self._toolbar = toolbar
+        if toolbar is None: return
+        self.ui_tracker.track(toolbar)
+        self.ui_tracker.track(getattr(toolbar, 'drawer', None))
+
     @property
     def whiteboard_mode(self):
         return self._whiteboard_mode
@@ -76,11 +161,20 @@ class DrawingOverlay(QMainWindow):
             
         self.plugin_windows.on_mode_changed(value)
         self.update()
+        self.surfaces.update_all()
         QTimer.singleShot(50, self.bring_ui_to_front)
 
+    @property
+    def input_layer(self):
+        """Girdinin geldiği ekranın aktif katmanı (birincil ekranda active_layer)"""
+        return self.input_surface.active_layer
+
     def redraw_canvas(self):
+        """Tüm karoları history'den baştan çizer; sadece gerçek geçersizleşmede (zoom / DPI değişimi) çağrılır"""
         self.active_layer.redraw()
+        for layer in self.surfaces.layers(self._whiteboard_mode): layer.redraw()
         self.update()
+        self.surfaces.update_all()
 
     def bring_ui_to_front(self):
         if not self.toolbar: return
@@ -93,21 +187,187 @@ class DrawingOverlay(QMainWindow):
         self.plugin_windows.bring_all_to_front()
 
     def is_mouse_on_ui(self, pos):
-        if self.toolbar:
-            global_pos = self.mapToGlobal(pos)
-            
-            if self.toolbar.isVisible() and self.toolbar.geometry().contains(global_pos): 
-                return True
-            
-            drawer = getattr(self.toolbar, 'drawer', None)
-            if drawer and drawer.isVisible() and drawer.geometry().contains(global_pos): 
-                return True
-            
-            if self.plugin_windows.is_mouse_on_any(global_pos):
-                return True
-        
+        return self.is_global_on_ui(self.mapToGlobal(pos))
+
+    def is_global_on_ui(self, global_pos):
+        # Geometriler önbellekte; burada pencere başına Qt çağrısı yapılmaz
+        if self._toolbar:
+            return self.ui_tracker.hit(global_pos) or self.plugin_windows.is_mouse_on_any(global_pos)
         return False
 
+    def cycle_eraser_mode(self):
+        modes = list(ERASER_MODES)
+        self.eraser_mode = modes[(modes.index(self.eraser_mode) + 1) % len(modes)]
+        self.settings.set("eraser_mode", self.eraser_mode)
+        self.show_toast(ERASER_MODES[self.eraser_mode])
+
+    def _is_history_eraser(self):
+        """Nesne ve vektör silgi piksel boyamaz, doğrudan history'i düzenler"""
+        return self.drawing_mode == "eraser" and self.eraser_mode in ("stroke", "vector")
+
+    def _erase_along(self, p1, p2):
+        """p1-p2 boyunca silgiye değen çizgileri siler (nesne: bütün çizgi, vektör: sadece değen kısım)"""
+        layer, surface = self.input_layer, self.input_surface
+        radius = max(4, self.brush_size * 3 // 2) / layer.zoom
+        if self.eraser_mode == "vector":
+            dirty = layer.erase_segment(p1, p2, radius)
+            if dirty: surface.update(layer.to_screen_rect(dirty))
+            return
+        steps = max(1, int(QLineF(p1, p2).length() // radius))
+        dirty = QRect()
+        for i in range(steps + 1):
+            c = p1 + (p2 - p1) * (i / steps)
+            rect = layer.erase_at(QRectF(c.x() - radius, c.y() - radius, radius * 2, radius * 2).toAlignedRect())
+            if rect: dirty = dirty.united(rect)
+        if not dirty.isNull(): surface.update(layer.to_screen_rect(dirty))
+
+    # --- SONSUZ TUVAL GÖRÜNÜMÜ ---
+    def _canvas_point(self, pos):
+        """Ekran noktası -> girdi katmanının (dünya) koordinatı"""
+        return self.input_layer.to_world(pos)
+
+    def _stroke_width(self):
+        """Fırça kalınlığı ekranda sabit kalır; yakınlaşınca dünyada incelir"""
+        zoom = self.input_layer.zoom
+        return self.brush_size if zoom == 1 else self.brush_size / zoom
+
+    def _pressure_factor(self):
+        """Tablet basıncı -> kalınlık çarpanı (pressure_min_ratio ile 1 arası); fare ve silgide 1"""
+        if self._pressure is None or self.drawing_mode != "pen": return 1.0
+        low = max(0.0, min(1.0, float(self.settings.get("pressure_min_ratio") or 0)))
+        return low + (1 - low) * max(0.0, min(1.0, self._pressure))
+
+    def _frame_interval(self, global_pos):
+        screen = QApplication.screenAt(global_pos) or QApplication.primaryScreen()
+        rate = screen.refreshRate() if screen else 0
+        return max(1, int(1000 / (rate if rate > 0 else 60)))
+
+    def flush_input(self):
+        """Biriken segmentleri girdi katmanına tek seferde çizer ve sadece kapsanan alanı (ve tahmini) günceller"""
+        dirty = QRect()
+        if self._pending_segments:
+            segments, self._pending_segments = self._pending_segments, []
+            layer = self.input_layer
+            drawn = layer.draw_segments(segments, self.current_color, self.drawing_mode, self._whiteboard_mode)
+            if not drawn.isNull(): dirty = layer.to_screen_rect(drawn).adjusted(-3, -3, 3, 3)
+        if self._prediction_dirty is not None:
+            dirty = dirty.united(self._prediction_dirty)
+            self._prediction_dirty = None
+        if not dirty.isNull(): self.input_surface.update(dirty)
+
+    @staticmethod
+    def _event_time(event):
+        return event.timestamp() or time.monotonic() * 1000
+
+    def _begin_low_latency(self, point, t):
+        s = self.settings
+        self._smoother = OneEuroFilter(s.get("smoothing_min_cutoff"), s.get("smoothing_beta")) if s.get("stroke_smoothing") else None
+        if self._smoother is not None: self._smoother.filter(point.x(), point.y(), t)
+        self._recent = [(t, point.x(), point.y())]
+        self._set_prediction(None)
+
+    def _set_prediction(self, prediction):
+        """Tahmini segmenti değiştirir; eski ve yeni alan bir sonraki karede güncellenir"""
+        for segment in (self._prediction, prediction):
+            if segment is None: continue
+            layer = self.input_layer
+            margin = self.brush_size + 2
+            rect = layer.to_screen_rect(QRectF(QPointF(segment[0]), QPointF(segment[1])).normalized().toAlignedRect())
+            rect = rect.adjusted(-margin, -margin, margin, margin)
+            self._prediction_dirty = rect if self._prediction_dirty is None else self._prediction_dirty.united(rect)
+        self._prediction = prediction
+
+    def _stroke_to(self, new_point, t=None):
+        """Kalem / piksel silgi çizgisine nokta ekler; segment bir sonraki karede çizilir"""
+        control_point = QPointF(self.last_point)
+        end_point = (control_point + QPointF(new_point)) / 2
+        self.current_stroke_path.quadTo(control_point, end_point)
+        self.current_stroke_points.append((new_point.x(), new_point.y()))
+        factor = self._pressure_factor()
+        self.current_stroke_pressures.append(factor)
+        self._pending_segments.append((self.last_point, new_point, self._stroke_width() * factor))
+        self.last_point = new_point
+
+        if t is not None and self.drawing_mode == "pen" and self.settings.get("low_latency_prediction"):
+            # Gerçek nokta gelince önceki tahmin bununla değiştirilir
+            self._recent = (self._recent + [(t, new_point.x(), new_point.y())])[-3:]
+            predicted = predict_point(self._recent, float(self.settings.get("prediction_ms") or 0))
+            self._set_prediction((new_point, QPointF(*predicted)) if predicted else None)
+        # Birleştirme kapalıysa (zamanlayıcı çalışmıyor) hemen çizilir
+        if not self.frame_timer.isActive(): self.flush_input()
+
+    def tabletEvent(self, event): self.surface_tablet(self, event)
+
+    def surface_tablet(self, surface, event):
+        """Tablet kalemi: basınç kaydedilir ve olay fare olayı gibi işlenir (Qt ayrıca fare olayı üretmez)"""
+        if not self.settings.get("pen_pressure"): return event.ignore()
+        kind = event.type()
+        self._pressure = event.pressure()
+        if kind == QEvent.TabletPress: self.surface_press(surface, event)
+        elif kind == QEvent.TabletMove: self.surface_move(surface, event)
+        elif kind == QEvent.TabletRelease:
+            self.surface_release(surface, event)
+            self._pressure = None
+        event.accept()
+
+    def _can_navigate(self, surface=None):
+        return self._whiteboard_mode and self._board_layer_of(surface or self).infinite
+
+    def _board_layer_of(self, surface):
+        """Yüzeyin aktif tahta sayfasındaki katmanı (her ekranın kendi görünümü vardır)"""
+        return self.board_layer if surface is self else surface.layer(True)
+
+    def set_board_view(self, pan, zoom_level=None, surface=None):
+        """Beyaz tahta görünümünü değiştirir; tahtadaki widget'lar dünya konumlarına bağlı kalır"""
+        surface = surface or self
+        layer = self._board_layer_of(surface)
+        anchors = []
+        for w in layer.widgets:
+            try:
+                # Son konumlandırmadan beri taşınmadıysa kayıtlı dünya konumu kullanılır (yuvarlama birikmesin)
+                anchor = getattr(w, '_board_anchor', None)
+                world = anchor[0] if anchor and anchor[1] == w.pos() else layer.to_world(QPointF(w.pos()))
+                anchors.append((w, QPointF(world)))
+            except RuntimeError: pass
+        layer.set_view(pan, zoom_level)
+        for w, world in anchors:
+            pos = layer.to_screen(world)
+            pos = QPoint(round(pos.x()), round(pos.y()))
+            w.move(pos)
+            w._board_anchor = (world, pos)
+        surface.update()
+
+    def zoom_board(self, steps, anchor=None, surface=None):
+        surface = surface or self
+        layer = self._board_layer_of(surface)
+        anchor = anchor if anchor is not None else surface.rect().center()
+        level = layer.zoom_level + steps
+        self.set_board_view(layer.pan_for_zoom(anchor, level), level, surface)
+
+    def reset_board_view(self):
+        if not self._can_navigate(): return
+        self.set_board_view(QPoint(0, 0), 0)
+        for surface in self.surfaces:
+            if surface.layer(True, create=False) is not None: self.set_board_view(QPoint(0, 0), 0, surface)
+
+    def wheelEvent(self, event):
+        if not self.surface_wheel(self, event): super().wheelEvent(event)
+
+    def surface_wheel(self, surface, event):
+        """Sonsuz tahtada tekerlek ile kaydırma / yakınlaştırma; işlendiyse True"""
+        if not self._can_navigate(surface) or surface.is_mouse_on_ui(event.pos()): return False
+        delta = event.angleDelta()
+        if event.modifiers() & Qt.ControlModifier:
+            # Ctrl + tekerlek: imlecin altındaki nokta sabit kalarak yakınlaş / uzaklaş
+            steps = 1 if delta.y() > 0 else -1 if delta.y() < 0 else 0
+            if steps: self.zoom_board(steps, event.pos(), surface)
+        else:
+            dx, dy = delta.x(), delta.y()
+            if event.modifiers() & Qt.ShiftModifier: dx, dy = dy, dx
+            self.set_board_view(self._board_layer_of(surface).pan - QPoint(dx, dy), surface=surface)
+        event.accept()
+        return True
+
     def force_focus(self):
         pos = self.mapFromGlobal(QCursor.pos())
         if not self.is_mouse_on_ui(pos) and self.drawing_mode != "move":
@@ -136,185 +396,268 @@ class DrawingOverlay(QMainWindow):
     # [AKILLI KISAYOL] Eski keyPressEvent silinip yerine bu Global Kalkan eklendi
     def eventFilter(self, obj, event):
         if event.type() == QEvent.KeyPress:
-            is_typing = False
-            
-            # Kullanıcı Recorder, Geometri vb. yerlerde bir metin alanında mı kontrolü
-            if hasattr(obj, 'metaObject'):
-                c_name = obj.metaObject().className()
-                if "Edit" in c_name or "Text" in c_name or "Input" in c_name or "Box" in c_name:
-                    is_typing = True
-                    
-            # Eğer yazı yazıyorsa, klavye tuşlarını engelleme (Space tuşu boşluk bıraksın)
-            if is_typing:
+            key = event.key()
+            escape = self.is_selecting_region and key == Qt.Key_Escape
+            # Kısayol tablosunda karşılığı olmayan tuşlar (yazı yazarken çoğu) burada biter
+            hotkey = None if escape else self.hotkeys.match(key, event.modifiers())
+            if hotkey is None and not escape:
                 return super().eventFilter(obj, event)
 
-            key = event.key()
-            modifiers = int(event.modifiers())
-            
-            if self.is_selecting_region and key == Qt.Key_Escape:
+            # Eğer yazı yazıyorsa (Recorder, Geometri vb. metin alanları), klavye tuşlarını engelleme
+            if self._is_typing_target(obj):
+                return super().eventFilter(obj, event)
+
+            if escape:
                 self.cancel_screenshot()
                 return True
-                
+
             try:
-                def check_hotkey(action_name):
-                    hotkey_str = self.settings.get("hotkeys").get(action_name)
-                    if not hotkey_str: return False
-                    seq = QKeySequence(key | modifiers)
-                    return seq.matches(QKeySequence(hotkey_str)) == QKeySequence.ExactMatch or \
-                           (modifiers == 0 and key == QKeySequence(hotkey_str)[0])
-
-                if key == Qt.Key_Backspace: 
-                    self.undo()
-                    return True
-                elif check_hotkey("board_mode"): 
-                    if self.toolbar: self.toolbar.toggle_board()
-                    return True  # True döndürmek, butona tıklanmasını (tetiklenmesini) tamamen önler
-                elif check_hotkey("drawer"): 
-                    if self.toolbar: self.toolbar.toggle_drawer()
-                    return True
-                elif check_hotkey("undo"): 
-                    self.undo()
-                    return True
-                elif check_hotkey("quit"): 
-                    QApplication.quit()
-                    return True
-                elif check_hotkey("screenshot"): 
-                    self.take_screenshot()
-                    return True
-                elif check_hotkey("clear"): 
-                    self.clear_all()
-                    return True
-                elif check_hotkey("move_mode"): 
-                    if self.toolbar: self.toolbar.toggle_move_mode()
-                    return True
-                elif check_hotkey("color_picker"): 
-                    if self.toolbar: self.toolbar.select_color()
-                    return True
+                hotkey.callback()
+                return True  # True döndürmek, butona tıklanmasını (tetiklenmesini) tamamen önler
             except Exception as e:
                 print(f"Kısayol hatası: {e}")
                 
         return super().eventFilter(obj, event)
 
-    def mousePressEvent(self, event):
+    def _is_typing_target(self, obj):
+        if not hasattr(obj, 'metaObject'): return False
+        c_name = obj.metaObject().className()
+        typing = _TYPING_CLASSES.get(c_name)
+        if typing is None:
+            typing = _TYPING_CLASSES[c_name] = any(hint in c_name for hint in ("Edit", "Text", "Input", "Box"))
+        return typing
+
+    def register_hotkey(self, action, callback, default=None, enabled=None, owner=None):
+        """Eklentiler kendi kısayollarını ekler; ayarlarda action için tuş varsa o kullanılır"""
+        self.hotkeys.register(action, callback, default, enabled, owner)
+
+    def _register_builtin_hotkeys(self):
+        whiteboard = lambda: self._whiteboard_mode
+        toolbar = lambda name: lambda: self.toolbar and getattr(self.toolbar, name)()
+        register = self.hotkeys.register
+        register("redo", self.redo)
+        register("save_session", self.save_session)
+        register("open_session", self.open_session)
+        register("next_page", lambda: self.pages.next_page(), enabled=whiteboard)
+        register("prev_page", lambda: self.pages.prev_page(), enabled=whiteboard)
+        register("reset_view", self.reset_board_view, enabled=self._can_navigate)
+        register("backspace_undo", self.undo, default="Backspace")  # Backspace her zaman geri alır
+        register("board_mode", toolbar("toggle_board"))
+        register("drawer", toolbar("toggle_drawer"))
+        register("undo", self.undo)
+        register("quit", QApplication.quit)
+        register("screenshot", self.take_screenshot)
+        register("clear", self.clear_all)
+        register("move_mode", toolbar("toggle_move_mode"))
+        register("color_picker", toolbar("select_color"))
+
+    # Fare olayları birincil overlay'den ve diğer ekranların yüzeylerinden (ScreenSurface) buraya gelir
+    def mousePressEvent(self, event): self.surface_press(self, event)
+    def mouseMoveEvent(self, event): self.surface_move(self, event)
+    def mouseReleaseEvent(self, event): self.surface_release(self, event)
+    def paintEvent(self, event):
+        p = QPainter(self)
+        self.paint_surface(self, p, event.rect())
+
+    def surface_press(self, surface, event):
         if self.is_selecting_region:
             if event.button() == Qt.LeftButton: 
+                self._select_surface = surface
                 self.select_start = event.pos()
                 self.select_end = event.pos()
-                self.update()
+                surface.update()
             return 
         
-        if not self.is_mouse_on_ui(event.pos()):
-            self.plugin_windows.notify_canvas_click()
-            
-        if self.is_mouse_on_ui(event.pos()): return 
-        if self.childAt(event.pos()): return 
+        if surface.is_mouse_on_ui(event.pos()): return 
+        self.plugin_windows.notify_canvas_click()
+        if surface.childAt(event.pos()): return 
+
+        if event.button() == Qt.MiddleButton and self._can_navigate(surface):
+            # Orta tuşla sürükleyerek tahtayı kaydır
+            self.panning = True
+            self._pan_surface = surface
+            self._pan_anchor = event.pos()
+            return
 
         if event.button() == Qt.LeftButton:
+            self.input_surface = surface
             self.drawing = True
-            self.last_point = event.pos()
+            self.last_point = self._canvas_point(event.pos())
             self.current_stroke_path = QPainterPath()
             self.current_stroke_path.moveTo(self.last_point)
-
-    def mouseMoveEvent(self, event):
+            self.current_stroke_points = [(self.last_point.x(), self.last_point.y())]
+            self.current_stroke_pressures = [self._pressure_factor()]
+            self._stroke_pressure = self._pressure is not None and self.drawing_mode == "pen"
+            self._begin_low_latency(self.last_point, self._event_time(event))
+            if self._is_history_eraser():
+                self.input_layer.begin_erase()
+                self._erase_along(self.last_point, self.last_point)
+            elif self.drawing_mode in ("pen", "eraser") and self.settings.get("input_coalescing"):
+                self.frame_timer.start(self._frame_interval(event.globalPos()))
+
+    def surface_move(self, surface, event):
         if self.is_selecting_region: 
+            if surface is not self._select_surface: return
             old_rect = QRect(self.select_start, self.select_end).normalized()
             self.select_end = event.pos()
             new_rect = QRect(self.select_start, self.select_end).normalized()
-            self.update(old_rect.united(new_rect).adjusted(-2, -2, 2, 2))
+            surface.update(old_rect.united(new_rect).adjusted(-2, -2, 2, 2))
             return 
         
-        if not self.drawing: 
-            self.is_mouse_on_ui(event.pos())
+        if self.panning and surface is self._pan_surface:
+            self.set_board_view(self._board_layer_of(surface).pan - (event.pos() - self._pan_anchor), surface=surface)
+            self._pan_anchor = event.pos()
+            return
+
+        if not self.drawing or surface is not self.input_surface: 
+            surface.is_mouse_on_ui(event.pos())
             return
         
-        if self.drawing_mode in ["pen", "eraser"]:
-            new_point = event.pos()
-            control_point = self.last_point
-            
-            end_point = (control_point + new_point) / 2
-            self.current_stroke_path.quadTo(control_point, end_point)
-            
-            self.active_layer.draw_segment(self.last_point, new_point, self.current_color, self.brush_size, self.drawing_mode, self._whiteboard_mode)
-            
-            update_rect = QRect(self.last_point, new_point).normalized()
-            update_rect.adjust(-self.brush_size - 5, -self.brush_size - 5, self.brush_size + 5, self.brush_size + 5)
-            self.update(update_rect)
-            
+        if self._is_history_eraser():
+            new_point = self._canvas_point(event.pos())
+            self._erase_along(self.last_point, new_point)
             self.last_point = new_point
+        elif self.drawing_mode in ["pen", "eraser"]:
+            new_point = self._canvas_point(event.pos())
+            t = self._event_time(event)
+            if self._smoother is not None:
+                # Titreme quadTo'dan önce süzülür
+                new_point = QPointF(*self._smoother.filter(new_point.x(), new_point.y(), t))
+            self._stroke_to(new_point, t)
         else:
-            self.update()
+            surface.update()
 
-    def mouseReleaseEvent(self, event):
+    def surface_release(self, surface, event):
         if self.is_selecting_region:
-            if event.button() == Qt.LeftButton:
+            if event.button() == Qt.LeftButton and surface is self._select_surface:
                 self.select_end = event.pos()
                 selection_rect = QRect(self.select_start, self.select_end).normalized()
                 if selection_rect.width() < 5: self._finalize_screenshot(None) 
                 else: self._finalize_screenshot(selection_rect)
             return 
+
+        if self.panning:
+            self.panning = False
+            return
             
-        if not self.drawing: return
+        if not self.drawing or surface is not self.input_surface: return
         
-        if self.drawing_mode in ["pen", "eraser"]:
-            self.active_layer.add_stroke_to_history(self.current_stroke_path, self.current_color, self.brush_size, self.drawing_mode, self._whiteboard_mode)
+        if self._smoother is not None and self.drawing_mode in ["pen", "eraser"] and not self._is_history_eraser():
+            # Süzülmüş çizgi geride kalır; kalemin kalktığı noktaya kadar tamamlanır
+            end = self._canvas_point(event.pos())
+            if QPointF(end) != QPointF(self.last_point): self._stroke_to(QPointF(end))
+        self._smoother = None
+        self._set_prediction(None)
+        self.flush_input()
+        self.frame_timer.stop()
+        layer = self.input_layer
+        if self._is_history_eraser():
+            layer.end_erase()
+        elif self.drawing_mode in ["pen", "eraser"]:
+            pressures = self.current_stroke_pressures if self._stroke_pressure else None
+            layer.add_stroke_to_history(self.current_stroke_points, self.current_color, self._stroke_width(), self.drawing_mode, self._whiteboard_mode, pressures)
         elif self.drawing_mode in ["line", "rect", "ellipse"]:
             start_pos = self.current_stroke_path.pointAtPercent(0)
-            self.active_layer.add_shape(self.drawing_mode, start_pos, event.pos(), self.current_color, self.brush_size)
+            layer.add_shape(self.drawing_mode, start_pos, self._canvas_point(event.pos()), self.current_color, self._stroke_width())
             
         self.drawing = False
         self.current_stroke_path = QPainterPath() 
-        self.update()
+        self.current_stroke_points = []
+        self.current_stroke_pressures = []
+        surface.update()
 
-    def paintEvent(self, event):
-        p = QPainter(self)
+    def paint_surface(self, surface, p, rect):
+        """Bir yüzeyi (birincil overlay veya ScreenSurface) çizer; yüzeyin katmanı yoksa oluşturulmaz"""
         p.setRenderHint(QPainter.Antialiasing)
         p.setRenderHint(QPainter.HighQualityAntialiasing)
         p.setRenderHint(QPainter.SmoothPixmapTransform)
         
-        rect = event.rect()
         p.setClipRect(rect)
         
         p.fillRect(rect, Qt.white if self._whiteboard_mode else QColor(0,0,0,1))
-        p.drawPixmap(rect, self.active_layer.pixmap, rect)
+        layer = self.active_layer if surface is self else surface.layer(self._whiteboard_mode, create=False)
+        if layer is not None: layer.render(p, rect)
         
-        if self.drawing and self.drawing_mode in ["line", "rect", "ellipse"]:
+        if self.drawing and surface is self.input_surface and self.drawing_mode in ["line", "rect", "ellipse"]:
             p.setPen(QPen(self.current_color, self.brush_size, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
-            target_pos = self.mapFromGlobal(QCursor.pos())
-            start_pos = self.current_stroke_path.pointAtPercent(0)
+            target_pos = surface.mapFromGlobal(QCursor.pos())
+            start_pos = layer.to_screen(self.current_stroke_path.pointAtPercent(0)).toPoint()
             
             if self.drawing_mode == "line": p.drawLine(start_pos, target_pos)
             elif self.drawing_mode == "rect": p.drawRect(QRect(start_pos, target_pos).normalized())
             elif self.drawing_mode == "ellipse": p.drawEllipse(QRect(start_pos, target_pos).normalized())
 
+        if self._prediction is not None and self.drawing and surface is self.input_surface:
+            # Tahmini segment sadece ekrana çizilir; bir sonraki gerçek nokta onun yerini alır
+            start, end = (layer.to_screen(QPointF(point)) for point in self._prediction)
+            p.setPen(QPen(self.current_color, self.brush_size * self._pressure_factor(), Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+            p.drawLine(start, end)
+
         if self.is_selecting_region:
             p.setBrush(QColor(0,0,0,80)); p.setPen(Qt.NoPen)
-            r = self.rect(); s = QRect(self.select_start, self.select_end).normalized()
+            r = surface.rect()
+            s = QRect(self.select_start, self.select_end).normalized() if surface is self._select_surface else QRect()
             p.setClipRegion(QRegion(r).subtracted(QRegion(s))); p.fillRect(r, QColor(0,0,0,80)); p.setClipRegion(QRegion(r))
-            p.setPen(QPen(Qt.white, 2, Qt.DashLine)); p.setBrush(Qt.NoBrush); p.drawRect(s)
+            if not s.isNull(): p.setPen(QPen(Qt.white, 2, Qt.DashLine)); p.setBrush(Qt.NoBrush); p.drawRect(s)
 
     def undo(self):
-        self.active_layer.undo()
-        self.update()
+        """Geri alma, en son çizim yapılan ekranda uygulanır"""
+        layer, surface = self.input_layer, self.input_surface
+        dirty_rect = layer.undo()
+        if dirty_rect: surface.update(layer.to_screen_rect(dirty_rect))
+        else: surface.update()
+
+    def redo(self):
+        layer, surface = self.input_layer, self.input_surface
+        dirty_rect = layer.redo()
+        if dirty_rect: surface.update(layer.to_screen_rect(dirty_rect))
+        else: surface.update()
 
     def clear_all(self):
+        """Aktif moddaki tüm ekranları temizler"""
         self.active_layer.clear()
+        for layer in self.surfaces.layers(self._whiteboard_mode): layer.clear()
         self.update()
+        self.surfaces.update_all()
 
     def add_text(self):
         txt = ViziaTextItem(self, self._whiteboard_mode, self.current_color)
         txt.move(100,100)
-        txt.delete_requested.connect(lambda w: [self.remove_from_history(w), w.deleteLater()])
+        self.connect_text_item(txt)
         self.active_layer.add_widget_item(txt, 'text')
 
+    def connect_text_item(self, txt):
+        txt.delete_requested.connect(lambda w: [self.remove_from_history(w), w.deleteLater()])
+
     def open_image_loader(self):
         path, _ = QFileDialog.getOpenFileName(self, "Görsel", "", "Resim (*.png *.jpg)")
         if path:
             img = ViziaImageItem(path, self._whiteboard_mode, self)
-            img.request_close.connect(lambda w: [self.remove_from_history(w), w.deleteLater()])
-            img.request_stamp.connect(lambda: self.stamp_image(img))
+            self.connect_image_item(img)
             self.active_layer.add_widget_item(img, 'image')
         self.force_focus()
 
+    def connect_image_item(self, img):
+        img.request_close.connect(lambda w: [self.remove_from_history(w), w.deleteLater()])
+        img.request_stamp.connect(lambda: self.stamp_image(img))
+
+    def save_session(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Oturumu Kaydet", self.settings.get("session_path"), SESSION_FILTER)
+        if path:
+            self.session.save(path, lambda ok, _: self.show_toast("Oturum kaydedildi" if ok else "Oturum kaydedilemedi!"))
+        self.force_focus()
+
+    def open_session(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Oturum Aç", self.settings.get("session_path"), SESSION_FILTER)
+        if path:
+            try:
+                elapsed = self.session.load(path)
+                self.show_toast(f"Oturum yüklendi ({elapsed:.0f} ms)")
+            except Exception as e:
+                print(f"Oturum yüklenemedi: {e}")
+                self.show_toast("Oturum açılamadı!")
+        self.force_focus()
+
     def remove_from_history(self, widget):
         try:
             self.active_layer.remove_widget_item(widget)
@@ -324,14 +667,15 @@ class DrawingOverlay(QMainWindow):
         if not widget or not widget.isVisible(): return
         try:
             pos = self.mapFromGlobal(widget.image_container.mapToGlobal(QPoint(0,0)))
-            p = QPainter(self.active_layer.pixmap)
-            p.setRenderHint(QPainter.SmoothPixmapTransform)
-            p.setRenderHint(QPainter.Antialiasing)
-            p.drawPixmap(pos, widget.image_container.pixmap().scaled(widget.image_container.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
-            p.end()
+            size = widget.image_container.size()
+            layer = self.active_layer
+            if layer.zoom != 1: size = size / layer.zoom  # Dünyada, ekrandaki boyutuyla aynı görünsün
+            stamp = widget.image_container.pixmap().scaled(size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            world = layer.to_world(pos)
+            layer.add_stamp(QPoint(round(world.x()), round(world.y())), stamp)
             widget.close()
             widget.deleteLater() 
-            self.update()
+            self.update(layer.to_screen_rect(QRect(QPoint(round(world.x()), round(world.y())), stamp.size())))
             self.force_focus()
         except Exception as e: 
             print(f"Resim damgalama hatası: {e}")
@@ -341,28 +685,127 @@ class DrawingOverlay(QMainWindow):
         self.drawing = False; self.is_selecting_region = True
         self.select_start = QPoint(); self.select_end = QPoint()
         self.setCursor(Qt.CrossCursor)
+        self.surfaces.set_cursor(Qt.CrossCursor)
+        self._select_surface = self
+        self.surfaces.update_all()
         self.show_toast("<center>Alan seçin veya tam ekran için tek tıklayın<br><span style='font-size: 12px; color: #a1a1a6;'>(Çıkmak için ESC basınız)</span></center>")
         self.update()
 
     def cancel_screenshot(self):
         self.is_selecting_region = False
         self.setCursor(Qt.ArrowCursor)
+        self.surfaces.set_cursor(Qt.ArrowCursor)
         if self.toolbar: self.toolbar.show()
         self.update()
+        self.surfaces.update_all()
 
     def _finalize_screenshot(self, crop_rect=None):
         self.is_selecting_region = False; self.setCursor(Qt.ArrowCursor)
-        self.update(); QApplication.processEvents()
-        QTimer.singleShot(100, lambda: self._perform_save(crop_rect))
-
-    def _perform_save(self, crop_rect):
-        try:
-            success = ScreenshotManager.save_screenshot(crop_rect, self.settings.get("save_path"))
-            self.show_toast("Kaydedildi!" if success else "Hata!")
-        except: self.show_toast("Hata")
+        self.surfaces.set_cursor(Qt.ArrowCursor)
+        # Seçim hangi ekranda yapıldıysa o ekranın görüntüsü alınır
+        surface = self._select_surface
+        ink_only = self.settings.get("screenshot_content") == "ink"
+        if CAPTURE_EXCLUSION or ink_only or self._whiteboard_mode:
+            self._save_export(surface, crop_rect, ink_only)
+            return
+        # Overlay'i yakalamadan gizleyemeyen platformlarda: seçilen yüzey (ve üstündeki bildirim / çekmece)
+        # gizlenir, gizleme ekrana yansıyınca sadece seçilen alan alınır ve pencereler geri açılır
+        drawer = getattr(self.toolbar, 'drawer', None) if self.toolbar else None
+        hidden = [w for w in (surface, getattr(self, 'toast', None), drawer) if w is not None and w.isVisible()]
+        for w in hidden: w.hide()
+        QApplication.processEvents()
+        QTimer.singleShot(self._frame_interval(surface), lambda: self._grab_hidden(surface, crop_rect, hidden))
+
+    def _grab_hidden(self, surface, crop_rect, hidden):
+        try: desktop = self.screenshots.capture(self._export_rect(surface, crop_rect), self._surface_screen(surface))
+        finally:
+            for w in hidden: w.show()
+        self._save_export(surface, crop_rect, False, desktop)
+
+    def _frame_interval(self, surface):
+        """HIDE_SETTLE_FRAMES karenin süresi (ms), yüzeyin ekranının yenileme hızına göre"""
+        screen = self._surface_screen(surface)
+        rate = screen.refreshRate() if screen else 0
+        return max(1, round(HIDE_SETTLE_FRAMES * 1000 / (rate if rate > 0 else 60)))
+
+    def _save_export(self, surface, crop_rect, ink_only, desktop=None):
+        try: image = self.export_annotated(crop_rect, surface, ink_only=ink_only, desktop=desktop)
+        except Exception as e:
+            print(f"Dışa aktarma hatası: {e}")
+            image = None
+        if image is None and not ink_only:
+            # Masaüstü hiç alınamadı (ör. Wayland ya da eski Windows): çizim yine de kaydedilir
+            image = self.export_annotated(crop_rect, surface, ink_only=True)
+            self.show_toast("Masaüstü yakalanamadı, sadece çizim kaydedildi")
+        self.update(); self.surfaces.update_all()
+        options = self.screenshot_options()
+        if self.screenshots.save_image(image, self.settings.get("save_path"), **options) is None: self.show_toast("Hata!")
         if self.toolbar: self.toolbar.show()
         self.force_focus()
 
+    def _surface_screen(self, surface):
+        return QApplication.primaryScreen() if surface is self else surface.target_screen
+
+    def _export_rect(self, surface, crop_rect=None):
+        rect = surface.rect()
+        if crop_rect is not None and crop_rect.isValid() and not crop_rect.isNull():
+            rect = crop_rect.normalized().intersected(rect)
+        return rect
+
+    def export_annotated(self, crop_rect=None, surface=None, ink_only=False, desktop=None):
+        """
+        Ekran görüntüsünü ekran dışında tek geçişte birleştirir: temiz masaüstü (ya da beyaz tahta zemini),
+        aktif katmanın karoları ve görünür widget'lar (metin, resim, geometri). Zamanlayıcıya bağlı değildir.
+        ink_only=True sadece çizimi şeffaf zeminle verir.
+        desktop: overlay gizliyken alınmış, kırpılacak alanın (bkz. _export_rect) temiz görüntüsü; verilmezse
+        overlay yakalamadan gizlenerek (Windows) alınır. Masaüstü modunda alınamazsa None döner.
+        """
+        surface = surface or self
+        rect = self._export_rect(surface, crop_rect)
+        screen = self._surface_screen(surface)
+        background = None
+        if not ink_only and not self._whiteboard_mode:
+            background = desktop if desktop is not None else self.screenshots.capture_clean(rect, screen, self._capture_windows())
+            if background is None or background.isNull(): return None
+
+        dpr = screen.devicePixelRatio() if screen else 1.0
+        image = QImage(round(rect.width() * dpr), round(rect.height() * dpr), QImage.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(dpr)
+        image.fill(Qt.transparent)
+        p = QPainter(image)
+        p.setRenderHint(QPainter.Antialiasing)
+        p.setRenderHint(QPainter.SmoothPixmapTransform)
+        if background is not None: p.drawImage(QRect(QPoint(0, 0), rect.size()), background)
+        elif not ink_only: p.fillRect(QRect(QPoint(0, 0), rect.size()), Qt.white)
+        p.translate(-rect.topLeft())
+        layer = self.active_layer if surface is self else surface.layer(self._whiteboard_mode, create=False)
+        if layer is not None:
+            layer.render(p, rect)
+            if surface is self:
+                layer.cleanup_dead_widgets()
+                for w in layer.widgets:
+                    if w.isVisible() and w.geometry().intersects(rect):
+                        w.render(p, w.pos(), QRegion(), QWidget.DrawChildren)
+        p.end()
+        return image
+
+    def _capture_windows(self):
+        """Temiz masaüstü alınırken yakalamadan gizlenen pencereler"""
+        windows = [self] + list(self.surfaces)
+        if self.toolbar:
+            windows.append(self.toolbar)
+            drawer = getattr(self.toolbar, 'drawer', None)
+            if drawer is not None: windows.append(drawer)
+        return windows
+
+    def screenshot_options(self):
+        return {
+            "fmt": self.settings.get("screenshot_format"),
+            "png_compression": self.settings.get("screenshot_png_compression"),
+            "jpeg_quality": self.settings.get("screenshot_jpeg_quality"),
+            "clipboard": bool(self.settings.get("screenshot_to_clipboard")),
+        }
+
     def show_toast(self, m): 
         self.toast = ModernNotification(m, self)
         self.toast.show_animated()
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Eklenti süreci (overlay tarafı)
+Manifestinde "worker" olan eklentiler, ayarlardaki "plugin_isolation" açıksa ağır işlerini ayrı bir
+süreçte çalıştırır (bkz. core/plugin_ipc.py). Pencereler overlay sürecinde kalır ve PluginWindowManager
+tarafından yönetilmeye devam eder; süreç sadece hesaplama yapar, çökerse overlay etkilenmez.
+
+    process.call("extract_text", frame.name, "eng", callback=göster)   # GUI thread'i beklemez
+    text = process.call_sync("translate", metin, "tr")                   # QThread'lerden
+"""
+
+import os
+import itertools
+import threading
+import multiprocessing
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from core.plugin_ipc import SharedFrame, worker_main
+
+STOP_TIMEOUT = 2.0
+
+
+class PluginProcessError(RuntimeError):
+    pass
+
+
+class _Reader(QThread):
+    """
+    Kanalı dinler; senkron çağrıların sonuçlarını doğrudan, diğer mesajları GUI thread'ine iletir.
+    Her başlatılan süreç kendi reader'ına sahiptir; bekleyen çağrılar da reader'a bağlanır.
+    """
+    message = pyqtSignal(object)
+
+    def __init__(self, process, conn, proc):
+        super().__init__()
+        self.process = process
+        self.conn = conn
+        self.proc = proc
+        self.stopping = False
+
+    def run(self):
+        while True:
+            try: message = self.conn.recv()
+            except (EOFError, OSError): break
+            if message[0] in ("result", "error") and self.process._resolve_sync(message): continue
+            self.message.emit(message)
+        # Sonuç bekleyen thread'ler (GUI thread'i olabilir) sinyali beklemeden serbest kalır
+        self.process._fail_sync(self)
+        self.message.emit(("closed", self))
+
+
+class PluginProcess(QObject):
+    event = pyqtSignal(str, object)   # eklentinin context.emit ile gönderdiği olaylar
+    crashed = pyqtSignal(str)         # süreç beklenmedik şekilde kapandı (eklenti id'si)
+
+    def __init__(self, manifest, parent=None):
+        super().__init__(parent)
+        self.manifest = manifest
+        self.proc = None
+        self.conn = None
+        self.reader = None
+        self.frames = {}
+        self._ids = itertools.count(1)
+        self._callbacks = {}    # id -> (callback, error, reader)
+        self._waiters = {}      # id -> [threading.Event, mesaj, reader]
+        self._lock = threading.Lock()
+        app = QApplication.instance()
+        if app is not None: app.aboutToQuit.connect(self.stop)
+
+    @property
+    def running(self):
+        return self.proc is not None and self.proc.is_alive()
+
+    def start(self):
+        """
+        Süreci (gerekirse yeniden) başlatır. Çöken sürecin 'closed' mesajı henüz işlenmemiş olabilir;
+        o sürecin bekleyen çağrıları eski reader'a bağlı kalır ve mesaj gelince hata ile sonlanır.
+        """
+        if self.running: return
+        ctx = multiprocessing.get_context("spawn")
+        self.conn, child_conn = ctx.Pipe()
+        folder = os.path.abspath(self.manifest.folder)
+        self.proc = ctx.Process(target=worker_main, args=(child_conn, folder, self.manifest.worker),
+                                name=f"vizia-plugin-{self.manifest.id}", daemon=True)
+        self.proc.start()
+        child_conn.close()
+        self.reader = _Reader(self, self.conn, self.proc)
+        self.reader.message.connect(self._on_message)
+        self.reader.start()
+
+    def _send(self, method, args):
+        self.start()
+        call_id = next(self._ids)
+        return call_id, self.reader, ("call", call_id, method, args)
+
+    def _post(self, message):
+        try:
+            with self._lock: self.conn.send(message)
+        except (OSError, ValueError) as e:
+            raise PluginProcessError(f"{self.manifest.id} süreci yanıt vermiyor: {e}")
+
+    def call(self, method, *args, callback=None, error=None):
+        """Eşzamansız çağrı (GUI thread'inden); callback(sonuç) / error(metin) GUI thread'inde çağrılır"""
+        call_id, reader, message = self._send(method, args)
+        if callback is not None or error is not None: self._callbacks[call_id] = (callback, error, reader)
+        try: self._post(message)
+        except PluginProcessError as e:
+            self._callbacks.pop(call_id, None)
+            if error is not None: error(str(e))
+
+    def call_sync(self, method, *args, timeout=None):
+        """Sonucu bekleyen çağrı (her thread'den); hata olursa PluginProcessError"""
+        call_id, reader, message = self._send(method, args)
+        waiter = self._waiters[call_id] = [threading.Event(), None, reader]
+        try:
+            self._post(message)
+            if not waiter[0].wait(timeout): raise PluginProcessError(f"{self.manifest.id}.{method} zaman aşımı")
+        finally:
+            self._waiters.pop(call_id, None)
+        kind, _, value = waiter[1]
+        if kind == "error": raise PluginProcessError(value)
+        return value
+
+    def _resolve_sync(self, message):
+        waiter = self._waiters.get(message[1])
+        if waiter is None: return False
+        waiter[1] = message
+        waiter[0].set()
+        return True
+
+    def _fail_sync(self, reader):
+        # Sadece kapanan sürece gönderilmiş çağrılar; yeniden başlatılan sürecinkiler beklemeye devam eder
+        for waiter in list(self._waiters.values()):
+            if waiter[2] is not reader: continue
+            waiter[1] = ("error", None, f"{self.manifest.id} süreci kapandı")
+            waiter[0].set()
+
+    def frame(self, key, nbytes):
+        """Kareler için overlay'e ait paylaşımlı tampon; yetmezse büyütülmüş yenisi döner (ad değişir)"""
+        frame = self.frames.get(key)
+        if frame is None or frame.capacity < nbytes:
+            if frame is not None: frame.close()
+            frame = self.frames[key] = SharedFrame(size=nbytes)
+        return frame
+
+    def _on_message(self, message):
+        kind = message[0]
+        if kind == "event":
+            self.event.emit(message[1], message[2])
+        elif kind in ("result", "error"):
+            callback, error, _ = self._callbacks.pop(message[1], (None, None, None))
+            if kind == "result" and callback is not None: callback(message[2])
+            elif kind == "error":
+                if error is not None: error(message[2])
+                else: print(f"Eklenti Süreci Hatası ({self.manifest.id}): {message[2]}")
+        elif kind == "closed":
+            self._closed(message[1])
+
+    def _closed(self, reader):
+        # Kapanan sürecin bekleyen çağrıları hata ile sonlanır; sonraki çağrı süreci yeniden başlatır
+        closed = [cid for cid, entry in self._callbacks.items() if entry[2] is reader]
+        for cid in closed:
+            error = self._callbacks.pop(cid)[1]
+            if error is not None: error(f"{self.manifest.id} süreci kapandı")
+        reader.wait()
+        reader.proc.join(0.1)
+        if reader is self.reader: self.proc = self.reader = None
+        if not reader.stopping:
+            print(f"Eklenti süreci kapandı: {self.manifest.id}")
+            self.crashed.emit(self.manifest.id)
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        if self.proc is None: return
+        if self.reader is not None: self.reader.stopping = True
+        try: self._post(("stop",))
+        except PluginProcessError: pass
+        self.proc.join(timeout)
+        if self.proc is not None and self.proc.is_alive(): self.proc.terminate()
+        if self.reader is not None: self.reader.wait(int(timeout * 1000))
+        for frame in self.frames.values(): frame.close()
+        self.frames.clear()
@@ -0,0 +1,135 @@
+"""
+Eklenti süreci protokolü
+Ağır eklenti işleri (kayıt kodlama, OCR, çeviri) ayrı bir süreçte çalışabilir; böylece overlay'in GIL'ini
+ve CPU zamanını kalemle paylaşmazlar. Bu modül Qt'siz; hem overlay hem eklenti sürecinde içe aktarılır.
+
+Mesaj kanalı (multiprocessing Pipe, tuple mesajlar):
+    overlay -> eklenti: ("call", id, metot, argümanlar) | ("stop",)
+    eklenti -> overlay: ("result", id, değer) | ("error", id, metin) | ("event", ad, veri)
+Görüntü / kare gibi büyük veriler kanaldan değil SharedFrame (paylaşımlı bellek) üzerinden geçer;
+kanalda sadece belleğin adı gönderilir.
+
+Manifestteki "worker": "dosya.py:Sınıf" eklenti sürecinde kurulur: Sınıf(context) ve metotları uzaktan çağrılır.
+"""
+
+import os
+import sys
+import time
+import struct
+import threading
+from multiprocessing import shared_memory
+
+from core.plugin_loader import import_plugin_module
+
+
+class SharedFrame:
+    """
+    Tek yazıcılı paylaşımlı görüntü tamponu. Başlıktaki sıra numarası yazma sırasında tektir
+    (seqlock); okuyan taraf yarım yazılmış kareyi görürse tekrar dener, kilit gerekmez.
+    """
+    HEADER = struct.Struct("<QIIII")  # sıra, genişlik, yükseklik, satır uzunluğu, kanal
+    READ_RETRIES = 200   # yazıcı takılırsa (ör. overlay çöktü) okuyan en fazla ~0.2 sn bekler
+    READ_WAIT = 0.001
+
+    def __init__(self, name=None, size=0):
+        self.owner = name is None
+        # Bağlanan taraf belleği silmez (sahibi oluşturan süreçtir); spawn ile açılan eklenti süreci overlay'in
+        # resource_tracker'ını paylaştığı için bağlanırken yapılan kayıt çift kayıt olur, ayrıca silinmez
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.HEADER.size + size)
+            self.HEADER.pack_into(self.shm.buf, 0, 0, 0, 0, 0, 0)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def capacity(self):
+        return self.shm.size - self.HEADER.size
+
+    def write(self, data, width, height, stride, channels):
+        data = memoryview(data).cast("B")
+        if data.nbytes > self.capacity: raise ValueError("SharedFrame kapasitesi yetersiz")
+        buf = self.shm.buf
+        seq = self.HEADER.unpack_from(buf, 0)[0]
+        struct.pack_into("<Q", buf, 0, seq + 1)
+        buf[self.HEADER.size:self.HEADER.size + data.nbytes] = data
+        self.HEADER.pack_into(buf, 0, seq + 2, width, height, stride, channels)
+
+    def read(self):
+        """(bytes, genişlik, yükseklik, satır uzunluğu, kanal) kopyası; hiç yazılmadıysa ya da tutarlı kare alınamadıysa None"""
+        buf = self.shm.buf
+        for _ in range(self.READ_RETRIES):
+            seq, width, height, stride, channels = self.HEADER.unpack_from(buf, 0)
+            if seq == 0: return None
+            if seq & 1:
+                # Yazıcı kareyi yazıyor: boş döngüde çekirdek yakmadan kısa bir süre bekle
+                time.sleep(self.READ_WAIT)
+                continue
+            data = bytes(buf[self.HEADER.size:self.HEADER.size + stride * height])
+            if self.HEADER.unpack_from(buf, 0)[0] == seq: return data, width, height, stride, channels
+        return None
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            try: self.shm.unlink()
+            except FileNotFoundError: pass
+
+
+class WorkerContext:
+    """Eklenti sürecindeki worker'a verilir: overlay'e olay gönderme ve paylaşımlı karelere erişim"""
+    def __init__(self, conn):
+        self.conn = conn
+        self._send_lock = threading.Lock()
+        self._frames = {}
+
+    def send(self, message):
+        with self._send_lock: self.conn.send(message)
+
+    def emit(self, name, payload=None):
+        self.send(("event", name, payload))
+
+    def frame(self, name):
+        frame = self._frames.get(name)
+        if frame is None: frame = self._frames[name] = SharedFrame(name)
+        return frame
+
+    def release_frames(self, keep=()):
+        """Overlay büyüttüğü için artık kullanılmayan eski tamponları bırakır"""
+        for name in [n for n in self._frames if n not in keep]: self._frames.pop(name).close()
+
+
+def lower_priority():
+    """Eklenti süreci kalemle CPU için yarışmasın"""
+    try:
+        if os.name == "nt":
+            import ctypes
+            BELOW_NORMAL_PRIORITY_CLASS = 0x4000
+            ctypes.windll.kernel32.SetPriorityClass(ctypes.windll.kernel32.GetCurrentProcess(), BELOW_NORMAL_PRIORITY_CLASS)
+        else:
+            os.nice(5)
+    except Exception:
+        pass
+
+
+def worker_main(conn, folder, entry):
+    """Eklenti sürecinin giriş noktası (multiprocessing spawn)"""
+    lower_priority()
+    if folder not in sys.path: sys.path.insert(0, folder)
+    module_file, _, class_name = entry.partition(":")
+    context = WorkerContext(conn)
+    worker = getattr(import_plugin_module(folder, os.path.join(folder, module_file)), class_name)(context)
+    while True:
+        try: message = conn.recv()
+        except (EOFError, OSError): break
+        if message[0] == "stop": break
+        _, call_id, method, args = message
+        try:
+            context.send(("result", call_id, getattr(worker, method)(*args)))
+        except Exception as e:
+            context.send(("error", call_id, f"{type(e).__name__}: {e}"))
+    if hasattr(worker, "close"): worker.close()
+    context.release_frames()
@@ -0,0 +1,170 @@
+"""
+Eklenti keşfi
+Her eklenti klasöründeki plugin.json (manifest) kod çalıştırılmadan okunur; çekmece butonu ve
+kısayollar manifestten kurulur. Eklentinin modülü (ve ağır bağımlılıkları) ancak ilk tıklamada
+içe aktarılır. Manifesti olmayan eski eklentiler açılışta eskisi gibi yüklenir.
+
+plugin.json:
+    {"id": "geometry", "name": "Geometri Stüdyosu", "icon": "icons/geometry.png",
+     "entry": "plugin.py:ViziaPlugin", "hotkeys": {"run": "Ctrl+Shift+G"}, "warmup": "thread"}
+    hotkeys: eklenti metodu -> tuş; metot overlay ile çağrılır ("run" eklentiyi açar).
+    Kullanıcı ayarlardaki "hotkeys" içinde "<id>.<metot>" anahtarıyla tuşu değiştirebilir.
+    warmup: ön ısıtmada modülün nerede içe aktarılacağı; "thread" (varsayılan) arka planda,
+    "gui" ana thread'de (import sırasında Qt nesnesi kuran modüller, örn. QtWebEngine).
+    worker: "dosya.py:Sınıf"; ayarlarda "plugin_isolation" açıksa ağır işler bu sınıfla ayrı süreçte
+    çalışır (bkz. core/plugin_host.py). Eklenti attach_process(process) ile süreci alır.
+"""
+
+import os
+import json
+import threading
+import importlib.util
+
+from core.startup_trace import tracer
+
+MANIFEST_FILE = "plugin.json"
+DEFAULT_ENTRY = "plugin.py:ViziaPlugin"
+
+
+class PluginManifest:
+    __slots__ = ('id', 'name', 'icon', 'entry', 'hotkeys', 'warmup', 'worker', 'folder')
+
+    def __init__(self, folder, id, name, icon="", entry=DEFAULT_ENTRY, hotkeys=None, warmup="thread", worker=None):
+        self.folder = folder
+        self.id = id
+        self.name = name
+        self.icon = icon
+        self.entry = entry
+        self.hotkeys = dict(hotkeys or {})
+        self.warmup = warmup
+        self.worker = worker
+
+    @classmethod
+    def read(cls, folder):
+        """Klasördeki plugin.json; yoksa None (bozuksa ValueError)"""
+        path = os.path.join(folder, MANIFEST_FILE)
+        if not os.path.exists(path): return None
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if not data.get("name"): raise ValueError(f"{path}: 'name' eksik")
+        return cls(folder, data.get("id") or os.path.basename(folder), data["name"], data.get("icon", ""),
+                   data.get("entry", DEFAULT_ENTRY), data.get("hotkeys"),
+                   data.get("warmup", "thread"), data.get("worker"))
+
+    @property
+    def icon_path(self):
+        return os.path.join(self.folder, self.icon)
+
+    @property
+    def module_file(self):
+        return os.path.join(self.folder, self.entry.split(":")[0])
+
+    @property
+    def class_name(self):
+        return self.entry.split(":")[1] if ":" in self.entry else "ViziaPlugin"
+
+
+def import_plugin_module(folder, module_file):
+    spec = importlib.util.spec_from_file_location(f"plugins.{os.path.basename(folder)}", module_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class LazyPlugin:
+    """Manifestle tanımlı eklenti; modül ilk load() / run() çağrısında içe aktarılır"""
+    def __init__(self, manifest, overlay, instance=None):
+        self.manifest = manifest
+        self.overlay = overlay
+        self.instance = instance
+        self.module = None
+        self.error = None
+        self._import_lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self.instance is not None
+
+    def import_module(self):
+        """
+        Sadece modülü içe aktarır (bir kez); ön ısıtma bunu arka plan thread'inde çağırabilir.
+        Aynı anda load() gelirse ikinci import yapılmaz, ilkinin bitmesi beklenir.
+        """
+        with self._import_lock:
+            if self.module is None and self.error is None:
+                try:
+                    with tracer.phase(f"plugin:{self.manifest.id} import", "plugin"):
+                        self.module = import_plugin_module(self.manifest.folder, self.manifest.module_file)
+                except Exception as e:
+                    self._failed(e)
+        return self.module
+
+    def load(self):
+        """Modülü içe aktarır ve eklentiyi kurar (bir kez, GUI thread'inde); hata olursa None"""
+        if self.instance is not None or self.error is not None: return self.instance
+        module = self.import_module()
+        if module is None: return None
+        try:
+            with tracer.phase(f"plugin:{self.manifest.id} construct", "plugin"):
+                self.instance = getattr(module, self.manifest.class_name)()
+            # Eklenti kendi kısayollarını overlay'in kısayol tablosuna ekleyebilir
+            if hasattr(self.instance, "register_hotkeys"): self.instance.register_hotkeys(self.overlay)
+            self._attach_process()
+        except Exception as e:
+            self._failed(e)
+        return self.instance
+
+    def _attach_process(self):
+        """Süreç yalıtımı açıksa eklentiye kendi sürecini verir (süreç ilk çağrıda başlar)"""
+        if not (self.manifest.worker and hasattr(self.instance, "attach_process")): return
+        if not self.overlay.settings.get("plugin_isolation"): return
+        from core.plugin_host import PluginProcess
+        self.instance.attach_process(PluginProcess(self.manifest, self.overlay))
+
+    def _failed(self, error):
+        self.error = error
+        print(f"Eklenti Yükleme Hatası ({os.path.basename(self.manifest.folder)}): {error}")
+
+    def run(self):
+        instance = self.load()
+        if instance is None:
+            if hasattr(self.overlay, 'show_toast'): self.overlay.show_toast(f"{self.manifest.name} yüklenemedi!")
+            return
+        instance.run(self.overlay)
+
+    def call(self, method):
+        """Manifest kısayolları: eklentiyi yükleyip metodunu overlay ile çağırır"""
+        if method == "run": return self.run()
+        instance = self.load()
+        if instance is not None and hasattr(instance, method): getattr(instance, method)(self.overlay)
+
+
+def _legacy_plugin(folder, overlay):
+    """Manifesti olmayan eklenti: eskisi gibi hemen içe aktarılır, ad / ikon örnekten okunur"""
+    name = os.path.basename(folder)
+    with tracer.phase(f"plugin:{name} import", "plugin"):
+        module = import_plugin_module(folder, os.path.join(folder, "plugin.py"))
+    if not hasattr(module, "ViziaPlugin"): return None
+    with tracer.phase(f"plugin:{name} construct", "plugin"):
+        instance = module.ViziaPlugin()
+    manifest = PluginManifest(folder, getattr(instance, "id", None) or name, instance.name, instance.icon)
+    if hasattr(instance, "register_hotkeys"): instance.register_hotkeys(overlay)
+    return LazyPlugin(manifest, overlay, instance)
+
+
+def discover_plugins(plugins_dir, overlay):
+    """plugins_dir altındaki eklentiler (klasör adına göre sıralı)"""
+    plugins = []
+    for folder_name in sorted(os.listdir(plugins_dir)):
+        folder = os.path.join(plugins_dir, folder_name)
+        if not os.path.isdir(folder): continue
+        try:
+            with tracer.phase(f"plugin:{folder_name} manifest", "plugin"):
+                manifest = PluginManifest.read(folder)
+            if manifest is not None: plugins.append(LazyPlugin(manifest, overlay))
+            elif os.path.exists(os.path.join(folder, "plugin.py")):
+                plugin = _legacy_plugin(folder, overlay)
+                if plugin is not None: plugins.append(plugin)
+        except Exception as e:
+            print(f"Eklenti Yükleme Hatası ({folder_name}): {e}")
+    return plugins
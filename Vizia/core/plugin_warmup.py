@@ -0,0 +1,122 @@
+"""
+Eklenti ön ısıtma
+Açılıştan sonra overlay boştayken seçili eklentiler ayarlardaki öncelik sırasıyla ("plugin_warmup_order")
+hazırlanır; ilk tıklamada pencere beklemeden açılır. Açılış yavaşlamasın diye ilk adım gecikmeli başlar.
+
+Her eklenti için:
+  1. Modül içe aktarılır: manifestte "warmup": "thread" ise arka plan thread'inde, "gui" ise ana thread'de
+  2. Eklenti kurulur (ViziaPlugin(), GUI thread'i)
+  3. Eklentide varsa warmup_background() arka plan thread'inde çağrılır (Qt nesnesi kurmayan işler: dll, model...)
+  4. Eklentide varsa warmup(overlay) GUI thread'inde çağrılır (gizli pencere kurmak gibi işler)
+GUI adımları sadece kullanıcı çizim yapmıyorken çalışır; meşgulse kısa süre sonra tekrar denenir.
+"""
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+START_DELAY_MS = 2000   # açılıştan sonra ilk adımın gecikmesi
+BUSY_RETRY_MS = 500     # overlay meşgulse tekrar deneme aralığı
+STEP_GAP_MS = 100       # iki GUI adımı arasında olay döngüsüne verilen süre
+
+
+class _TaskSignals(QObject):
+    done = pyqtSignal()
+
+
+class _BackgroundTask(QRunnable):
+    def __init__(self, fn, signals):
+        super().__init__()
+        self.fn = fn
+        self.signals = signals
+
+    def run(self):
+        try: self.fn()
+        except Exception as e: print(f"Eklenti Ön Isıtma Hatası: {e}")
+        self.signals.done.emit()
+
+
+class PluginWarmup(QObject):
+    warmed = pyqtSignal(str)   # eklenti id'si
+    finished = pyqtSignal()
+
+    def __init__(self, overlay, plugins, parent=None):
+        super().__init__(parent)
+        self.overlay = overlay
+        order = overlay.settings.get("plugin_warmup_order") or []
+        by_id = {p.manifest.id: p for p in plugins}
+        self.queue = [by_id[i] for i in order if i in by_id]
+        self.current = None
+        self._next = None
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)   # öncelik sırası korunsun; ikinci çekirdek çizime kalsın
+        self._signals = _TaskSignals(self)
+        self._signals.done.connect(self._step)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._step)
+        app = QApplication.instance()
+        if app is not None: app.aboutToQuit.connect(self.stop)
+
+    def start(self, delay=START_DELAY_MS):
+        if self.queue and self.overlay.settings.get("plugin_warmup"): self.timer.start(delay)
+
+    def stop(self):
+        self.queue.clear()
+        self.current = self._next = None
+        self.timer.stop()
+        self.pool.clear()
+        self.pool.waitForDone()
+
+    def _busy(self):
+        overlay = self.overlay
+        return overlay.drawing or getattr(overlay, "is_selecting_region", False) or bool(QApplication.mouseButtons())
+
+    def _background(self, fn):
+        self.pool.start(_BackgroundTask(fn, self._signals))
+
+    def _step(self):
+        """Sıradaki GUI adımı; arka plan adımları bitince de buraya dönülür"""
+        if self._next is None:
+            if not self.queue:
+                self.finished.emit()
+                return
+            self.current = self.queue.pop(0)
+            self._next = self._import
+        if self._busy():
+            self.timer.start(BUSY_RETRY_MS)
+            return
+        step, self._next = self._next, None
+        step()
+
+    def _import(self):
+        plugin = self.current
+        self._next = self._construct
+        if plugin.loaded or plugin.error is not None: return self._done()
+        if plugin.manifest.warmup == "gui":
+            plugin.import_module()
+            self.timer.start(STEP_GAP_MS)
+        else:
+            self._background(plugin.import_module)
+
+    def _construct(self):
+        plugin = self.current
+        # Bu arada kullanıcı eklentiyi açtıysa hazırlığa gerek kalmadı
+        if plugin.loaded or plugin.load() is None: return self._done()
+        instance = plugin.instance
+        if hasattr(instance, "warmup_background"):
+            self._next = self._warmup_gui
+            self._background(instance.warmup_background)
+        else:
+            self._warmup_gui()
+
+    def _warmup_gui(self):
+        instance = self.current.instance
+        if hasattr(instance, "warmup"):
+            try: instance.warmup(self.overlay)
+            except Exception as e: print(f"Eklenti Ön Isıtma Hatası ({self.current.manifest.id}): {e}")
+        self._done()
+
+    def _done(self):
+        plugin, self.current, self._next = self.current, None, None
+        if plugin.loaded: self.warmed.emit(plugin.manifest.id)
+        self.timer.start(STEP_GAP_MS)
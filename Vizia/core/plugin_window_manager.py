@@ -1,96 +1,134 @@
 # -*- coding: utf-8 -*-
 """
 Plugin Window Manager
-Eklenti pencerelerini merkezi olarak yöneten ve temizleyen sistem.
+Eklenti pencerelerini merkezi olarak yöneten sistem. Pencereler zayıf referansla tutulur ve
+destroyed sinyaliyle (ya da Python nesnesi silinince) kendiliğinden kayıttan düşer; bu yüzden
+çağrı başına pencere yoklaması (isVisible) gerekmez. Görünürlük ve geometri
+GeometryTracker'ın olaylarla güncellenen önbelleğinden okunur.
 """
 
+import weakref
+import functools
+
+try:
+    import sip
+except ImportError:
+    import PyQt5.sip as sip
+
 from PyQt5.QtCore import Qt
 
+from core.spatial import GeometryTracker
+
+
+class _Entry:
+    __slots__ = ('key', 'ref', 'sub_refs', 'on_canvas_click', 'on_mode_changed', '__weakref__')
+
+    def __init__(self, window, sub_windows, on_dead):
+        self.key = id(window)
+        self.ref = weakref.ref(window, lambda _: on_dead(self))
+        self.sub_refs = [weakref.ref(w) for w in sub_windows if w is not None]
+        # Geri çağırma desteği kayıtta bir kez bakılır
+        self.on_canvas_click = hasattr(window, 'on_canvas_click')
+        self.on_mode_changed = hasattr(window, 'on_mode_changed')
+
+    def sub_windows(self):
+        return [w for w in (ref() for ref in self.sub_refs) if w is not None]
+
+
 class PluginWindowManager:
-    
+
     PLUGIN_WINDOW_FLAGS = (
-        Qt.FramelessWindowHint | 
-        Qt.WindowStaysOnTopHint | 
-        Qt.Tool | 
+        Qt.FramelessWindowHint |
+        Qt.WindowStaysOnTopHint |
+        Qt.Tool |
         Qt.WindowDoesNotAcceptFocus
     )
-    
+
     # [EVLAT EDİNME] Artık ana ekranı (overlay) tanıyor
     def __init__(self, overlay=None):
         self.overlay = overlay
-        self._windows = {}
+        self._windows = {}   # id(pencere) -> _Entry
         self._mode_states = {}
-    
+        # Pencere geometrileri olaylarla güncellenen bir index'te tutulur (is_mouse_on_any için)
+        self._geometry = GeometryTracker()
+
     def register(self, window, sub_windows=None):
-        if window is not None:
-            # [ANA ÇÖZÜM] Sisteme giren eklenti penceresi (örn. Recorder) ana ekrana evlatlık verilir.
-            if self.overlay:
-                flags = window.windowFlags()
-                window.setParent(self.overlay)
-                # Qt.Tool bayrağı onun ebeveyni içinde gömülü değil, üstünde yüzen bir araç olmasını sağlar.
-                window.setWindowFlags(flags | Qt.FramelessWindowHint | Qt.Tool | Qt.WindowStaysOnTopHint)
-                
-            self._windows[window] = sub_windows if sub_windows else []
-            
-            # Alt pencereler (örn: Recorder ayar paneli) için de aynısı yapılır
-            if sub_windows and self.overlay:
-                for sub_win in sub_windows:
-                    if sub_win is not None:
-                        s_flags = sub_win.windowFlags()
-                        sub_win.setParent(self.overlay)
-                        sub_win.setWindowFlags(s_flags | Qt.FramelessWindowHint | Qt.Tool | Qt.WindowStaysOnTopHint)
-    
+        if window is None: return
+        sub_windows = [w for w in (sub_windows or []) if w is not None]
+        # [ANA ÇÖZÜM] Sisteme giren eklenti penceresi (örn. Recorder) ana ekrana evlatlık verilir.
+        # Qt.Tool bayrağı onun ebeveyni içinde gömülü değil, üstünde yüzen bir araç olmasını sağlar.
+        # Alt pencereler (örn: Recorder ayar paneli) için de aynısı yapılır
+        if self.overlay:
+            for w in [window] + sub_windows:
+                flags = w.windowFlags()
+                w.setParent(self.overlay)
+                w.setWindowFlags(flags | Qt.FramelessWindowHint | Qt.Tool | Qt.WindowStaysOnTopHint)
+
+        key = id(window)
+        old = self._windows.get(key)
+        if old is not None and old.ref() is window:
+            # Aynı pencere tekrar kaydedildi: sadece alt pencereler güncellenir
+            for sub_win in old.sub_windows(): self._geometry.untrack(sub_win)
+            old.sub_refs = [weakref.ref(w) for w in sub_windows]
+            entry = old
+        else:
+            entry = self._windows[key] = _Entry(window, sub_windows, self._forget)
+            window.destroyed.connect(functools.partial(self._on_destroyed, weakref.ref(entry)))
+            self._geometry.track(window)
+        for sub_win in sub_windows: self._geometry.track(sub_win)
+
     def unregister(self, window):
-        if window in self._windows:
-            del self._windows[window]
-    
+        entry = self._windows.get(id(window))
+        if entry is None or entry.ref() is not window: return
+        for sub_win in entry.sub_windows(): self._geometry.untrack(sub_win)
+        self._geometry.untrack(window)
+        self._forget(entry)
+
+    def _on_destroyed(self, entry_ref, *_):
+        entry = entry_ref()
+        if entry is not None: self._forget(entry)
+
+    def _forget(self, entry):
+        # Aynı id'yi sonradan alan başka bir pencerenin kaydı silinmesin
+        if self._windows.get(entry.key) is entry: del self._windows[entry.key]
+
+    def _live(self):
+        """Yaşayan pencereler (geri çağırmalar sırasında kayıt değişebilir diye liste kopyası)"""
+        return [(window, entry) for window, entry in ((e.ref(), e) for e in list(self._windows.values())) if window is not None]
+
     def bring_all_to_front(self):
-        self._cleanup()
-        for window, sub_windows in list(self._windows.items()):
-            try:
-                if window.isVisible(): window.raise_()
-                for sub_win in sub_windows:
-                    try:
-                        if sub_win.isVisible(): sub_win.raise_()
-                    except (RuntimeError, AttributeError): pass
-            except (RuntimeError, AttributeError): pass
-    
+        visible = self._geometry.visible
+        for window, entry in self._live():
+            if visible(window): window.raise_()
+            for sub_win in entry.sub_windows():
+                if visible(sub_win): sub_win.raise_()
+
     def is_mouse_on_any(self, global_pos):
-        self._cleanup()
-        for window, sub_windows in list(self._windows.items()):
-            try:
-                if window.isVisible() and window.geometry().contains(global_pos):
-                    return True
-                for sub_win in sub_windows:
-                    try:
-                        if sub_win.isVisible() and sub_win.geometry().contains(global_pos):
-                            return True
-                    except (RuntimeError, AttributeError): pass
-            except (RuntimeError, AttributeError): pass
-        return False
-        
+        # Her fare hareketinde çağrılır: önbellekteki görünür pencere dikdörtgenlerine bakar
+        return self._geometry.hit(global_pos)
+
     def notify_canvas_click(self):
-        self._cleanup()
-        for window in list(self._windows.keys()):
-            try:
-                if hasattr(window, 'on_canvas_click'): window.on_canvas_click()
-            except (RuntimeError, AttributeError): pass
-    
+        for window, entry in self._live():
+            if entry.on_canvas_click: self._call(window, entry, window.on_canvas_click)
+
     def save_mode_state(self, plugin_id, mode, state):
         if plugin_id not in self._mode_states: self._mode_states[plugin_id] = {}
         self._mode_states[plugin_id][mode] = state
-    
+
     def load_mode_state(self, plugin_id, mode):
         if plugin_id in self._mode_states: return self._mode_states[plugin_id].get(mode)
         return None
-    
+
     def on_mode_changed(self, new_mode_is_whiteboard):
-        self._cleanup()
-        for window in list(self._windows.keys()):
-            try:
-                if hasattr(window, 'on_mode_changed'): window.on_mode_changed(new_mode_is_whiteboard)
-            except (RuntimeError, AttributeError): pass
-    
+        for window, entry in self._live():
+            if entry.on_mode_changed: self._call(window, entry, window.on_mode_changed, new_mode_is_whiteboard)
+
+    def _call(self, window, entry, callback, *args):
+        # Eklenti geri çağırmasındaki hata çizimi bozmasın; C++ nesnesi silinmişse kayıt düşürülür
+        try: callback(*args)
+        except (RuntimeError, AttributeError):
+            if sip.isdeleted(window): self._forget(entry)
+
     def apply_standard_flags(self, widget, accepts_focus=False):
         if accepts_focus:
             flags = (Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
@@ -98,17 +136,3 @@ class PluginWindowManager:
             flags = self.PLUGIN_WINDOW_FLAGS
         widget.setWindowFlags(flags)
         widget.setAttribute(Qt.WA_TranslucentBackground, True)
-    
-    def _cleanup(self):
-        to_remove = []
-        for window in list(self._windows.keys()):
-            try:
-                if window is None or not hasattr(window, "isVisible"):
-                    to_remove.append(window)
-                    continue
-                _ = window.isVisible()
-            except (RuntimeError, AttributeError):
-                to_remove.append(window)
-        
-        for window in to_remove:
-            if window in self._windows: del self._windows[window]
\ No newline at end of file
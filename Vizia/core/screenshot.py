@@ -1,37 +1,205 @@
 # core/screenshot.py
 
 import os
+import sys
 import datetime
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtGui import QImage, QImageWriter
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 
-class ScreenshotManager:
-    @staticmethod
-    def save_screenshot(crop_rect=None, save_folder=None):
-        try:
-            screen = QApplication.primaryScreen()
-            if not screen: return False
-            
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Biçim adı -> (Qt yazıcı biçimi, dosya uzantısı)
+FORMATS = {"png": ("png", ".png"), "webp": ("webp", ".webp"), "jpeg": ("jpeg", ".jpg")}
+ENCODE_THREADS = 2
+
+WDA_NONE = 0x00
+WDA_EXCLUDEFROMCAPTURE = 0x11  # Windows 10 2004+
+# Pencereleri yakalamadan gizleme sadece Windows'ta var; diğer platformlarda seçim bitince overlay
+# gizlenip sadece seçilen alan alınır (bkz. DrawingOverlay._finalize_screenshot)
+CAPTURE_EXCLUSION = sys.platform == "win32"
+
+
+def set_capture_excluded(windows, excluded):
+    """
+    Pencereleri ekran yakalamalarından gizler / geri açar (sadece Windows). Overlay görünür kalırken
+    temiz masaüstü alınabilir; destek yoksa False döner.
+    """
+    if not CAPTURE_EXCLUSION: return False
+    try:
+        import ctypes
+        affinity = WDA_EXCLUDEFROMCAPTURE if excluded else WDA_NONE
+        return all([bool(ctypes.windll.user32.SetWindowDisplayAffinity(int(w.winId()), affinity)) for w in windows])
+    except Exception:
+        return False
+
+
+def encoder_quality(fmt, png_compression=6, jpeg_quality=90):
+    """
+    QImageWriter kalite değeri: PNG'de kalite sıkıştırma seviyesine (0-9) çevrilir,
+    WebP'de 100 kayıpsız kodlama demektir.
+    """
+    if fmt == "png": return 100 - round(max(0, min(9, png_compression)) * 91 / 9)
+    if fmt == "webp": return 100
+    return max(1, min(100, jpeg_quality))
+
+
+if np is not None:
+    class ImageArray(np.ndarray):
+        """QImage belleğine kopyasız bakan dizi; görüntü, dizi (ve dilimleri) yaşadıkça silinmez"""
+        image = None
+
+
+def image_to_array(image, rgb=False):
+    """
+    QImage -> NumPy dizisi (NumPy yoksa None). Varsayılan (h, w, 4) BGRA ve kopyasızdır
+    (32 bit görüntülerde); rgb=True (h, w, 3) RGB verir, bunun için görüntü bir kez dönüştürülür.
+    Dizi salt okunurdur.
+    """
+    if np is None or image is None or image.isNull(): return None
+    if rgb: image = image.convertToFormat(QImage.Format_RGB888)
+    elif image.format() not in (QImage.Format_RGB32, QImage.Format_ARGB32, QImage.Format_ARGB32_Premultiplied):
+        image = image.convertToFormat(QImage.Format_ARGB32)
+    channels = 3 if rgb else 4
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    array = np.ndarray((image.height(), image.width(), channels), dtype=np.uint8, buffer=bits,
+                       strides=(image.bytesPerLine(), channels, 1)).view(ImageArray)
+    array.image = image
+    return array
+
+
+class _EncodeSignals(QObject):
+    saved = pyqtSignal(str)
+    failed = pyqtSignal(str, str)  # (yol, hata)
+
+
+class EncodeTask(QRunnable):
+    """QImage'ı iş parçacığı havuzunda kodlayıp diske yazar (QPixmap'in aksine QImage thread-safe)"""
+    def __init__(self, image, path, fmt, quality, signals):
+        super().__init__()
+        self.image = image
+        self.path = path
+        self.fmt = fmt
+        self.quality = quality
+        self.signals = signals
+
+    def run(self):
+        tmp = self.path + ".part"
+        writer = QImageWriter(tmp, FORMATS[self.fmt][0].encode())
+        writer.setQuality(self.quality)
+        image = self.image
+        if self.fmt == "jpeg" and image.hasAlphaChannel(): image = image.convertToFormat(QImage.Format_RGB32)
+        if writer.write(image):
+            try:
+                os.replace(tmp, self.path)
+                self.signals.saved.emit(self.path)
+                return
+            except OSError as e: error = str(e)
+        else: error = writer.errorString()
+        try: os.remove(tmp)
+        except OSError: pass
+        self.signals.failed.emit(self.path, error)
+
+
+class ScreenshotManager(QObject):
+    """
+    Ekran görüntüsü GUI thread'inde sadece alınır ve QImage'a çevrilir; kodlama ve diske yazma
+    havuzda yapılır. Sonuç saved(yol) / failed(yol, hata) ile bildirilir, art arda alınan
+    görüntüler çizimi bekletmez.
+    """
+    saved = pyqtSignal(str)
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(ENCODE_THREADS)
+        self._pending = set()  # kodlanmakta olan dosya yolları (aynı saniyedeki görüntüler çakışmasın)
+        self._signals = _EncodeSignals(self)
+        self._signals.saved.connect(self._on_saved)
+        self._signals.failed.connect(self._on_failed)
+        app = QApplication.instance()
+        if app is not None: app.aboutToQuit.connect(self.wait)
+
+    # --- BELLEKTE YAKALAMA (eklentiler de kullanır: overlay.screenshots.capture / capture_array) ---
+    def capture(self, crop_rect=None, screen=None, clipboard=False):
+        """
+        Ekranın (ya da crop_rect'in) görüntüsü QImage olarak; diske yazılmaz. clipboard=True panoya da kopyalar.
+        crop_rect ekranın mantıksal koordinatlarındadır; sadece o dikdörtgen alınır (DPR'ı Qt uygular), küçük
+        seçimlerde bellek seçimin boyutu kadardır. Görüntü yakalanan pixmap'ten bir kez dönüştürülür.
+        """
+        screen = screen or QApplication.primaryScreen()
+        if not screen: return None
+        if crop_rect and not crop_rect.isNull() and crop_rect.isValid() and crop_rect.width() > 0 and crop_rect.height() > 0:
+            pixmap = screen.grabWindow(0, crop_rect.x(), crop_rect.y(), crop_rect.width(), crop_rect.height())
+        else:
             pixmap = screen.grabWindow(0)
-            
-            if crop_rect and not crop_rect.isNull() and crop_rect.isValid():
-                if crop_rect.width() > 0 and crop_rect.height() > 0:
-                    pixmap = pixmap.copy(crop_rect)
-
-            # Kayıt yeri kontrolü
-            if not save_folder or not isinstance(save_folder, str) or not save_folder.strip():
-                save_folder = os.path.join(os.path.expanduser("~"), "Pictures", "Vizia Screenshots")
-                
-            if not os.path.exists(save_folder):
-                try: os.makedirs(save_folder)
-                except: save_folder = os.path.join(os.path.expanduser("~"), "Desktop") # Hata varsa masaüstüne dön
-
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            filename = f"Vizia_{timestamp}.png"
-            full_path = os.path.join(save_folder, filename)
-            
-            pixmap.save(full_path, "png")
-            return True
+        if pixmap.isNull(): return QImage()
+        image = pixmap.toImage()
+        if clipboard: QApplication.clipboard().setImage(image)
+        return image
+
+    def capture_clean(self, crop_rect=None, screen=None, windows=()):
+        """windows (overlay, toolbar...) görünmezmiş gibi masaüstü görüntüsü; platform desteklemiyorsa None"""
+        if not set_capture_excluded(windows, True):
+            set_capture_excluded(windows, False)
+            return None
+        try: return self.capture(crop_rect, screen)
+        finally: set_capture_excluded(windows, False)
+
+    def capture_array(self, crop_rect=None, screen=None, rgb=False, clipboard=False):
+        """capture + image_to_array; NumPy yoksa None"""
+        return image_to_array(self.capture(crop_rect, screen, clipboard), rgb)
+
+    def save_screenshot(self, crop_rect=None, save_folder=None, screen=None, fmt="png", png_compression=6, jpeg_quality=90, clipboard=False):
+        """Görüntüyü alıp kodlamayı kuyruğa ekler; yazılacak dosya yolunu (hata varsa None) döndürür"""
+        try:
+            image = self.capture(crop_rect, screen)
+            if image is None or image.isNull(): return None
+            return self.save_image(image, save_folder, fmt, png_compression, jpeg_quality, clipboard)
         except Exception as e:
             print(f"Screenshot Error: {e}")
-            return False
\ No newline at end of file
+            return None
+
+    def save_image(self, image, save_folder=None, fmt="png", png_compression=6, jpeg_quality=90, clipboard=False):
+        """Hazır bir görüntüyü (örn. overlay.export_annotated) kodlama kuyruğuna ekler"""
+        if clipboard: QApplication.clipboard().setImage(image)
+        if fmt not in FORMATS: fmt = "png"
+        if fmt == "webp" and b"webp" not in QImageWriter.supportedImageFormats(): fmt = "png"
+        path = self._new_path(save_folder, FORMATS[fmt][1])
+        self._pending.add(path)
+        self.pool.start(EncodeTask(image, path, fmt, encoder_quality(fmt, png_compression, jpeg_quality), self._signals))
+        return path
+
+    def _new_path(self, save_folder, ext):
+        # Kayıt yeri kontrolü
+        if not save_folder or not isinstance(save_folder, str) or not save_folder.strip():
+            save_folder = os.path.join(os.path.expanduser("~"), "Pictures", "Vizia Screenshots")
+
+        if not os.path.exists(save_folder):
+            try: os.makedirs(save_folder)
+            except: save_folder = os.path.join(os.path.expanduser("~"), "Desktop") # Hata varsa masaüstüne dön
+
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        full_path, n = os.path.join(save_folder, f"Vizia_{timestamp}{ext}"), 1
+        while full_path in self._pending or os.path.exists(full_path):
+            n += 1
+            full_path = os.path.join(save_folder, f"Vizia_{timestamp}_{n}{ext}")
+        return full_path
+
+    def _on_saved(self, path):
+        self._pending.discard(path)
+        self.saved.emit(path)
+
+    def _on_failed(self, path, error):
+        self._pending.discard(path)
+        print(f"Screenshot Error: {error}")
+        self.failed.emit(path, error)
+
+    def wait(self):
+        """Kuyruktaki kodlamaların bitmesini bekler (çıkışta yarım dosya kalmasın)"""
+        self.pool.waitForDone()
@@ -1,10 +1,11 @@
 # Vizia/core/settings.py
 
+import copy
 import json
 import os
-from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
-                             QLineEdit, QFileDialog, QTabWidget, QWidget, QFrame, QScrollArea, QCheckBox)
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QApplication, QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
+                             QLineEdit, QFileDialog, QTabWidget, QWidget, QFrame, QScrollArea, QCheckBox, QComboBox)
+from PyQt5.QtCore import Qt, QObject, QThread, QTimer, pyqtSignal
 from PyQt5.QtGui import QKeySequence
 
 SETTINGS_FILE = "vizia_settings.json"
@@ -14,10 +15,43 @@ DEFAULT_SETTINGS = {
     "save_path": os.path.join(os.path.expanduser("~"), "Pictures", "Vizia Screenshots"),
     "video_save_path": os.path.join(os.path.expanduser("~"), "Videos", "Vizia Recordings"),
     "keep_colors": True,
+    "checkpoint_interval": 25,
+    "checkpoint_memory_mb": 64,
+    "eraser_mode": "vector",
+    "stroke_simplify_tolerance": 1.25,
+    "session_path": os.path.join(os.path.expanduser("~"), "Documents", "Vizia", "last_session.vizia"),
+    "session_autosave": False,
+    "session_autosave_interval": 60,
+    "board_keep_neighbors": 1,
+    "board_pages_in_memory": 8,
+    "board_infinite_canvas": False,
+    "multi_monitor": False,
+    "pen_pressure": False,
+    "pressure_min_ratio": 0.25,
+    "input_coalescing": False,
+    "stroke_smoothing": False,
+    "smoothing_min_cutoff": 1.0,
+    "smoothing_beta": 0.05,
+    "low_latency_prediction": False,
+    "prediction_ms": 16,
+    "screenshot_format": "png",
+    "screenshot_content": "annotated",
+    "screenshot_png_compression": 6,
+    "screenshot_jpeg_quality": 90,
+    "screenshot_to_clipboard": False,
+    "plugin_warmup": True,
+    "plugin_warmup_order": ["lens", "geometry_studio", "recorder", "edit", "engine"],
+    "plugin_isolation": False,
     "hotkeys": {
         "board_mode": "Space",
         "drawer": "E",
         "undo": "Backspace",
+        "redo": "Ctrl+Y",
+        "save_session": "Ctrl+S",
+        "open_session": "Ctrl+O",
+        "next_page": "PgDown",
+        "prev_page": "PgUp",
+        "reset_view": "Ctrl+0",
         "clear": "D",
         "screenshot": "S",
         "move_mode": "V",
@@ -27,44 +61,136 @@ DEFAULT_SETTINGS = {
     "custom_colors": ["#2c2c2e"] * 10
 }
 
-class SettingsManager:
-    def __init__(self):
+def write_atomic(path, text):
+    """Geçici dosyaya yazıp yerine taşır; yazma yarıda kalırsa eski dosya bozulmaz"""
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except Exception:
+        try: os.remove(tmp)
+        except OSError: pass
+        raise
+
+
+class SettingsWriter(QThread):
+    """Ayar dosyasını arka planda (GUI thread'i bekletmeden) atomik olarak yazar"""
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, text):
+        super().__init__()
+        self.path = path
+        self.text = text
+
+    def run(self):
+        try: write_atomic(self.path, self.text)
+        except Exception as e: self.failed.emit(str(e))
+
+
+SCREENSHOT_FORMATS = {"png": "PNG", "webp": "WebP (kayıpsız)", "jpeg": "JPEG"}
+SCREENSHOT_CONTENTS = {"annotated": "Masaüstü + Çizim", "ink": "Sadece Çizim (şeffaf)"}
+
+
+class SettingsManager(QObject):
+    """
+    Ayarlar bellekte tutulur; set() sadece bellekteki değeri değiştirip kaydı zamanlar.
+    Art arda gelen değişiklikler SAVE_DELAY_MS içinde birleştirilip tek seferde arka planda yazılır,
+    çıkışta bekleyen kayıt hemen yazılır. Değişen her anahtar changed(key, value) ile duyurulur.
+    """
+    SAVE_DELAY_MS = 500
+    changed = pyqtSignal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._key_cache = {}  # action -> QKeySequence (hotkeys değişince temizlenir)
+        self._writer = None
+        self._dirty = False
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self._write_behind)
         self.settings = self.load_settings()
+        app = QApplication.instance()
+        if app is not None: app.aboutToQuit.connect(self.flush)
 
     def load_settings(self):
         if not os.path.exists(SETTINGS_FILE):
-            self.save_settings(DEFAULT_SETTINGS)
-            return DEFAULT_SETTINGS.copy()
+            data = copy.deepcopy(DEFAULT_SETTINGS)
+            self._write_now(data)
+            return data
         try:
             with open(SETTINGS_FILE, "r") as f:
                 data = json.load(f)
                 # Yeni eklenen ayarlar eski dosyada yoksa defaulttan çek
                 for k, v in DEFAULT_SETTINGS.items():
-                    if k not in data: data[k] = v
+                    if k not in data: data[k] = copy.deepcopy(v)
+                # Sonradan eklenen kısayollar (örn. redo) eski hotkeys sözlüğüne de eklenir
+                for action, key_str in DEFAULT_SETTINGS["hotkeys"].items():
+                    data["hotkeys"].setdefault(action, key_str)
                 return data
         except:
-            return DEFAULT_SETTINGS.copy()
+            return copy.deepcopy(DEFAULT_SETTINGS)
 
     def save_settings(self, data=None):
-        if data: self.settings = data
-        try:
-            with open(SETTINGS_FILE, "w") as f:
-                json.dump(self.settings, f, indent=4)
-        except Exception as e:
-            print(f"Ayarlar kaydedilemedi: {e}")
+        """data verilirse (ayarlar penceresi) tüm ayarlar değiştirilir; değişen anahtarlar duyurulur"""
+        changed = []
+        if data:
+            changed = [k for k in set(self.settings) | set(data) if self.settings.get(k) != data.get(k)]
+            self.settings = data
+            if "hotkeys" in changed: self._key_cache.clear()
+        self._schedule_save()
+        for key in changed: self.changed.emit(key, self.get(key))
 
     def get(self, key):
         return self.settings.get(key, DEFAULT_SETTINGS.get(key))
 
     def set(self, key, value):
+        # Listeler yerinde değiştirilip tekrar set edilebildiği için eşitlik kontrolü yapılmaz
         self.settings[key] = value
-        self.save_settings()
+        if key == "hotkeys": self._key_cache.clear()
+        self._schedule_save()
+        self.changed.emit(key, value)
+
+    def key_sequence(self, action_name):
+        """Eylemin kısayolu (önbellekten); atanmamışsa None"""
+        if action_name not in self._key_cache:
+            key_str = self.get("hotkeys").get(action_name, "")
+            self._key_cache[action_name] = QKeySequence(key_str) if key_str else None
+        return self._key_cache[action_name]
 
     def get_key_code(self, action_name):
-        key_str = self.settings["hotkeys"].get(action_name, "")
-        if not key_str: return None
-        seq = QKeySequence(key_str)
-        return seq[0] if seq.count() > 0 else None
+        seq = self.key_sequence(action_name)
+        return seq[0] if seq is not None and seq.count() > 0 else None
+
+    # --- KAYIT ---
+    def _schedule_save(self):
+        self._dirty = True
+        self._save_timer.start(self.SAVE_DELAY_MS)
+
+    def _write_behind(self):
+        if not self._dirty: return
+        if self._writer is not None and self._writer.isRunning():
+            # Önceki yazma bitmeden yenisi başlatılmaz; bir sonraki turda en güncel hali yazılır
+            self._save_timer.start(self.SAVE_DELAY_MS)
+            return
+        self._dirty = False
+        self._writer = SettingsWriter(os.path.abspath(SETTINGS_FILE), json.dumps(self.settings, indent=4))
+        self._writer.failed.connect(lambda e: print(f"Ayarlar kaydedilemedi: {e}"))
+        self._writer.start()
+
+    def flush(self):
+        """Bekleyen kaydı hemen (bu thread'de) yazar; çıkışta çağrılır"""
+        self._save_timer.stop()
+        if self._writer is not None: self._writer.wait()
+        if self._dirty:
+            self._dirty = False
+            self._write_now(self.settings)
+
+    def _write_now(self, data):
+        try: write_atomic(os.path.abspath(SETTINGS_FILE), json.dumps(data, indent=4))
+        except Exception as e: print(f"Ayarlar kaydedilemedi: {e}")
 
 # --- ARAYÜZ BİLEŞENLERİ (UI KODLARI AYNI KALDI) ---
 class KeybindButton(QPushButton):
@@ -103,6 +229,7 @@ class SettingsDialog(QDialog):
             QTabBar::tab:selected { background: #3a3a3c; color: white; border-bottom: 2px solid #007aff; }
             QLineEdit { background-color: #2c2c2e; border: 1px solid #3a3a3c; color: white; padding: 8px; border-radius: 6px; }
             QCheckBox { color: #ebebeb; spacing: 8px; }
+            QComboBox { background-color: #2c2c2e; border: 1px solid #3a3a3c; color: white; padding: 6px; border-radius: 6px; }
             QCheckBox::indicator { width: 18px; height: 18px; border: 1px solid #3a3a3c; border-radius: 4px; background: #2c2c2e; }
             QCheckBox::indicator:checked { background: #007aff; border-color: #007aff; }
         """)
@@ -154,6 +281,24 @@ class SettingsDialog(QDialog):
         path_box.addWidget(self.path_input)
         path_box.addWidget(btn_browse)
         layout.addLayout(path_box)
+
+        format_box = QHBoxLayout()
+        format_box.addWidget(QLabel("Görüntü Biçimi:"))
+        self.cmb_format = QComboBox()
+        for fmt, text in SCREENSHOT_FORMATS.items(): self.cmb_format.addItem(text, fmt)
+        self.cmb_format.setCurrentIndex(max(0, self.cmb_format.findData(self.temp_settings.get("screenshot_format", "png"))))
+        self.cmb_format.currentIndexChanged.connect(self.update_format)
+        format_box.addWidget(self.cmb_format)
+        layout.addLayout(format_box)
+
+        content_box = QHBoxLayout()
+        content_box.addWidget(QLabel("Görüntü İçeriği:"))
+        self.cmb_content = QComboBox()
+        for content, text in SCREENSHOT_CONTENTS.items(): self.cmb_content.addItem(text, content)
+        self.cmb_content.setCurrentIndex(max(0, self.cmb_content.findData(self.temp_settings.get("screenshot_content", "annotated"))))
+        self.cmb_content.currentIndexChanged.connect(self.update_content)
+        content_box.addWidget(self.cmb_content)
+        layout.addLayout(content_box)
         
         layout.addSpacing(20)
         
@@ -161,6 +306,26 @@ class SettingsDialog(QDialog):
         self.chk_keep_colors.setChecked(self.temp_settings.get("keep_colors", True))
         self.chk_keep_colors.stateChanged.connect(self.update_keep_colors)
         layout.addWidget(self.chk_keep_colors)
+
+        self.chk_clipboard = QCheckBox("Ekran Görüntüsünü Panoya da Kopyala")
+        self.chk_clipboard.setChecked(self.temp_settings.get("screenshot_to_clipboard", False))
+        self.chk_clipboard.stateChanged.connect(self.update_clipboard)
+        layout.addWidget(self.chk_clipboard)
+
+        self.chk_warmup = QCheckBox("Eklentileri Boştayken Önceden Hazırla")
+        self.chk_warmup.setChecked(self.temp_settings.get("plugin_warmup", True))
+        self.chk_warmup.stateChanged.connect(self.update_warmup)
+        layout.addWidget(self.chk_warmup)
+
+        self.chk_isolation = QCheckBox("Ağır Eklenti İşlerini Ayrı Süreçte Çalıştır (Yeniden başlatınca)")
+        self.chk_isolation.setChecked(self.temp_settings.get("plugin_isolation", False))
+        self.chk_isolation.stateChanged.connect(self.update_isolation)
+        layout.addWidget(self.chk_isolation)
+
+        self.chk_autosave = QCheckBox("Oturumu Arka Planda Otomatik Kaydet")
+        self.chk_autosave.setChecked(self.temp_settings.get("session_autosave", False))
+        self.chk_autosave.stateChanged.connect(self.update_autosave)
+        layout.addWidget(self.chk_autosave)
         
         layout.addStretch()
         info = QLabel("Vizia Pen v1.0\nModern Drawing Assistant")
@@ -173,7 +338,7 @@ class SettingsDialog(QDialog):
         scroll = QScrollArea(); scroll.setWidgetResizable(True); scroll.setStyleSheet("background: transparent; border: none;")
         content = QWidget(); form = QVBoxLayout(content); form.setSpacing(15)
         
-        labels = {"board_mode": "Beyaz Tahta", "drawer": "Ek Araçlar", "undo": "Geri Al", "clear": "Temizle", "screenshot": "Ekran Görüntüsü", "move_mode": "Taşıma Modu", "color_picker": "Renk Seçici", "quit": "Çıkış"}
+        labels = {"board_mode": "Beyaz Tahta", "drawer": "Ek Araçlar", "undo": "Geri Al", "redo": "Yinele", "save_session": "Oturumu Kaydet", "open_session": "Oturum Aç", "next_page": "Sonraki Sayfa", "prev_page": "Önceki Sayfa", "reset_view": "Görünümü Sıfırla", "clear": "Temizle", "screenshot": "Ekran Görüntüsü", "move_mode": "Taşıma Modu", "color_picker": "Renk Seçici", "quit": "Çıkış"}
         self.btn_map = {}
         for key, text in labels.items():
             row = QHBoxLayout()
@@ -192,6 +357,24 @@ class SettingsDialog(QDialog):
     def update_keep_colors(self, state):
         self.temp_settings["keep_colors"] = (state == Qt.Checked)
 
+    def update_format(self, index):
+        self.temp_settings["screenshot_format"] = self.cmb_format.itemData(index)
+
+    def update_content(self, index):
+        self.temp_settings["screenshot_content"] = self.cmb_content.itemData(index)
+
+    def update_clipboard(self, state):
+        self.temp_settings["screenshot_to_clipboard"] = (state == Qt.Checked)
+
+    def update_warmup(self, state):
+        self.temp_settings["plugin_warmup"] = (state == Qt.Checked)
+
+    def update_isolation(self, state):
+        self.temp_settings["plugin_isolation"] = (state == Qt.Checked)
+
+    def update_autosave(self, state):
+        self.temp_settings["session_autosave"] = (state == Qt.Checked)
+
     def keyPressEvent(self, event):
         if self.current_binding_btn:
             key = event.key()
@@ -217,6 +400,12 @@ class SettingsDialog(QDialog):
         
         self.path_input.setText(self.temp_settings["save_path"])
         self.chk_keep_colors.setChecked(self.temp_settings.get("keep_colors", True))
+        self.chk_autosave.setChecked(self.temp_settings.get("session_autosave", False))
+        self.cmb_format.setCurrentIndex(max(0, self.cmb_format.findData(self.temp_settings["screenshot_format"])))
+        self.chk_clipboard.setChecked(self.temp_settings.get("screenshot_to_clipboard", False))
+        self.chk_warmup.setChecked(self.temp_settings.get("plugin_warmup", True))
+        self.chk_isolation.setChecked(self.temp_settings.get("plugin_isolation", False))
+        self.cmb_content.setCurrentIndex(max(0, self.cmb_content.findData(self.temp_settings["screenshot_content"])))
         for key, btn in self.btn_map.items(): btn.setText(self.temp_settings["hotkeys"].get(key, ""))
 
     def save_and_close(self):
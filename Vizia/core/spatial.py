@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Spatial Index
+Çizgilerin ve ekrandaki pencerelerin dikdörtgenlerini düzgün bir ızgarada (uniform grid)
+tutar; "bu noktada / bu alanda ne var?" sorusu tüm listeyi gezmeden cevaplanır.
+"""
+
+import weakref
+import functools
+from PyQt5.QtCore import QObject, QEvent, QRect, QPoint
+
+
+class SpatialGrid:
+    """Anahtar -> QRect eşlemesi; her anahtar kestiği hücrelere kaydedilir"""
+
+    def __init__(self, cell_size=256):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._rects = {}
+
+    def __len__(self):
+        return len(self._rects)
+
+    def __contains__(self, key):
+        return key in self._rects
+
+    def _cells_for(self, rect):
+        cs = self.cell_size
+        return [(cx, cy)
+                for cy in range(rect.top() // cs, rect.bottom() // cs + 1)
+                for cx in range(rect.left() // cs, rect.right() // cs + 1)]
+
+    def rect(self, key):
+        return self._rects.get(key)
+
+    def insert(self, key, rect):
+        if key in self._rects: self.remove(key)
+        if rect is None or rect.isEmpty(): return
+        rect = QRect(rect)
+        self._rects[key] = rect
+        for cell in self._cells_for(rect):
+            self._cells.setdefault(cell, set()).add(key)
+
+    def update(self, key, rect):
+        if self._rects.get(key) == rect: return
+        self.insert(key, rect)
+
+    def remove(self, key):
+        rect = self._rects.pop(key, None)
+        if rect is None: return
+        for cell in self._cells_for(rect):
+            bucket = self._cells.get(cell)
+            if bucket is None: continue
+            bucket.discard(key)
+            if not bucket: del self._cells[cell]
+
+    def clear(self):
+        self._cells.clear()
+        self._rects.clear()
+
+    def query_rect(self, rect):
+        """rect ile kesişen anahtarlar"""
+        found = set()
+        for cell in self._cells_for(rect):
+            bucket = self._cells.get(cell)
+            if bucket: found.update(bucket)
+        return [key for key in found if self._rects[key].intersects(rect)]
+
+    def query_point(self, point):
+        """point'i içeren anahtarlar (tek hücreye bakılır)"""
+        cs = self.cell_size
+        bucket = self._cells.get((point.x() // cs, point.y() // cs))
+        if not bucket: return []
+        return [key for key in bucket if self._rects[key].contains(point)]
+
+
+class GeometryTracker(QObject):
+    """
+    Takip edilen pencerelerin global geometrisini SpatialGrid'de önbellekte tutar.
+    Move/Resize/Show/Hide olaylarıyla güncellenir, destroyed sinyaliyle kendiliğinden silinir;
+    böylece fare hareketi başına hiçbir Qt çağrısı yapmadan hit-test yapılabilir.
+    Pencereler zayıf referansla tutulur (index anahtarı id(pencere)); takip pencereyi yaşatmaz.
+    """
+    TRACKED_EVENTS = (QEvent.Move, QEvent.Resize, QEvent.Show, QEvent.Hide)
+
+    def __init__(self, parent=None, cell_size=256):
+        super().__init__(parent)
+        self.index = SpatialGrid(cell_size)
+        self._tracked = {}  # id -> weakref
+
+    def track(self, widget):
+        if widget is None or id(widget) in self._tracked: return
+        key = id(widget)
+        ref = weakref.ref(widget, lambda _, key=key: self._forget(key, ref))
+        self._tracked[key] = ref
+        widget.installEventFilter(self)
+        widget.destroyed.connect(functools.partial(self._forget, key, ref))
+        self.refresh(widget)
+
+    def untrack(self, widget):
+        ref = self._tracked.get(id(widget))
+        if ref is None: return
+        widget.removeEventFilter(self)
+        self._forget(id(widget), ref)
+
+    def _forget(self, key, ref, *_):
+        # Aynı id'yi sonradan alan başka bir pencere silinmesin
+        if self._tracked.get(key) is not ref: return
+        del self._tracked[key]
+        self.index.remove(key)
+
+    def refresh(self, widget):
+        if widget.isVisible():
+            self.index.update(id(widget), QRect(widget.mapToGlobal(QPoint(0, 0)), widget.size()))
+        else:
+            self.index.remove(id(widget))
+
+    def eventFilter(self, obj, event):
+        if event.type() in self.TRACKED_EVENTS and id(obj) in self._tracked:
+            if event.type() == QEvent.Hide: self.index.remove(id(obj))
+            else: self.refresh(obj)
+        return False
+
+    def visible(self, widget):
+        """Önbelleğe göre görünür mü (Qt çağrısı yapmaz)"""
+        return id(widget) in self.index
+
+    def hit(self, global_pos):
+        return bool(self.index.query_point(global_pos))
+
+    def widgets_at(self, global_pos):
+        widgets = (self._tracked[key]() for key in self.index.query_point(global_pos))
+        return [w for w in widgets if w is not None]
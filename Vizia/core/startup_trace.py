@@ -0,0 +1,183 @@
+"""
+Açılış izleyicisi
+VIZIA_TRACE_STARTUP ortam değişkeni ya da --trace-startup[=dosya] ile açılır. Açılış aşamalarının
+(QApplication, overlay, toolbar, eklentiler, ikonlar...) ve içe aktarılan her modülün süresini kaydeder.
+İlk olay döngüsü turunda rapor yazılır:
+  - <dosya>.json: Chrome Trace Event biçimi (chrome://tracing, Perfetto, speedscope açar) + özet
+  - <dosya>.folded: flamegraph.pl / speedscope için katlanmış yığınlar (mikrosaniye)
+Kapalıyken phase() hiçbir şey yapmaz; Qt'ye bağımlı değildir (QApplication'dan önce açılabilir).
+Her thread'in kendi yığını vardır (örn. eklenti ön yüklemesi); raporda ayrı thread (tid) olarak görünür.
+"""
+
+import os
+import sys
+import json
+import time
+import builtins
+import threading
+from contextlib import contextmanager
+
+ENV_VAR = "VIZIA_TRACE_STARTUP"
+CLI_FLAG = "--trace-startup"
+DEFAULT_REPORT = "vizia_startup_trace.json"
+TOP_IMPORTS = 30
+
+
+class StartupTracer:
+    def __init__(self):
+        self.enabled = False
+        self.report_path = None
+        self.spans = []     # [ad, kategori, başlangıç, bitiş, derinlik, yığın, thread kimliği]
+        self._local = threading.local()
+        self._main_thread = threading.get_ident()
+        self._t0 = None
+        self._original_import = None
+
+    def enable(self, report_path=None, trace_imports=True):
+        if self.enabled: return
+        self.enabled = True
+        self.report_path = os.path.abspath(report_path or DEFAULT_REPORT)
+        self._t0 = time.perf_counter()
+        if trace_imports: self._hook_imports()
+
+    def enable_from(self, argv, environ):
+        """--trace-startup[=dosya] ya da VIZIA_TRACE_STARTUP=1 / dosya; açıldıysa True"""
+        path = None
+        for arg in list(argv[1:]):
+            if arg == CLI_FLAG or arg.startswith(CLI_FLAG + "="):
+                path = arg.partition("=")[2] or DEFAULT_REPORT
+                argv.remove(arg)
+        value = environ.get(ENV_VAR, "")
+        if path is None and value and value != "0":
+            path = DEFAULT_REPORT if value == "1" else value
+        if path is not None: self.enable(path)
+        return self.enabled
+
+    # --- KAYIT ---
+    @property
+    def _stack(self):
+        """Çağıran thread'in açık span yığını"""
+        stack = getattr(self._local, "stack", None)
+        if stack is None: stack = self._local.stack = []
+        return stack
+
+    def _begin(self, name, category):
+        stack = self._stack
+        span = [name, category, time.perf_counter(), None, len(stack), tuple(s[0] for s in stack), threading.get_ident()]
+        stack.append(span)
+        return span
+
+    def _end(self, span):
+        span[3] = time.perf_counter()
+        stack = self._stack
+        if stack and stack[-1] is span: stack.pop()
+        elif span in stack: stack.remove(span)
+        self.spans.append(span)
+
+    @contextmanager
+    def _traced(self, name, category):
+        span = self._begin(name, category)
+        try: yield
+        finally: self._end(span)
+
+    @contextmanager
+    def _disabled(self):
+        yield
+
+    def phase(self, name, category="phase"):
+        """with tracer.phase("overlay"): ... ; iç içe kullanılabilir"""
+        return self._traced(name, category) if self.enabled else self._disabled()
+
+    def mark(self, name):
+        """Süresiz olay (örn. ilk kare)"""
+        if not self.enabled: return
+        now = time.perf_counter()
+        stack = self._stack
+        self.spans.append([name, "mark", now, now, len(stack), tuple(s[0] for s in stack), threading.get_ident()])
+
+    def _hook_imports(self):
+        original = self._original_import = builtins.__import__
+        tracer = self
+
+        def traced_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # Sadece ilk kez yüklenen (sys.modules'da olmayan) mutlak modüller ölçülür
+            if level or name in sys.modules: return original(name, globals, locals, fromlist, level)
+            span = tracer._begin(name, "import")
+            try: return original(name, globals, locals, fromlist, level)
+            finally: tracer._end(span)
+
+        builtins.__import__ = traced_import
+
+    def _unhook_imports(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    # --- RAPOR ---
+    def _thread_numbers(self):
+        """thread kimliği -> rapordaki tid (ana thread 0, diğerleri ilk görünme sırasıyla)"""
+        numbers = {self._main_thread: 0}
+        for s in sorted(self.spans, key=lambda s: s[2]):
+            numbers.setdefault(s[6], len(numbers))
+        return numbers
+
+    def report(self):
+        t0 = self._t0
+        tids = self._thread_numbers()
+        events = [{"name": name, "cat": cat, "ph": "i" if cat == "mark" else "X", "ts": (start - t0) * 1e6,
+                   "dur": (end - start) * 1e6, "pid": os.getpid(), "tid": tids[thread], "s": "g"}
+                  for name, cat, start, end, _, _, thread in sorted(self.spans, key=lambda s: s[2])]
+        for event in events:
+            if event["ph"] == "i": del event["dur"]
+            else: del event["s"]
+        phases = [{"name": name, "depth": depth, "start_ms": (start - t0) * 1000, "ms": (end - start) * 1000}
+                  for name, cat, start, end, depth, _, _ in sorted(self.spans, key=lambda s: s[2]) if cat != "import"]
+        imports = [s for s in self.spans if s[1] == "import"]
+        self_times = self._self_times(imports)
+        top = sorted(imports, key=lambda s: s[3] - s[2], reverse=True)[:TOP_IMPORTS]
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "total_ms": (max((s[3] for s in self.spans), default=t0) - t0) * 1000,
+            "phases": phases,
+            "imports": [{"module": s[0], "ms": (s[3] - s[2]) * 1000, "self_ms": self_times[id(s)] * 1000,
+                         "parent": s[5][-1] if s[5] else None, "tid": tids[s[6]]} for s in top],
+        }
+
+    def _self_times(self, spans):
+        """Her span'in kendi süresi (aynı thread'deki iç içe span'ler çıkarılmış)"""
+        own = {id(s): s[3] - s[2] for s in self.spans}
+        by_start = sorted(self.spans, key=lambda s: (s[2], -s[3]))
+        stacks = {}
+        for s in by_start:
+            stack = stacks.setdefault(s[6], [])
+            while stack and stack[-1][3] <= s[2]: stack.pop()
+            if stack: own[id(stack[-1])] -= s[3] - s[2]
+            stack.append(s)
+        return {id(s): own[id(s)] for s in spans}
+
+    def folded(self):
+        """flamegraph.pl biçimi: 'kök;alt;yaprak <mikrosaniye>' (kendi süresi)"""
+        own = self._self_times(self.spans)
+        tids = self._thread_numbers()
+        lines = {}
+        for s in self.spans:
+            if s[1] == "mark": continue
+            root = ("startup",) if tids[s[6]] == 0 else ("startup", f"thread-{tids[s[6]]}")
+            key = ";".join(root + s[5] + (s[0],))
+            lines[key] = lines.get(key, 0) + max(0, int(own[id(s)] * 1e6))
+        return "\n".join(f"{k} {v}" for k, v in lines.items() if v) + "\n"
+
+    def write(self):
+        """Raporu yazar ve import kancasını kaldırır (açılış bitti)"""
+        if not self.enabled: return None
+        self._unhook_imports()
+        data = self.report()
+        with open(self.report_path, "w") as f: json.dump(data, f, indent=1)
+        with open(os.path.splitext(self.report_path)[0] + ".folded", "w") as f: f.write(self.folded())
+        print(f"Açılış izi yazıldı: {self.report_path} ({data['total_ms']:.0f} ms)")
+        self.enabled = False
+        return self.report_path
+
+
+tracer = StartupTracer()
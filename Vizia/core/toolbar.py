@@ -1,6 +1,5 @@
 import sys
 import os
-import importlib.util 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QSlider, 
                              QLabel, QFrame, QApplication, QGraphicsOpacityEffect)
 from PyQt5.QtGui import QPixmap, QColor, QIcon, QKeySequence
@@ -9,6 +8,9 @@ from PyQt5.QtCore import Qt, QTimer, QSize, QPropertyAnimation, QEasingCurve, QP
 from ui.widgets.color_picker import ModernColorPicker
 from ui.styles import TOOLBAR_STYLESHEET, get_color_btn_style
 from core.settings import SettingsDialog
+from core.plugin_loader import discover_plugins
+from core.plugin_warmup import PluginWarmup
+from core.startup_trace import tracer
 
 def resource_path(relative_path):
     try:
@@ -17,6 +19,13 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+def load_icon(path):
+    with tracer.phase(f"icon:{os.path.basename(path)}", "icon"):
+        icon = QIcon(path)
+        # QIcon dosyayı ilk boyamada çözer; iz açıksa süre burada görünsün diye hemen çözülür
+        if tracer.enabled: icon.pixmap(QSize(24, 24))
+    return icon
+
 # --- EK ARAÇLAR (DRAWER) ---
 class ExtensionDrawer(QWidget):
     def __init__(self, parent_toolbar):
@@ -45,7 +54,12 @@ class ExtensionDrawer(QWidget):
         self.btn_folder = self.create_drawer_btn("add-folder.png", "Görsel Yükle", self.action_load_image)
         self.layout.addWidget(self.btn_folder)
         
-        self.load_plugins()
+        self.plugins = []
+        with tracer.phase("extension_drawer.plugins"):
+            self.load_plugins()
+        # Ağır eklentiler overlay boşa çıkınca sırayla hazırlanır
+        self.warmup = PluginWarmup(parent_toolbar.overlay, self.plugins, self)
+        self.warmup.start()
         self.layout.addStretch()
         
         self.anim = QPropertyAnimation(self, b"size")
@@ -60,7 +74,7 @@ class ExtensionDrawer(QWidget):
             final_path = resource_path(f"Vizia/Assets/{icon_path_or_name}")
 
         if os.path.exists(final_path):
-            btn.setIcon(QIcon(final_path))
+            btn.setIcon(load_icon(final_path))
             btn.setIconSize(QSize(24, 24))
         else:
             text = tooltip[0] if tooltip else "?"
@@ -87,29 +101,16 @@ class ExtensionDrawer(QWidget):
             print(f"Plugins klasörü bulunamadı: {plugins_dir}")
             return
 
-        for folder_name in os.listdir(plugins_dir):
-            plugin_path = os.path.join(plugins_dir, folder_name)
-            plugin_file = os.path.join(plugin_path, "plugin.py")
-
-            if os.path.isdir(plugin_path) and os.path.exists(plugin_file):
-                try:
-                    spec = importlib.util.spec_from_file_location(f"plugins.{folder_name}", plugin_file)
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-
-                    if hasattr(module, "ViziaPlugin"):
-                        plugin_instance = module.ViziaPlugin()
-                        full_icon_path = os.path.join(plugin_path, plugin_instance.icon)
-                        btn = self.create_drawer_btn(
-                            full_icon_path, 
-                            plugin_instance.name, 
-                            lambda p=plugin_instance: p.run(self.toolbar_ref.overlay)
-                        )
-                        self.layout.addWidget(btn)
-                        print(f"Eklenti Yüklendi: {plugin_instance.name}")
-                        
-                except Exception as e:
-                    print(f"Eklenti Yükleme Hatası ({folder_name}): {e}")
+        # Sadece manifestler okunur; eklenti modülü ilk tıklamada içe aktarılır
+        overlay = self.toolbar_ref.overlay
+        self.plugins = discover_plugins(plugins_dir, overlay)
+        for plugin in self.plugins:
+            manifest = plugin.manifest
+            btn = self.create_drawer_btn(manifest.icon_path, manifest.name, plugin.run)
+            self.layout.addWidget(btn)
+            for method, key in manifest.hotkeys.items():
+                overlay.register_hotkey(f"{manifest.id}.{method}", lambda p=plugin, m=method: p.call(m), default=key, owner=plugin)
+            print(f"Eklenti Yüklendi: {manifest.name}" if plugin.loaded else f"Eklenti Bulundu: {manifest.name}")
 
     def action_load_image(self):
         if hasattr(self.toolbar_ref, 'overlay'): self.toolbar_ref.overlay.open_image_loader()
@@ -160,8 +161,10 @@ class ModernToolbar(QWidget):
         
         self.setAttribute(Qt.WA_AlwaysShowToolTips, True)
         
-        self.drawer = ExtensionDrawer(self)
-        self.initUI()
+        with tracer.phase("extension_drawer"):
+            self.drawer = ExtensionDrawer(self)
+        with tracer.phase("toolbar.init_ui"):
+            self.initUI()
 
     def initUI(self):
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
@@ -179,7 +182,7 @@ class ModernToolbar(QWidget):
         logo_label.setAlignment(Qt.AlignCenter); layout.addWidget(logo_label); layout.addSpacing(5)
 
         self.btn_draw = self.create_btn("pencil.png", lambda: self.safe_change("pen", self.btn_draw), "Kalem"); layout.addWidget(self.btn_draw, 0, Qt.AlignCenter)
-        self.btn_eraser = self.create_btn("eraser.png", lambda: self.safe_change("eraser", self.btn_eraser), "Silgi"); layout.addWidget(self.btn_eraser, 0, Qt.AlignCenter)
+        self.btn_eraser = self.create_btn("eraser.png", self.on_eraser_clicked, "Silgi (Tekrar tıkla: Vektör / Nesne / Piksel)"); layout.addWidget(self.btn_eraser, 0, Qt.AlignCenter)
         self.btn_text = self.create_btn("size.png", self.overlay.add_text, "Metin Ekle"); layout.addWidget(self.btn_text, 0, Qt.AlignCenter)
         self.btn_board = self.create_btn("blackboard.png", self.toggle_board, "Beyaz Tahta / Masaüstü"); self.btn_board.setProperty("state", "red"); layout.addWidget(self.btn_board, 0, Qt.AlignCenter)
         self.btn_move = self.create_btn("mouse.png", lambda: self.safe_change("move", self.btn_move), "Taşıma Modu"); layout.addWidget(self.btn_move, 0, Qt.AlignCenter)
@@ -225,7 +228,7 @@ class ModernToolbar(QWidget):
     def create_btn(self, icon_file, slot, tooltip_text=""):
         btn = QPushButton()
         icon_path = resource_path(f"Vizia/Assets/{icon_file}")
-        if os.path.exists(icon_path): btn.setIcon(QIcon(icon_path)); btn.setIconSize(QSize(24, 24)) 
+        if os.path.exists(icon_path): btn.setIcon(load_icon(icon_path)); btn.setIconSize(QSize(24, 24)) 
         else: btn.setText(tooltip_text[0] if tooltip_text else "?")
         btn.clicked.connect(slot)
         btn.setFocusPolicy(Qt.NoFocus) # Güvence
@@ -237,7 +240,9 @@ class ModernToolbar(QWidget):
     def show_about(self): from ui.dialogs import AboutDialog; AboutDialog(self).exec_()
     def show_settings(self):
         dlg = SettingsDialog(self, self.overlay.settings)
-        if dlg.exec_(): self.custom_colors = self.overlay.settings.get("custom_colors")
+        if dlg.exec_():
+            self.custom_colors = self.overlay.settings.get("custom_colors")
+            self.overlay.session.apply_settings()
         QTimer.singleShot(10, self.overlay.force_focus)
     def select_color(self):
         picker = ModernColorPicker(self.overlay.current_color, self.custom_colors, self.overlay.settings, self)
@@ -254,9 +259,14 @@ class ModernToolbar(QWidget):
         self.btn_board.repaint() 
         QApplication.processEvents()
         
-        self.overlay.redraw_canvas()
+        # Katmanların karoları kalıcı; mod değişince sadece ekran güncellenir (whiteboard_mode setter'ında)
         QTimer.singleShot(10, self.overlay.force_focus)
         
+    def on_eraser_clicked(self):
+        # Silgi zaten seçiliyse tekrar tıklamak silgi modunu değiştirir
+        if self.overlay.drawing_mode == "eraser": self.overlay.cycle_eraser_mode(); QTimer.singleShot(10, self.overlay.force_focus)
+        else: self.safe_change("eraser", self.btn_eraser)
+
     def toggle_move_mode(self):
         if self.overlay.drawing_mode != "move": 
             self.last_active_tool = self.overlay.drawing_mode
@@ -281,6 +291,7 @@ class ModernToolbar(QWidget):
         
         self.overlay.setWindowFlag(Qt.WindowTransparentForInput, mode == "move")
         self.overlay.show()
+        self.overlay.surfaces.set_transparent_for_input(mode == "move")
         QTimer.singleShot(10, self.overlay.force_focus)
         
     def mousePressEvent(self, event):
@@ -1,7 +1,13 @@
 import sys
 import os
 import traceback
-from PyQt5.QtCore import QCoreApplication, Qt
+import multiprocessing
+
+# Açılış izi (VIZIA_TRACE_STARTUP=1 ya da --trace-startup[=dosya]); import'lardan önce açılmalı
+from core.startup_trace import tracer
+tracer.enable_from(sys.argv, os.environ)
+
+from PyQt5.QtCore import QCoreApplication, Qt, QTimer
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtGui import QIcon
 
@@ -20,23 +26,27 @@ def exception_hook(exctype, value, tb):
     msg.setWindowTitle("Vizia Pen Hatası")
     msg.exec_()
 
-sys.excepthook = exception_hook
-
 # Yüksek DPI ve OpenGL ayarları
 QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
 QCoreApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
 QCoreApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    # Eklenti süreçleri (spawn) bu modülü __main__ olmadan içe aktarır; hata penceresi sadece ana süreçte kurulur
+    multiprocessing.freeze_support()
+    sys.excepthook = exception_hook
+
+    with tracer.phase("qapplication"):
+        app = QApplication(sys.argv)
 
     # Çalışma dizinini ayarla
     current_dir = os.path.dirname(os.path.abspath(__file__))
     if current_dir not in sys.path:
         sys.path.insert(0, current_dir)
 
-    from core.overlay import DrawingOverlay
-    from core.toolbar import ModernToolbar
+    with tracer.phase("core_imports"):
+        from core.overlay import DrawingOverlay
+        from core.toolbar import ModernToolbar
 
     def resource_path(relative_path):
         try:
@@ -47,15 +57,21 @@ if __name__ == "__main__":
 
     # İkon yükle
     icon_path = resource_path("Assets/VIZIA.ico")
-    if os.path.exists(icon_path):
-        app.setWindowIcon(QIcon(icon_path))
+    with tracer.phase("app_icon"):
+        if os.path.exists(icon_path):
+            app.setWindowIcon(QIcon(icon_path))
 
     # Ana pencereleri başlat
-    overlay = DrawingOverlay() 
-    toolbar = ModernToolbar(overlay)
+    with tracer.phase("overlay"):
+        overlay = DrawingOverlay() 
+    with tracer.phase("toolbar"):
+        toolbar = ModernToolbar(overlay)
 
     overlay.toolbar = toolbar
-    toolbar.show()
+    with tracer.phase("show"):
+        toolbar.show()
+    # Rapor ilk olay döngüsü turunda (pencereler gösterildikten sonra) yazılır
+    if tracer.enabled: QTimer.singleShot(0, tracer.write)
 
     print("Vizia Pen başlatıldı (Güvenli Mod)...")
     sys.exit(app.exec_())
\ No newline at end of file
@@ -15,13 +15,7 @@ class ViziaPlugin:
     def __init__(self):
         self.editor = None
     
-    def run(self, overlay):
-        """
-        Plugin çalıştırıldığında
-        Args:
-            overlay: Vizia-Pen overlay instance
-        """
-
+    def _import_app(self):
         # plugin klasörünü path'e ekle
         plugin_root = os.path.dirname(os.path.abspath(__file__))
         if plugin_root not in sys.path:
@@ -29,6 +23,19 @@ class ViziaPlugin:
 
         # artık src bulunabilir
         from src.app import ViziaEditApp
+        return ViziaEditApp
+
+    def warmup_background(self):
+        """Ön ısıtma: editör modülleri arka plan thread'inde içe aktarılır"""
+        self._import_app()
+    
+    def run(self, overlay):
+        """
+        Plugin çalıştırıldığında
+        Args:
+            overlay: Vizia-Pen overlay instance
+        """
+        ViziaEditApp = self._import_app()
         
         self.editor = ViziaEditApp(overlay)
         self.editor.show()
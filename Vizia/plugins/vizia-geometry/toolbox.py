@@ -164,6 +164,7 @@ class GeometryToolbox(QWidget):
 
         self._init_ui()
         self._register_drop_handler()
+        self._register_session_codec()
         
         shadow = QGraphicsDropShadowEffect(self.content_frame)
         shadow.setBlurRadius(24); shadow.setOffset(0, 4); shadow.setColor(QColor(0,0,0,120))
@@ -278,6 +279,43 @@ class GeometryToolbox(QWidget):
         if hasattr(self.main_overlay, 'drop_handlers'):
             self.main_overlay.drop_handlers.append(self.handle_drop_event)
 
+    def _register_session_codec(self):
+        # Şekiller oturum dosyasına kaydedilsin; bekleyen (eklenti yüklenmeden açılmış) şekiller de burada geri gelir
+        session = getattr(self.main_overlay, 'session', None)
+        if session: session.register_widget_codec('geometry_shape', self.save_shape_state, self.load_shape_state)
+
+    def save_shape_state(self, shape):
+        state = {
+            "shape_type": shape.shape_type, "x": shape.x(), "y": shape.y(), "w": shape.width(), "h": shape.height(),
+            "color": shape.primary_color.rgba(), "opacity": shape.opacity_val, "rotation": shape.rotation_angle,
+            "filled": shape.filled, "text": shape.text, "flipped": shape.is_flipped, "stroke_width": shape.stroke_width,
+        }
+        if shape.shape_type == "line":
+            state["line"] = [shape.line_p1.x(), shape.line_p1.y(), shape.line_p2.x(), shape.line_p2.y()]
+        else:
+            state["logical"] = [shape._logical_rect.width(), shape._logical_rect.height()]
+        return state, None
+
+    def load_shape_state(self, overlay, layer, state, data):
+        shape = GeometryShape(overlay, state["shape_type"], QColor.fromRgba(state["color"]))
+        shape.opacity_val = state["opacity"]
+        shape.rotation_angle = state["rotation"]
+        shape.filled = state["filled"]
+        shape.text = state["text"]
+        shape.is_flipped = state["flipped"]
+        shape.stroke_width = state["stroke_width"]
+        if shape.shape_type == "line":
+            x1, y1, x2, y2 = state["line"]
+            shape.line_p1, shape.line_p2 = QPointF(x1, y1), QPointF(x2, y2)
+        else:
+            shape._logical_rect = QRectF(0, 0, *state["logical"])
+        shape.setGeometry(state["x"], state["y"], state["w"], state["h"])
+
+        shape.destroyed.connect(lambda: self._on_shape_destroyed(shape))
+        shape.clicked.connect(self._on_shape_clicked)
+        shape.rotation_changed.connect(self._on_shape_rotated_from_canvas)
+        return shape
+
     def handle_drop_event(self, mime, pos, check_only=False):
         if mime.hasFormat(SHAPE_MIME_TYPE):
             if check_only: return True
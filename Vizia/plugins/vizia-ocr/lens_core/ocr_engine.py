@@ -2,6 +2,23 @@ import os
 import pytesseract
 from PIL import Image
 
+def qimage_to_pil(image):
+    """
+    QImage -> PIL görüntüsü; PNG kodlama / diske yazma olmadan, QImage belleğine kopyasız bakar.
+    PIL görüntüsü QImage'ı yaşatır (qimage özelliği); görüntü salt okunurdur.
+    """
+    from PyQt5.QtGui import QImage
+    # PIL sadece bayt sırası birebir aynı olan modlarda belleği paylaşır (32 bit QImage bellekte BGRA'dır)
+    if image.format() != QImage.Format_RGBA8888:
+        image = image.convertToFormat(QImage.Format_RGBA8888)
+    bits = image.constBits()  # bits() paylaşılan veriyi ayırmak için kopyalayabilir
+    bits.setsize(image.sizeInBytes())
+    # Satır sonu dolgusu bytesPerLine ile atlanır
+    pil = Image.frombuffer("RGBA", (image.width(), image.height()), memoryview(bits), "raw", "RGBA", image.bytesPerLine(), 1)
+    pil.qimage = image
+    return pil
+
+
 class ViziaOCREngine:
     def __init__(self):
         self.plugin_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -22,9 +39,11 @@ class ViziaOCREngine:
         else:
             print("[Vizia Lens] Kritik Hata: Tesseract taşınabilir motoru bulunamadı!")
 
-    def extract_text(self, image_path, lang="eng"):
+    def extract_text(self, image, lang="eng"):
+        """image: dosya yolu, PIL görüntüsü ya da QImage (bellekten, diske yazılmadan okunur)"""
         try:
-            image = Image.open(image_path)
+            if isinstance(image, str): image = Image.open(image)
+            elif hasattr(image, 'constBits'): image = qimage_to_pil(image)
             text = pytesseract.image_to_string(image, lang=lang)
             return text.strip()
         except Exception as e:
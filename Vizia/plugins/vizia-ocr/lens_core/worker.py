@@ -0,0 +1,28 @@
+from PIL import Image
+from lens_core.ocr_engine import ViziaOCREngine
+from lens_core.translator import ViziaTranslator
+
+
+class LensWorker:
+    """Ayrı eklenti sürecinde OCR, çeviri ve belge çevirisi (manifest "worker")"""
+    def __init__(self, context):
+        self.context = context
+        self.ocr_engine = ViziaOCREngine()
+        self.translator = ViziaTranslator()
+
+    def extract_text(self, frame_name, lang="eng"):
+        # Görüntü paylaşımlı bellekten okunur: 32 bit BGRA satırlar
+        self.context.release_frames(keep=(frame_name,))
+        frame = self.context.frame(frame_name).read()
+        if frame is None: raise RuntimeError("Paylaşımlı görüntü okunamadı")
+        data, width, height, stride, _ = frame
+        image = Image.frombuffer("RGBA", (width, height), data, "raw", "BGRA", stride, 1)
+        return self.ocr_engine.extract_text(image, lang=lang)
+
+    def translate(self, text, source="auto", target="tr"):
+        return self.translator.translate(text, source=source, target=target)
+
+    def translate_document(self, file_path, target_format, target_lang, include_images):
+        from workflow.orchestrator import run_workflow
+        return run_workflow(file_path, target_format, target_lang, include_images, self.translator,
+                            lambda pct, msg: self.context.emit("progress", (pct, msg)))
@@ -218,7 +218,8 @@ class ViziaLensPanel(QWidget):
         inc_images = self.chk_images.isChecked()
 
         # Arka plan işçisini (Orkestratör) ateşle
-        self.worker = ViziaWorkflowOrchestrator(self.selected_file, t_fmt, t_lang, inc_images, self.plugin.translator)
+        self.worker = ViziaWorkflowOrchestrator(self.selected_file, t_fmt, t_lang, inc_images, self.plugin.translator,
+                                                getattr(self.plugin, 'process', None))
         self.worker.progress.connect(self.update_wf_progress)
         self.worker.finished.connect(self.wf_finished)
         self.worker.start()
@@ -1,9 +1,8 @@
 import sys
 import os
-import tempfile
 from PyQt5.QtCore import QObject, QEvent, Qt, QPoint
 from PyQt5.QtWidgets import QPushButton
-from PyQt5.QtGui import QCursor
+from PyQt5.QtGui import QCursor, QImage
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
@@ -15,6 +14,17 @@ from lens_core.ocr_engine import ViziaOCREngine
 from lens_core.translator import ViziaTranslator
 from lens_core.config import load_config, save_config
 
+class RemoteTranslator:
+    """ViziaTranslator ile aynı arayüz; çeviri eklenti sürecinde yapılır (QThread'lerden çağrılır)"""
+    def __init__(self, process):
+        self.process = process
+
+    def translate(self, text, source='auto', target='tr'):
+        try: return self.process.call_sync("translate", text, source, target)
+        except Exception as e:
+            print(f"Çeviri Hatası: {e}")
+            return "Çeviri yapılamadı."
+
 class ViziaPlugin(QObject):
     def __init__(self):
         super().__init__()
@@ -29,10 +39,16 @@ class ViziaPlugin(QObject):
         
         self.ocr_engine = ViziaOCREngine()
         self.translator = ViziaTranslator()
+        self.process = None
         
         self.config = load_config()
         self.quick_scan_enabled = self.config.get("quick_scan", False)
 
+    def attach_process(self, process):
+        # OCR ve çeviriler ayrı süreçte yapılır; paneller burada kalır
+        self.process = process
+        self.translator = RemoteTranslator(process)
+
     def run(self, overlay):
         self.current_overlay = overlay
         self._hook_right_click(overlay)
@@ -120,14 +136,29 @@ class ViziaPlugin(QObject):
             self._process_ocr_image(crop_rect)
 
     def _process_ocr_image(self, crop_rect):
-        from PyQt5.QtWidgets import QApplication
-        pixmap = QApplication.primaryScreen().grabWindow(0).copy(crop_rect)
-        
-        temp_path = os.path.join(tempfile.gettempdir(), "vizia_ocr_temp.png")
-        pixmap.save(temp_path, "png")
-        
-        text = self.ocr_engine.extract_text(temp_path, lang="tur+eng")
+        # Görüntü bellekte alınır ve doğrudan OCR'a verilir (geçici PNG yazılmaz)
+        screenshots = getattr(self.current_overlay, 'screenshots', None)
+        if screenshots is not None:
+            image = screenshots.capture(crop_rect)
+        else:
+            from PyQt5.QtWidgets import QApplication
+            image = QApplication.primaryScreen().grabWindow(0, crop_rect.x(), crop_rect.y(), crop_rect.width(), crop_rect.height()).toImage()
         
+        if self.process is not None:
+            # Görüntü paylaşımlı belleğe kopyalanır; sonuç gelene kadar kalem beklemez
+            if image.format() not in (QImage.Format_RGB32, QImage.Format_ARGB32):
+                image = image.convertToFormat(QImage.Format_ARGB32)
+            bits = image.constBits()
+            bits.setsize(image.sizeInBytes())
+            frame = self.process.frame("ocr", image.sizeInBytes())
+            frame.write(bits, image.width(), image.height(), image.bytesPerLine(), 4)
+            self.process.call("extract_text", frame.name, "tur+eng",
+                              callback=lambda text: self._show_ocr_result(text, crop_rect),
+                              error=lambda e: self.current_overlay.show_toast("OCR süreci hatası!"))
+            return
+        self._show_ocr_result(self.ocr_engine.extract_text(image, lang="tur+eng"), crop_rect)
+
+    def _show_ocr_result(self, text, crop_rect):
         if text.strip():
             self.result_widget = LensResultWidget(text, crop_rect, self)
             
@@ -3,17 +3,12 @@
 import threading
 import time
 import os
-import ctypes
 import numpy as np
 import cv2
 from PyQt5.QtCore import QObject, pyqtSignal, QThread, QMutex
 from PyQt5.QtGui import QImage
 
-# Fallback: mss (C++ çalışmazsa devreye girecek)
-try:
-    import mss
-except ImportError:
-    mss = None
+from record_loop import RecordSession, load_cpp_library
 
 class CameraThread(QThread):
     # Preview Image (QImage) ve Kayıt Frame'i (Raw BGR)
@@ -24,6 +19,7 @@ class CameraThread(QThread):
         self.cap = None
         self.running = False
         self.mutex = QMutex()
+        self.shared = None  # Kayıt ayrı süreçteyse kareler bu thread'de doğrudan bu SharedFrame'e yazılır
 
     def run(self):
         try:
@@ -50,6 +46,10 @@ class CameraThread(QThread):
                 ret, frame = self.cap.read()
                 if ret and frame is not None and frame.size > 0:
                     try:
+                        shared = self.shared
+                        if shared is not None and frame.nbytes <= shared.capacity:
+                            frame = np.ascontiguousarray(frame)
+                            shared.write(frame, frame.shape[1], frame.shape[0], frame.strides[0], frame.shape[2])
                         frame_bgr = frame.copy()
                         frame_rgba = cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA)
                         h, w, ch = frame_rgba.shape
@@ -72,16 +72,16 @@ class CameraThread(QThread):
 
 class CppEngineWrapper(QObject):
     preview_signal = pyqtSignal(QImage)
+    recording_failed = pyqtSignal(str)   # kayıt kullanıcı durdurmadan bitti (örn. kayıt süreci çöktü)
     
     def __init__(self):
         super().__init__()
         self.is_recording = False
-        self.stop_event = threading.Event()
-        self.pause_event = threading.Event()
-        self.pause_event.set() 
+        self.session = None       # süreç içi kayıt
+        self.process = None       # ayrı süreçte kayıt (attach_process)
+        self._camera_frame_name = None
         
         self.dll = None
-        self.cap_obj = None
         self.mode = "PYTHON"
         
         self.camera_thread = None
@@ -92,26 +92,8 @@ class CppEngineWrapper(QObject):
         self._load_cpp_engine()
 
     def _load_cpp_engine(self):
-        try:
-            base_path = os.path.dirname(os.path.abspath(__file__))
-            cpp_dir = os.path.join(base_path, "..", "cpp_engine")
-            build_dir = os.path.join(cpp_dir, "build")
-            dll_path = os.path.join(build_dir, "recorder.dll")
-            
-            if dll_path and os.path.exists(dll_path):
-                self.dll = ctypes.CDLL(dll_path)
-                self.dll.init_engine.argtypes = [ctypes.c_int, ctypes.c_int]
-                self.dll.init_engine.restype = ctypes.c_void_p
-                self.dll.grab_frame.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ubyte), ctypes.c_size_t]
-                self.dll.grab_frame.restype = ctypes.c_bool
-                self.dll.release_engine.argtypes = [ctypes.c_void_p]
-                self.mode = "CPP"
-                print(f"[INFO] C++ Motoru Yüklendi: {dll_path}")
-            else:
-                self.mode = "PYTHON"
-        except Exception as e:
-            print(f"[ERROR] C++ Yükleme Hatası: {e}")
-            self.mode = "PYTHON"
+        self.dll = load_cpp_library()
+        self.mode = "CPP" if self.dll is not None else "PYTHON"
 
     def update_camera_config(self, active, geometry_rect):
         self.mutex_cam.lock()
@@ -120,6 +102,8 @@ class CppEngineWrapper(QObject):
         else:
             self.cam_geometry = None
         self.mutex_cam.unlock()
+        if self.process is not None and self.is_recording and self._camera_frame_name:
+            self.process.call("set_camera", self._camera_frame_name, self.cam_geometry)
 
         if active: self.start_camera_preview()
         else: self.stop_camera_preview()
@@ -140,134 +124,69 @@ class CppEngineWrapper(QObject):
         self.mutex_cam.lock()
         self.last_cam_frame_bgr = raw_frame_bgr
         self.mutex_cam.unlock()
+        if self.process is not None and self.is_recording:
+            # Tampon hazırsa kare kamera thread'inde yazıldı; GUI thread'i sadece ilk karede / tampon büyürken yazar
+            shared = self.camera_thread.shared if self.camera_thread is not None else None
+            if shared is None or raw_frame_bgr.nbytes > shared.capacity: self._send_camera(raw_frame_bgr)
+
+    def attach_process(self, process):
+        """Kayıt ayrı süreçte yapılır (bkz. record_worker.py); kamera kareleri paylaşımlı bellekle gider"""
+        self.process = process
+        process.crashed.connect(self._on_process_crashed)
+
+    def _on_process_crashed(self, plugin_id):
+        if self.is_recording:
+            print("[REC] Kayıt süreci kapandı, kayıt durdu.")
+            self.is_recording = False
+            self._detach_camera()
+            self.recording_failed.emit("Kayıt süreci beklenmedik şekilde kapandı")
+
+    def _camera_source(self):
+        self.mutex_cam.lock()
+        frame, geo = self.last_cam_frame_bgr, self.cam_geometry
+        self.mutex_cam.unlock()
+        return frame, geo
+
+    def _send_camera(self, frame):
+        # Kare paylaşımlı tampona yazılır; tampon değişirse (büyüdüyse) adı kayıt sürecine bildirilir.
+        # Sonraki kareleri kamera thread'i yazar
+        frame = np.ascontiguousarray(frame)
+        if self.camera_thread is not None: self.camera_thread.shared = None
+        shared = self.process.frame("camera", frame.nbytes)
+        shared.write(frame, frame.shape[1], frame.shape[0], frame.strides[0], frame.shape[2])
+        if shared.name != self._camera_frame_name:
+            self._camera_frame_name = shared.name
+            self.process.call("set_camera", shared.name, self.cam_geometry)
+        if self.camera_thread is not None: self.camera_thread.shared = shared
+
+    def _detach_camera(self):
+        self._camera_frame_name = None
+        if self.camera_thread is not None: self.camera_thread.shared = None
 
     def pause(self):
-        self.pause_event.clear()
+        if self.process is not None: self.process.call("pause")
+        elif self.session: self.session.pause()
         
     def resume(self):
-        self.pause_event.set()
-
-    # [GÜNCELLENDİ] Kayıt Döngüsü - Sabit FPS Mantığı
-    def _record_loop(self, filename, target_fps):
-        # Ekran Çözünürlüğü
-        if os.name == 'nt':
-            user32 = ctypes.windll.user32
-            width = user32.GetSystemMetrics(0)
-            height = user32.GetSystemMetrics(1)
-        else:
-            width, height = 1920, 1080 
-
-        if not filename.endswith(".mp4"):
-            filename = os.path.splitext(filename)[0] + ".mp4"
-            
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(filename, fourcc, target_fps, (width, height))
-        
-        # --- INIT ---
-        c_buffer = None
-        c_pointer = None
-        frame_size = width * height * 4 # BGRA
-        
-        if self.mode == "CPP":
-            try:
-                c_buffer = (ctypes.c_ubyte * frame_size)()
-                c_pointer = ctypes.cast(c_buffer, ctypes.POINTER(ctypes.c_ubyte))
-                self.cap_obj = self.dll.init_engine(width, height)
-                if not self.cap_obj: self.mode = "PYTHON"
-            except: self.mode = "PYTHON"
-        
-        sct = None; monitor = None
-        if self.mode == "PYTHON" and mss:
-            sct = mss.mss()
-            monitor = sct.monitors[1] if len(sct.monitors) > 1 else sct.monitors[0]
-
-        last_valid_frame = np.zeros((height, width, 3), dtype=np.uint8)
-
-        print(f"[REC] Kayıt Başladı ({self.mode}). Target FPS: {target_fps}")
-
-        # [GÜNCELLENDİ] Zamanlama Mantığı
-        # Her karenin ne kadar sürmesi gerektiğini hesapla
-        frame_duration = 1.0 / target_fps
-        next_frame_time = time.time()
-
-        while not self.stop_event.is_set():
-            # Pause Kontrolü
-            if not self.pause_event.is_set():
-                self.pause_event.wait()
-                # Pause bitince zamanlamayı resetle ki video atlamasın
-                next_frame_time = time.time()
-            
-            # --- 1. Görüntü Al ---
-            current_frame = None
-            
-            if self.mode == "CPP" and self.cap_obj:
-                if self.dll.grab_frame(self.cap_obj, c_pointer, ctypes.c_size_t(frame_size)):
-                    frame_raw = np.ctypeslib.as_array(c_buffer).reshape(height, width, 4)
-                    current_frame = frame_raw[:, :, :3] # Alpha'yı at
-                else: pass
-            elif self.mode == "PYTHON" and sct:
-                try:
-                    img = sct.grab(monitor)
-                    frame_np = np.array(img)
-                    current_frame = cv2.cvtColor(frame_np, cv2.COLOR_BGRA2BGR)
-                    if current_frame.shape[:2] != (height, width):
-                         current_frame = cv2.resize(current_frame, (width, height))
-                except: pass
-
-            if current_frame is None: 
-                current_frame = last_valid_frame.copy()
-            else: 
-                last_valid_frame = current_frame
-
-            # --- 2. Kamera Overlay ---
-            self.mutex_cam.lock()
-            cam_frame = self.last_cam_frame_bgr
-            geo = self.cam_geometry
-            self.mutex_cam.unlock()
-
-            if cam_frame is not None and geo:
-                cx, cy, cw, ch = geo
-                y1, y2 = max(0, cy), min(height, cy + ch)
-                x1, x2 = max(0, cx), min(width, cx + cw)
-                if y2 > y1 and x2 > x1:
-                    try:
-                        target_w, target_h = x2 - x1, y2 - y1
-                        cam_resized = cv2.resize(cam_frame, (target_w, target_h))
-                        current_frame[y1:y2, x1:x2] = cam_resized
-                    except: pass
-
-            # --- 3. Yaz ve Bekle ---
-            out.write(current_frame)
-            
-            # Bir sonraki karenin zamanını hesapla
-            next_frame_time += frame_duration
-            
-            # Şu anki zamanla kıyasla
-            sleep_time = next_frame_time - time.time()
-            
-            # Eğer işlem hızlı bittiyse, FPS'i tutturmak için bekle
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-            # Eğer işlem yavaş kaldıysa (sleep_time < 0), bekleme yapma, hemen devam et.
-            # (Bu durumda video hafif yavaşlayabilir ama kare atlamaz ve takılmaz)
-
-        out.release()
-        if self.mode == "CPP" and self.cap_obj:
-            self.dll.release_engine(self.cap_obj)
-        if sct: sct.close()
-        print("[REC] Kayıt Bitti.")
+        if self.process is not None: self.process.call("resume")
+        elif self.session: self.session.resume()
     
     def start(self, save_path, fps=24):
         if self.is_recording: return
         self.is_recording = True
-        self.stop_event.clear()
+        if self.process is not None:
+            self._detach_camera()
+            self.process.call("start", save_path, fps, self.cam_geometry)
+            return
+        self.session = RecordSession(save_path, fps, self.dll, self._camera_source)
         # [GÜNCELLENDİ] Thread başlatma
-        self.thread = threading.Thread(target=self._record_loop, args=(save_path, fps))
+        self.thread = threading.Thread(target=self.session.run)
         self.thread.daemon = True
         self.thread.start()
 
     def stop(self):
         self.is_recording = False
-        self.stop_event.set()
-        self.pause_event.set()
-        self.stop_camera_preview()
\ No newline at end of file
+        self._detach_camera()
+        if self.process is not None: self.process.call("stop")
+        elif self.session: self.session.stop()
+        self.stop_camera_preview()
@@ -38,6 +38,27 @@ class ViziaPlugin:
              
         self.id = "recorder"
         self.window = None
+        self.process = None
+
+    def attach_process(self, process):
+        # Kayıt ayrı süreçte yapılır; pencere burada kalır
+        self.process = process
+
+    def _create_window(self, overlay):
+        self.window = RecorderController(overlay.settings, overlay)
+        if self.process is not None:
+            self.window.engine.attach_process(self.process)
+
+    def warmup_background(self):
+        # recorder.dll arka planda yüklenir (ön ısıtma)
+        if RecorderController is not None:
+            from record_loop import load_cpp_library
+            load_cpp_library()
+
+    def warmup(self, overlay):
+        # Pencere gizli kurulur; ilk tıklamada sadece gösterilir
+        if RecorderController is not None and self.window is None:
+            self._create_window(overlay)
 
     def run(self, overlay):
         # Eğer modül yüklenemediyse programı ÇÖKERTME, sadece uyar
@@ -48,7 +69,7 @@ class ViziaPlugin:
             return
 
         if self.window is None:
-            self.window = RecorderController(overlay.settings, overlay)
+            self._create_window(overlay)
         
         if not self.window.isVisible():
             self.window.show()
@@ -0,0 +1,178 @@
+# Vizia/plugins/vizia-recorder/record_loop.py
+# Kayıt döngüsü (Qt'siz): hem overlay sürecinde (CppEngineWrapper) hem ayrı kayıt sürecinde (RecorderWorker) çalışır.
+
+import threading
+import time
+import os
+import ctypes
+import numpy as np
+import cv2
+
+# Fallback: mss (C++ çalışmazsa devreye girecek)
+try:
+    import mss
+except ImportError:
+    mss = None
+
+_cpp_lock = threading.Lock()
+_cpp_library = False  # False: henüz denenmedi, None: yok / yüklenemedi
+
+def load_cpp_library():
+    """recorder.dll'i bir kez yükler (thread-safe; eklenti ön ısıtması arka planda çağırır)"""
+    global _cpp_library
+    with _cpp_lock:
+        if _cpp_library is not False: return _cpp_library
+        _cpp_library = None
+        try:
+            base_path = os.path.dirname(os.path.abspath(__file__))
+            cpp_dir = os.path.join(base_path, "..", "cpp_engine")
+            build_dir = os.path.join(cpp_dir, "build")
+            dll_path = os.path.join(build_dir, "recorder.dll")
+
+            if dll_path and os.path.exists(dll_path):
+                dll = ctypes.CDLL(dll_path)
+                dll.init_engine.argtypes = [ctypes.c_int, ctypes.c_int]
+                dll.init_engine.restype = ctypes.c_void_p
+                dll.grab_frame.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ubyte), ctypes.c_size_t]
+                dll.grab_frame.restype = ctypes.c_bool
+                dll.release_engine.argtypes = [ctypes.c_void_p]
+                _cpp_library = dll
+                print(f"[INFO] C++ Motoru Yüklendi: {dll_path}")
+        except Exception as e:
+            print(f"[ERROR] C++ Yükleme Hatası: {e}")
+        return _cpp_library
+
+
+class RecordSession:
+    """
+    Bir kayıt: ekranı yakalar, kamera karesini üstüne koyar ve dosyaya yazar.
+    camera(): (BGR kare, (x, y, w, h)) ya da (None, None) döndüren fonksiyon.
+    """
+    def __init__(self, filename, target_fps, dll, camera):
+        self.filename = filename
+        self.target_fps = target_fps
+        self.dll = dll
+        self.mode = "CPP" if dll is not None else "PYTHON"
+        self.camera = camera
+        self.cap_obj = None
+        self.stop_event = threading.Event()
+        self.pause_event = threading.Event()
+        self.pause_event.set()
+
+    # [GÜNCELLENDİ] Kayıt Döngüsü - Sabit FPS Mantığı
+    def run(self):
+        filename, target_fps = self.filename, self.target_fps
+        # Ekran Çözünürlüğü
+        if os.name == 'nt':
+            user32 = ctypes.windll.user32
+            width = user32.GetSystemMetrics(0)
+            height = user32.GetSystemMetrics(1)
+        else:
+            width, height = 1920, 1080
+
+        if not filename.endswith(".mp4"):
+            filename = os.path.splitext(filename)[0] + ".mp4"
+
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        out = cv2.VideoWriter(filename, fourcc, target_fps, (width, height))
+
+        # --- INIT ---
+        c_buffer = None
+        c_pointer = None
+        frame_size = width * height * 4 # BGRA
+
+        if self.mode == "CPP":
+            try:
+                c_buffer = (ctypes.c_ubyte * frame_size)()
+                c_pointer = ctypes.cast(c_buffer, ctypes.POINTER(ctypes.c_ubyte))
+                self.cap_obj = self.dll.init_engine(width, height)
+                if not self.cap_obj: self.mode = "PYTHON"
+            except: self.mode = "PYTHON"
+
+        sct = None; monitor = None
+        if self.mode == "PYTHON" and mss:
+            sct = mss.mss()
+            monitor = sct.monitors[1] if len(sct.monitors) > 1 else sct.monitors[0]
+
+        last_valid_frame = np.zeros((height, width, 3), dtype=np.uint8)
+
+        print(f"[REC] Kayıt Başladı ({self.mode}). Target FPS: {target_fps}")
+
+        # [GÜNCELLENDİ] Zamanlama Mantığı
+        # Her karenin ne kadar sürmesi gerektiğini hesapla
+        frame_duration = 1.0 / target_fps
+        next_frame_time = time.time()
+
+        while not self.stop_event.is_set():
+            # Pause Kontrolü
+            if not self.pause_event.is_set():
+                self.pause_event.wait()
+                # Pause bitince zamanlamayı resetle ki video atlamasın
+                next_frame_time = time.time()
+
+            # --- 1. Görüntü Al ---
+            current_frame = None
+
+            if self.mode == "CPP" and self.cap_obj:
+                if self.dll.grab_frame(self.cap_obj, c_pointer, ctypes.c_size_t(frame_size)):
+                    frame_raw = np.ctypeslib.as_array(c_buffer).reshape(height, width, 4)
+                    current_frame = frame_raw[:, :, :3] # Alpha'yı at
+                else: pass
+            elif self.mode == "PYTHON" and sct:
+                try:
+                    img = sct.grab(monitor)
+                    frame_np = np.array(img)
+                    current_frame = cv2.cvtColor(frame_np, cv2.COLOR_BGRA2BGR)
+                    if current_frame.shape[:2] != (height, width):
+                         current_frame = cv2.resize(current_frame, (width, height))
+                except: pass
+
+            if current_frame is None:
+                current_frame = last_valid_frame.copy()
+            else:
+                last_valid_frame = current_frame
+
+            # --- 2. Kamera Overlay ---
+            cam_frame, geo = self.camera()
+
+            if cam_frame is not None and geo:
+                cx, cy, cw, ch = geo
+                y1, y2 = max(0, cy), min(height, cy + ch)
+                x1, x2 = max(0, cx), min(width, cx + cw)
+                if y2 > y1 and x2 > x1:
+                    try:
+                        target_w, target_h = x2 - x1, y2 - y1
+                        cam_resized = cv2.resize(cam_frame, (target_w, target_h))
+                        current_frame[y1:y2, x1:x2] = cam_resized
+                    except: pass
+
+            # --- 3. Yaz ve Bekle ---
+            out.write(current_frame)
+
+            # Bir sonraki karenin zamanını hesapla
+            next_frame_time += frame_duration
+
+            # Şu anki zamanla kıyasla
+            sleep_time = next_frame_time - time.time()
+
+            # Eğer işlem hızlı bittiyse, FPS'i tutturmak için bekle
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+            # Eğer işlem yavaş kaldıysa (sleep_time < 0), bekleme yapma, hemen devam et.
+            # (Bu durumda video hafif yavaşlayabilir ama kare atlamaz ve takılmaz)
+
+        out.release()
+        if self.mode == "CPP" and self.cap_obj:
+            self.dll.release_engine(self.cap_obj)
+        if sct: sct.close()
+        print("[REC] Kayıt Bitti.")
+
+    def pause(self):
+        self.pause_event.clear()
+
+    def resume(self):
+        self.pause_event.set()
+
+    def stop(self):
+        self.stop_event.set()
+        self.pause_event.set()
@@ -0,0 +1,53 @@
+# Vizia/plugins/vizia-recorder/record_worker.py
+# Ayrı kayıt süreci (manifest "worker"): yakalama, kamera birleştirme ve kodlama overlay'in GIL'ini kullanmaz.
+
+import threading
+import numpy as np
+
+from record_loop import RecordSession, load_cpp_library
+
+
+class RecorderWorker:
+    def __init__(self, context):
+        self.context = context
+        self.session = None
+        self.thread = None
+        self.camera_frame = None
+        self.cam_geometry = None
+
+    def start(self, save_path, fps, cam_geometry=None):
+        if self.session is not None: self.stop()
+        self.cam_geometry = tuple(cam_geometry) if cam_geometry else None
+        self.session = RecordSession(save_path, fps, load_cpp_library(), self._camera_source)
+        # Kanal komutları (pause / stop / set_camera) kayıt sürerken de işlensin
+        self.thread = threading.Thread(target=self.session.run, daemon=True)
+        self.thread.start()
+
+    def pause(self):
+        if self.session: self.session.pause()
+
+    def resume(self):
+        if self.session: self.session.resume()
+
+    def stop(self):
+        if self.session is None: return
+        self.session.stop()
+        self.thread.join()
+        self.session = self.thread = None
+
+    def set_camera(self, frame_name, cam_geometry):
+        self.cam_geometry = tuple(cam_geometry) if cam_geometry else None
+        if frame_name and (self.camera_frame is None or self.camera_frame.name != frame_name):
+            # Eski tampon kayıt thread'i okurken kapatılmaz; hepsi süreç kapanırken bırakılır
+            self.camera_frame = self.context.frame(frame_name)
+
+    def _camera_source(self):
+        if self.camera_frame is None or not self.cam_geometry: return None, None
+        frame = self.camera_frame.read()
+        if frame is None: return None, None
+        data, width, height, stride, channels = frame
+        array = np.frombuffer(data, dtype=np.uint8).reshape(height, stride)[:, :width * channels].reshape(height, width, channels)
+        return array, self.cam_geometry
+
+    def close(self):
+        self.stop()
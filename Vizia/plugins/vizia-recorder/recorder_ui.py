@@ -169,6 +169,7 @@ class RecorderController(QWidget):
         
         self.engine = CppEngineWrapper()
         self.engine.preview_signal.connect(self.camera_widget.update_frame)
+        self.engine.recording_failed.connect(self.on_recording_failed)
         
         self.mini_panel = MiniControlPanel(self)
         
@@ -330,12 +331,23 @@ class RecorderController(QWidget):
     def stop_rec(self):
         self.is_recording = False
         self.engine.stop()
+        self._reset_rec_ui("Video Kaydedildi ✅")
+
+    def on_recording_failed(self, reason):
+        # Motor kaydı kendisi bitirdi (kayıt süreci çöktü): arayüz normal durdurmadaki hâline döner
+        if not self.is_recording: return
+        self.is_recording = False
+        self.mini_panel.timer.stop()
+        self.engine.stop_camera_preview()
+        self._reset_rec_ui(f"⚠️ {reason}")
+
+    def _reset_rec_ui(self, message):
         self.mini_panel.hide()
         self.show()
         self.btn_rec.setText("KAYDI BAŞLAT")
         self.btn_rec.setStyleSheet("background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #ff3b30, stop:1 #ff2d55); color: white; border-radius: 30px; font-weight: bold;")
         if self.overlay: 
-            self.overlay.show_toast("Video Kaydedildi ✅")
+            self.overlay.show_toast(message)
             self.overlay.bring_ui_to_front()
 
     def close_panel(self):
@@ -0,0 +1,16 @@
+"""Testler ekransız (offscreen) Qt ile, Vizia klasörü kök kabul edilerek çalışır"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QApplication.instance() or QApplication(sys.argv[:1])
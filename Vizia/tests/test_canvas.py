@@ -0,0 +1,179 @@
+"""SpatialGrid, çizgi sadeleştirme, vektör silgi ve StrokeStore testleri"""
+
+import math
+
+import pytest
+from PyQt5.QtCore import QRect, QPoint, QSize, Qt
+
+from core.spatial import SpatialGrid
+from core.overlay.strokes import simplify_mask, fit_mask, erase_from_stroke, _dist_sq_to_segment
+from core.overlay.canvas import CanvasLayer, StrokeStore
+from core.overlay.history import EraseCommand, StrokeCommand
+
+
+# --- SpatialGrid ---
+def test_grid_query_spans_cells():
+    grid = SpatialGrid(cell_size=100)
+    grid.insert('a', QRect(50, 50, 200, 20))   # üç hücreye yayılır
+    grid.insert('b', QRect(400, 400, 10, 10))
+    assert sorted(grid.query_rect(QRect(240, 60, 5, 5))) == ['a']
+    assert grid.query_point(QPoint(150, 60)) == ['a']
+    assert grid.query_point(QPoint(405, 405)) == ['b']
+    # Aynı hücrede olup dikdörtgene değmeyen anahtar dönmez
+    assert grid.query_point(QPoint(10, 10)) == []
+
+
+def test_grid_remove_and_reinsert():
+    grid = SpatialGrid(cell_size=100)
+    grid.insert('a', QRect(0, 0, 250, 250))
+    grid.remove('a')
+    assert len(grid) == 0 and grid._cells == {}
+    grid.insert('a', QRect(0, 0, 10, 10))
+    grid.insert('a', QRect(500, 500, 10, 10))  # tekrar ekleme eski hücreleri temizler
+    assert grid.query_point(QPoint(5, 5)) == []
+    assert grid.query_rect(QRect(490, 490, 30, 30)) == ['a']
+    grid.remove('yok')  # olmayan anahtar sessizce geçilir
+    assert 'a' in grid
+
+
+# --- Sadeleştirme ---
+def _wavy(n=600):
+    return [(float(i), round(20 * math.sin(i / 25.0))) for i in range(n)]
+
+
+def _max_distance(points, keep):
+    kept = [i for i, k in enumerate(keep) if k]
+    worst = 0.0
+    for a, b in zip(kept, kept[1:]):
+        for i in range(a + 1, b):
+            worst = max(worst, _dist_sq_to_segment(*points[i], *points[a], *points[b]))
+    return math.sqrt(worst)
+
+
+def test_simplify_mask_keeps_ends_and_bounds_error():
+    points = _wavy()
+    keep = simplify_mask(points, 1.0)
+    assert keep[0] and keep[-1]
+    assert sum(keep) < len(points) // 5
+    assert _max_distance(points, keep) <= 1.0
+
+
+def test_simplify_mask_straight_line_and_disabled():
+    line = [(float(i), 2.0 * i) for i in range(50)]
+    keep = simplify_mask(line, 0.5)
+    assert [i for i, k in enumerate(keep) if k] == [0, 49]
+    assert all(simplify_mask(line, 0))
+
+
+def test_fit_mask_is_superset_of_rdp():
+    points = _wavy()
+    rdp, fitted = simplify_mask(points, 1.25), fit_mask(points, 1.25)
+    assert all(f for r, f in zip(rdp, fitted) if r)
+    assert sum(fitted) < len(points) // 5
+
+
+# --- Vektör silgi ---
+def test_erase_splits_stroke_in_two():
+    line = [(float(x), 0.0) for x in range(0, 101, 10)]
+    runs = erase_from_stroke(line, (50, -20), (50, 20), 3)
+    assert len(runs) == 2
+    assert runs[0][0] == (0.0, 0.0) and runs[0][-1][0] < 47
+    assert runs[1][-1] == (100.0, 0.0) and runs[1][0][0] > 53
+
+
+def test_erase_miss_and_full_cover():
+    line = [(float(x), 0.0) for x in range(0, 101, 10)]
+    assert erase_from_stroke(line, (0, 50), (100, 50), 5) is None
+    assert erase_from_stroke(line, (0, 0), (100, 0), 5) == []
+
+
+def test_erase_cuts_between_sparse_points():
+    # Noktalar arası uzun segmenti geçen silgi de çizgiyi keser
+    runs = erase_from_stroke([(0.0, 0.0), (200.0, 0.0)], (100, -10), (100, 10), 2)
+    assert len(runs) == 2
+
+
+# --- EraseCommand undo / redo ---
+@pytest.fixture
+def layer(qapp):
+    layer = CanvasLayer(QSize(400, 300), simplify_tolerance=0)
+    for y in (50, 150):
+        layer.add_stroke_to_history([(float(x), float(y)) for x in range(10, 391, 5)], Qt.red, 4, 'pen', False)
+    return layer
+
+
+def test_erase_undo_redo_restores_history(layer):
+    original = list(layer.history)
+    layer.begin_erase()
+    layer.erase_segment(QPoint(200, 30), QPoint(200, 70), 6)
+    layer.end_erase()
+    erase = layer.history[-1]
+    assert isinstance(erase, EraseCommand)
+    assert erase.removed == [original[0]] and len(erase.added) == 2
+    pieces = layer.history[:-1]
+    # Parçalar silinen çizginin sırasını (seq) alır, diğer çizgiden önce gelir
+    assert pieces[:2] == erase.added and pieces[2] is original[1]
+    assert layer.index.query_point(QPoint(200, 50)) == []
+
+    layer.undo()
+    assert layer.history == original
+    assert layer.index.query_point(QPoint(200, 50)) == [original[0]]
+    assert len(layer.index) == 2
+
+    layer.redo()
+    assert layer.history[:-1] == pieces
+    assert original[0] not in layer.index and all(p in layer.index for p in erase.added)
+
+
+def test_object_erase_undo(layer):
+    first, second = layer.history
+    layer.begin_erase()
+    layer.erase_at(QRect(100, 145, 10, 10))
+    layer.end_erase()
+    assert layer.history[0] is first and layer.history[1].removed == [second]
+    layer.undo()
+    assert layer.history == [first, second]
+
+
+# --- StrokeStore ---
+def _store():
+    store = StrokeStore()
+    store.add([(0.0, 0.0), (10.0, 5.0), (20.0, 0.0)], Qt.red, 3, 'pen', fitted=True)
+    store.add([(1.0, 1.0), (2.0, 2.0)], Qt.blue, 9, 'eraser')
+    store.add([(5.0, 5.0), (6.0, 7.0), (8.0, 9.0)], Qt.green, 2, 'pen', pressures=[0.2, 0.5, 1.0])
+    return store
+
+
+def _describe(store, sid):
+    return (store.points(sid), store.color(sid).rgba(), store.width(sid), store.mode(sid),
+            store.fitted(sid), store.has_pressure(sid), store.pressure_factors(sid), store.rect(sid))
+
+
+def test_store_export_extend_round_trip(qapp):
+    store = _store()
+    copy = StrokeStore()
+    assert list(copy.extend(store.export(range(len(store))))) == [0, 1, 2]
+    assert [_describe(copy, s) for s in range(3)] == [_describe(store, s) for s in range(3)]
+
+    # Seçili / sırası değişmiş alt küme
+    subset = StrokeStore()
+    subset.extend(store.export([2, 0]))
+    assert _describe(subset, 0) == _describe(store, 2)
+    assert _describe(subset, 1) == _describe(store, 0)
+
+
+def test_store_extend_rejects_inconsistent_arrays(qapp):
+    arrays = _store().export([0])
+    arrays['coords'].pop()
+    with pytest.raises(ValueError):
+        StrokeStore().extend(arrays)
+
+
+def test_store_compact_renumbers(qapp):
+    store = _store()
+    expected = [_describe(store, 2), _describe(store, 0)]
+    live = [StrokeCommand(store, 2), StrokeCommand(store, 0)]
+    store.compact(live)
+    assert len(store) == 2
+    assert [cmd.sid for cmd in live] == [0, 1]
+    assert [_describe(store, cmd.sid) for cmd in live] == expected
@@ -0,0 +1,143 @@
+"""Eklenti süreci: SharedFrame seqlock'u ve çöken sürecin yeniden başlatılması"""
+
+import time
+import struct
+import threading
+
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from core.plugin_ipc import SharedFrame
+from core.plugin_loader import PluginManifest
+from core.plugin_host import PluginProcess, PluginProcessError
+
+WORKER = '''
+import os, time
+
+class Worker:
+    def __init__(self, context): self.context = context
+    def echo(self, value): return value
+    def pid(self): return os.getpid()
+    def die(self, delay=0): time.sleep(delay); os._exit(3)
+'''
+
+
+# --- SharedFrame ---
+@pytest.fixture
+def frame():
+    frame = SharedFrame(size=64)
+    yield frame
+    frame.close()
+
+
+def test_frame_round_trip(frame):
+    assert frame.read() is None  # hiç yazılmadı
+    frame.write(bytes(range(48)), 4, 3, 16, 4)
+    reader = SharedFrame(frame.name)
+    try:
+        assert reader.read() == (bytes(range(48)), 4, 3, 16, 4)
+    finally:
+        reader.close()
+    with pytest.raises(ValueError):
+        frame.write(b'x' * 65, 65, 1, 65, 1)
+
+
+def test_frame_read_gives_up_while_writer_is_stuck(frame, monkeypatch):
+    frame.write(b'a' * 16, 4, 1, 16, 4)
+    # Yazıcı sıra numarasını tekleyip kalmış (ör. yazarken öldü)
+    seq = SharedFrame.HEADER.unpack_from(frame.shm.buf, 0)[0]
+    struct.pack_into("<Q", frame.shm.buf, 0, seq + 1)
+    monkeypatch.setattr(SharedFrame, "READ_RETRIES", 5)
+    assert frame.read() is None
+
+
+def test_frame_reader_never_sees_torn_frames(frame):
+    stop = threading.Event()
+
+    def writer():
+        value = 0
+        while not stop.is_set():
+            value = (value + 1) % 256
+            frame.write(bytes([value]) * 64, value, 1, 64, 1)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        reads = 0
+        deadline = time.monotonic() + 0.5
+        while time.monotonic() < deadline:
+            result = frame.read()
+            if result is None: continue
+            data, width, *_ = result
+            # Başlık ve veri aynı karedendir; kare tek bir değerle doludur
+            assert data == bytes([width]) * 64
+            reads += 1
+        assert reads > 0
+    finally:
+        stop.set()
+        thread.join()
+
+
+# --- PluginProcess ---
+@pytest.fixture
+def process(qapp, tmp_path):
+    (tmp_path / "worker.py").write_text(WORKER)
+    process = PluginProcess(PluginManifest(str(tmp_path), "test-worker", "Test", worker="worker.py:Worker"))
+    yield process
+    process.stop()
+
+
+def _wait_until(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline: raise AssertionError("zaman aşımı")
+        QApplication.processEvents()
+        time.sleep(0.005)
+
+
+def test_process_restarts_after_crash(process):
+    crashes, errors = [], []
+    process.crashed.connect(crashes.append)
+    first = process.call_sync("pid", timeout=10)
+    process.call("die", error=errors.append)
+    _wait_until(lambda: crashes)
+    assert crashes == ["test-worker"] and len(errors) == 1
+    assert process.proc is None and process.reader is None
+    # Sonraki çağrı süreci yeniden başlatır
+    assert process.call_sync("pid", timeout=10) != first
+    results = []
+    process.call("echo", 5, callback=results.append)
+    _wait_until(lambda: results)
+    assert results == [5]
+
+
+def test_restart_before_closed_is_processed(process):
+    """Süreç öldükten sonra ama 'closed' mesajı işlenmeden yapılan çağrı eski bekleyenleri kaybetmez"""
+    crashes, errors, results = [], [], []
+    process.crashed.connect(crashes.append)
+    process.call_sync("echo", 0, timeout=10)
+    old_reader = process.reader
+    process.call("die", 0.2, callback=results.append, error=errors.append)
+    process.proc.join(10)       # olay döngüsü çalışmıyor: 'closed' kuyrukta bekler
+    old_reader.wait(10000)
+    assert not process.running
+
+    process.call("echo", 7, callback=results.append, error=errors.append)  # yeniden başlatır
+    assert process.reader is not old_reader
+    _wait_until(lambda: results and errors and crashes)
+    assert results == [7] and len(errors) == 1 and crashes == ["test-worker"]
+    assert process.running and process.call_sync("echo", 8, timeout=10) == 8
+
+
+def test_closed_reader_only_fails_its_own_waiters(process):
+    old, new = object(), object()
+    process._waiters = {1: [threading.Event(), None, old], 2: [threading.Event(), None, new]}
+    process._fail_sync(old)
+    assert process._waiters[1][0].is_set() and process._waiters[1][1][0] == "error"
+    assert not process._waiters[2][0].is_set()
+
+
+def test_call_sync_after_crash_raises(process):
+    process.call_sync("echo", 1, timeout=10)
+    with pytest.raises(PluginProcessError):
+        process.call_sync("die", timeout=10)
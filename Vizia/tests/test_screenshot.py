@@ -0,0 +1,75 @@
+"""Ekran görüntüsü: seçilen alanın overlay gizliyken alınması ve çizimle birleştirilmesi"""
+
+import time
+
+import pytest
+from PyQt5.QtCore import QRect, QPoint, Qt
+from PyQt5.QtGui import QColor, QImage, QPixmap
+from PyQt5.QtWidgets import QApplication
+
+from core.overlay import window as window_module
+
+
+@pytest.fixture(scope="module")
+def overlay(qapp):
+    from benchmarks.replay import create_overlay
+    overlay = create_overlay({"session_autosave": False, "screenshot_content": "annotated"})
+    overlay.show()
+    return overlay
+
+
+@pytest.fixture
+def desktop(overlay):
+    layer = overlay.desktop_layer
+    layer.clear()
+    stamp = QPixmap(20, 20)
+    stamp.fill(Qt.red)
+    layer.add_stamp(QPoint(10, 10), stamp)
+    return layer
+
+
+def _solid(w, h, color):
+    image = QImage(w, h, QImage.Format_ARGB32_Premultiplied)
+    image.fill(color)
+    return image
+
+
+def test_export_composites_ink_over_desktop(overlay, desktop):
+    image = overlay.export_annotated(QRect(0, 0, 60, 40), desktop=_solid(60, 40, Qt.blue))
+    assert image.size().width() == 60 and image.size().height() == 40
+    assert image.pixelColor(15, 15) == QColor(Qt.red)
+    assert image.pixelColor(50, 35) == QColor(Qt.blue)
+
+
+def test_export_ink_only_keeps_alpha(overlay, desktop):
+    image = overlay.export_annotated(QRect(0, 0, 60, 40), ink_only=True)
+    assert image.pixelColor(15, 15) == QColor(Qt.red)
+    assert image.pixelColor(50, 35).alpha() == 0
+
+
+def test_finalize_grabs_selected_rect_after_hide(overlay, desktop, monkeypatch):
+    grabs, saved = [], []
+
+    def capture(rect, screen=None, clipboard=False):
+        grabs.append((QRect(rect), overlay.isVisible()))
+        return _solid(rect.width(), rect.height(), Qt.blue)
+
+    monkeypatch.setattr(window_module, "CAPTURE_EXCLUSION", False)
+    monkeypatch.setattr(overlay.screenshots, "capture", capture)
+    monkeypatch.setattr(overlay.screenshots, "save_image", lambda image, *a, **k: saved.append(image) or "x")
+    overlay.take_screenshot()
+    assert grabs == []  # seçimden önce ekran alınmaz
+    overlay._finalize_screenshot(QRect(5, 5, 40, 30))
+    # Gizleme bir kare sonra ekrana yansır; görüntü hemen değil, zamanlayıcıyla alınır
+    assert grabs == [] and not overlay.isVisible()
+    for _ in range(200):
+        if saved: break
+        QApplication.processEvents()
+        time.sleep(0.005)
+    assert grabs == [(QRect(5, 5, 40, 30), False)]
+    assert overlay.isVisible()
+    image = saved[0]
+    assert image.width() == 40 and image.height() == 30
+    # Çizim temiz görüntünün üstüne bir kez çizilir
+    assert image.pixelColor(10, 10) == QColor(Qt.red)
+    assert image.pixelColor(35, 25) == QColor(Qt.blue)
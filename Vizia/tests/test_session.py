@@ -0,0 +1,159 @@
+"""Oturum dosyası (VIZIASES) kayıt / yükleme testleri"""
+
+import os
+
+import pytest
+from PyQt5.QtCore import QPoint, Qt
+from PyQt5.QtGui import QColor, QImage, QPixmap
+from PyQt5.QtWidgets import QLabel
+
+from core.overlay.canvas import StrokeStore
+from core.overlay.session import SessionWriter, read_session, MAGIC
+
+
+def _store():
+    store = StrokeStore()
+    store.add([(0.0, 0.0), (10.0, 5.0), (20.0, 0.0)], Qt.red, 3, 'pen', fitted=True)
+    store.add([(5.0, 5.0), (6.0, 7.0)], Qt.green, 2, 'pen', pressures=[0.2, 1.0])
+    return store
+
+
+@pytest.fixture(scope="module")
+def overlay(qapp):
+    from benchmarks.replay import create_overlay
+    return create_overlay({"session_autosave": False})
+
+
+@pytest.fixture
+def desktop(overlay):
+    overlay.desktop_layer.clear()
+    overlay.session.pending = []
+    return overlay.desktop_layer
+
+
+def _save(overlay, path):
+    overlay.session.save(str(path))
+    overlay.session._writer.wait()
+
+
+# --- Dosya formatı ---
+def test_writer_reader_round_trip(qapp, tmp_path):
+    store = _store()
+    image = QImage(4, 4, QImage.Format_ARGB32)
+    image.fill(Qt.blue)
+
+    class Owner: encoded = None
+    owner = Owner()
+    snapshot = [{'header': {"name": "desktop", "commands": [['path', 2]]}, 'strokes': store.export(range(2)),
+                 'blobs': [b'ham veri', (image, owner)]},
+                {'header': {"name": "board", "page": 0, "commands": []}, 'strokes': StrokeStore().export([]), 'blobs': []}]
+    path = str(tmp_path / "s.vizia")
+    SessionWriter(path, snapshot, StrokeStore.ARRAY_FIELDS).run()
+    assert not os.path.exists(path + ".tmp")
+
+    layers = read_session(path, StrokeStore.ARRAY_FIELDS)
+    assert [l['header'] for l in layers] == [s['header'] for s in snapshot]
+    assert layers[0]['strokes'] == store.export(range(2))
+    assert all(len(a) == 0 for a in layers[1]['strokes'].values())
+    # Görsel thread'de bir kez kodlanır ve sahibine yazılır
+    assert layers[0]['blobs'] == [b'ham veri', owner.encoded]
+    assert QImage.fromData(owner.encoded).pixelColor(1, 1) == QColor(Qt.blue)
+
+
+def test_bad_magic(qapp, tmp_path):
+    path = tmp_path / "x.vizia"
+    path.write_bytes(b'NOTVIZIA' + b'\0' * 32)
+    with pytest.raises(ValueError):
+        read_session(str(path), StrokeStore.ARRAY_FIELDS)
+    path.write_bytes(MAGIC[:4])
+    with pytest.raises(ValueError):
+        read_session(str(path), StrokeStore.ARRAY_FIELDS)
+
+
+def test_truncated_file(qapp, tmp_path):
+    path = str(tmp_path / "s.vizia")
+    snapshot = [{'header': {"name": "desktop", "commands": [['path', 2]]}, 'strokes': _store().export(range(2)), 'blobs': [b'x' * 64]}]
+    SessionWriter(path, snapshot, StrokeStore.ARRAY_FIELDS).run()
+    with open(path, 'rb') as f: data = f.read()
+    for cut in (len(data) - 10, len(data) - 70, len(MAGIC) + 10):
+        with open(path, 'wb') as f: f.write(data[:cut])
+        with pytest.raises(ValueError):
+            read_session(path, StrokeStore.ARRAY_FIELDS)
+
+
+# --- Katman kayıt / yükleme ---
+def test_layer_round_trip(overlay, desktop, tmp_path):
+    desktop.add_stroke_to_history([(float(x), 40.0 + x % 7) for x in range(10, 200)], QColor('red'), 4, 'pen', False)
+    desktop.add_shape('rect', QPoint(5, 5), QPoint(50, 60), QColor('blue'), 3)
+    stamp = QPixmap(8, 8)
+    stamp.fill(Qt.green)
+    desktop.add_stamp(QPoint(30, 30), stamp)
+    desktop.add_stroke_to_history([(0.0, 0.0), (40.0, 40.0), (80.0, 0.0)], QColor('black'), 2, 'pen', False, [0.3, 0.6, 0.9])
+    before = [(c.type, getattr(c, 'points', None), getattr(c, 'rect', None)) for c in desktop.history]
+    path = tmp_path / "s.vizia"
+    _save(overlay, path)
+
+    desktop.clear()
+    overlay.session.load(str(path))
+    after = [(c.type, getattr(c, 'points', None), getattr(c, 'rect', None)) for c in desktop.history]
+    assert after == before
+    assert desktop.history[-1].store.pressure_factors(desktop.history[-1].sid) == pytest.approx([0.3, 0.6, 0.9], abs=1 / 255)
+    restored = desktop.history[2]
+    assert restored.encoded is not None and restored.pixmap.toImage().pixelColor(2, 2) == QColor(Qt.green)
+
+
+def test_text_and_image_codecs(overlay, desktop, tmp_path):
+    txt = overlay.session.codecs['text'][1](overlay, desktop, {
+        "x": 20, "y": 30, "w": 150, "h": 60, "html": "<b>merhaba</b>",
+        "font": overlay.font().toString(), "color": "#ff112233"}, None)
+    desktop.add_widget_item(txt, 'text')
+    png = QImage(6, 5, QImage.Format_ARGB32)
+    png.fill(Qt.red)
+    png.save(str(tmp_path / "resim.png"))
+    from ui.widgets.image_item import ViziaImageItem
+    img = ViziaImageItem(str(tmp_path / "resim.png"), False, overlay)
+    img.setGeometry(200, 100, 60, 50)
+    desktop.add_widget_item(img, 'image')
+    path = tmp_path / "s.vizia"
+    _save(overlay, path)
+    os.remove(str(tmp_path / "resim.png"))  # görsel oturuma gömülüdür
+
+    desktop.clear()
+    overlay.session.load(str(path))
+    text_cmd, image_cmd = desktop.history
+    assert text_cmd.type == 'text' and 'merhaba' in text_cmd.obj.toPlainText()
+    assert text_cmd.obj.geometry().getRect() == (20, 30, 150, 60)
+    assert text_cmd.obj.text_color == QColor("#ff112233")
+    assert image_cmd.type == 'image' and image_cmd.obj.geometry().getRect() == (200, 100, 60, 50)
+    assert image_cmd.obj.original_pixmap.size().width() == 6
+    assert image_cmd.obj.image_data == img.image_data
+
+
+def test_late_codec_registration(overlay, desktop, tmp_path):
+    session = overlay.session
+    saved = []
+
+    def save_note(w): return {"text": w.text()}, w.text().encode('utf-8')
+
+    def load_note(overlay_, layer, state, data):
+        saved.append(data)
+        return QLabel(state["text"], overlay_)
+
+    session.register_widget_codec('note', save_note, load_note)
+    desktop.add_widget_item(QLabel("not", overlay), 'note')
+    path = tmp_path / "s.vizia"
+    _save(overlay, path)
+
+    # Eklenti henüz yüklenmemiş: widget bekletilir ve tekrar kayıtta korunur
+    del session.codecs['note']
+    desktop.clear()
+    session.load(str(path))
+    assert desktop.history == [] and [p[1] for p in session.pending] == ['note']
+    _save(overlay, path)
+    header = read_session(str(path), StrokeStore.ARRAY_FIELDS)[0]['header']
+    assert header['commands'] == [['widget', 'note', {"text": "not"}, 0]]
+
+    session.register_widget_codec('note', save_note, load_note)
+    assert session.pending == []
+    assert [c.type for c in desktop.history] == ['note'] and desktop.history[0].obj.text() == "not"
+    assert saved == [b'not']
@@ -0,0 +1,63 @@
+"""Açılış izleyicisi: thread'lerin span yığınları birbirine karışmaz"""
+
+import sys
+import json
+import threading
+
+from core.startup_trace import StartupTracer
+
+
+def test_threads_keep_separate_stacks(tmp_path):
+    tracer = StartupTracer()
+    tracer.enable(str(tmp_path / "trace.json"), trace_imports=False)
+    inside, release = threading.Event(), threading.Event()
+
+    def worker():
+        with tracer.phase("warmup"):
+            inside.set()
+            release.wait(5)
+            with tracer.phase("plugin"): pass
+
+    with tracer.phase("overlay"):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        inside.wait(5)
+        # Ana thread, diğer thread'in açık span'i içindeyken kendi yığınında kalır
+        with tracer.phase("toolbar"): pass
+        release.set()
+        thread.join()
+
+    spans = {s[0]: s for s in tracer.spans}
+    assert spans["toolbar"][5] == ("overlay",) and spans["toolbar"][4] == 1
+    assert spans["warmup"][5] == () and spans["plugin"][5] == ("warmup",)
+
+    data = json.loads(open(tracer.write()).read())
+    tids = {e["name"]: e["tid"] for e in data["traceEvents"]}
+    assert tids["overlay"] == tids["toolbar"] == 0
+    assert tids["warmup"] == tids["plugin"] == 1
+    stacks = {line.rsplit(" ", 1)[0] for line in (tmp_path / "trace.folded").read_text().splitlines()}
+    assert "startup;overlay;toolbar" in stacks and "startup;thread-1;warmup" in stacks
+    assert not any("overlay;warmup" in stack for stack in stacks)
+
+
+def test_imports_traced_per_thread(tmp_path):
+    (tmp_path / "vizia_trace_mod_a.py").write_text("x = 1\n")
+    (tmp_path / "vizia_trace_mod_b.py").write_text("y = 2\n")
+    sys.path.insert(0, str(tmp_path))
+    tracer = StartupTracer()
+    try:
+        tracer.enable(str(tmp_path / "trace.json"))
+        thread = threading.Thread(target=lambda: __import__("vizia_trace_mod_b"))
+        with tracer.phase("main"):
+            thread.start()
+            thread.join()
+            __import__("vizia_trace_mod_a")
+    finally:
+        tracer.write()
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("vizia_trace_mod_a", None)
+        sys.modules.pop("vizia_trace_mod_b", None)
+    spans = {s[0]: s for s in tracer.spans}
+    assert spans["vizia_trace_mod_a"][5] == ("main",)
+    assert spans["vizia_trace_mod_b"][5] == ()
+    assert spans["vizia_trace_mod_b"][6] != spans["main"][6]
@@ -7,9 +7,10 @@ class ViziaImageItem(QWidget):
     request_close = pyqtSignal(QWidget)
     request_stamp = pyqtSignal()
     
-    def __init__(self, image_path, creation_mode, parent=None):
+    def __init__(self, image_path, creation_mode, parent=None, pixmap=None):
         super().__init__(parent)
         self.image_path = image_path
+        self.image_data = None  # Oturumdan yüklenen görselin gömülü (orijinal) baytları
         self.creation_mode = creation_mode
         self.setWindowFlags(Qt.SubWindow)
         self.setAttribute(Qt.WA_DeleteOnClose)
@@ -47,7 +48,7 @@ class ViziaImageItem(QWidget):
         self.control_frame.hide()
         
         self.image_container = QLabel()
-        self.original_pixmap = QPixmap(image_path)
+        self.original_pixmap = pixmap if pixmap is not None else QPixmap(image_path)
         self.image_container.setPixmap(self.original_pixmap)
         self.image_container.setScaledContents(True)
         self.image_container.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
@@ -99,7 +100,8 @@ class ViziaImageItem(QWidget):
         elif action == a_dup:
             parent_overlay = self.parentWidget()
             if parent_overlay:
-                new_img = ViziaImageItem(self.image_path, self.creation_mode, parent_overlay)
+                new_img = ViziaImageItem(self.image_path, self.creation_mode, parent_overlay, self.original_pixmap)
+                new_img.image_data = self.image_data
                 new_img.resize(self.size())
                 new_img.move(self.x() + 20, self.y() + 20)
                 new_img.request_close.connect(lambda w: [parent_overlay.active_layer.remove_widget_item(w), w.deleteLater()])